@@ -0,0 +1,75 @@
+"""Microbenchmarks the cost of constructing `API` and the per-call overhead of an @api_endpoint method.
+
+    python benchmarks/api_construction.py --instances 2000 --calls 20000
+
+The "before" numbers replay the old per-instance docstring patching (`DocstringPatcher.patch`), which wrapped every
+endpoint of every new instance. The "after" numbers use the class-level, lazily patched methods.
+"""
+
+import argparse
+import time
+
+import httpx
+
+from domaintools import API
+from domaintools.docstring_patcher import DocstringPatcher
+
+PAYLOAD = {"response": {"results": [], "results_count": 0, "total_count": 0, "missing_domains": []}}
+
+
+class UnsentResults(dict):
+    """Stands in for the Results of an endpoint so that no request is sent"""
+
+    def apply_result_filters(self):
+        return self
+
+
+def stub_client():
+    return httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, json=PAYLOAD)))
+
+
+def construct(total, patch_instances):
+    started = time.perf_counter()
+    for _ in range(total):
+        api = API("bench", "key", rate_limit=False)
+        if patch_instances:
+            DocstringPatcher().patch(api)
+    return time.perf_counter() - started
+
+
+def call_endpoint(total, patch_instances):
+    """Times the endpoint method itself up to the creation of its Results (no request is sent)"""
+    api = API("bench", "key", rate_limit=False, client=stub_client())
+    if patch_instances:
+        DocstringPatcher().patch(api)
+
+    # bypass the request itself so only the method call, argument binding and validation are measured
+    api._results = lambda *args, **kwargs: UnsentResults(kwargs)
+    started = time.perf_counter()
+    for _ in range(total):
+        api.iris_investigate(domains="domaintools.com", active=True)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--instances", type=int, default=2000, help="number of API instances to construct")
+    parser.add_argument("--calls", type=int, default=20000, help="number of endpoint calls")
+    args = parser.parse_args()
+
+    # load the specs and docstrings once so both runs start warm
+    API("bench", "key", rate_limit=False).iris_investigate.__doc__
+
+    before = construct(args.instances, patch_instances=True)
+    after = construct(args.instances, patch_instances=False)
+    print(f"API() before: {before / args.instances * 1e6:8.1f} us/instance")
+    print(f"API() after:  {after / args.instances * 1e6:8.1f} us/instance")
+
+    before = call_endpoint(args.calls, patch_instances=True)
+    after = call_endpoint(args.calls, patch_instances=False)
+    print(f"iris_investigate() before: {before / args.calls * 1e6:8.2f} us/call")
+    print(f"iris_investigate() after:  {after / args.calls * 1e6:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
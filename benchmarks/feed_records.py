@@ -0,0 +1,55 @@
+"""Compares decoding a jsonl feed line by line (`response()` + json.loads) against `FeedsResults.records()`.
+
+    python benchmarks/feed_records.py --records 300000
+
+The feed is served by a stub transport, uncompressed for response() and gzip encoded for records().
+"""
+
+import argparse
+import gzip
+import json
+import time
+
+import httpx
+
+from domaintools import API
+from domaintools.ndjson import DECODER_BACKENDS
+
+RECORD = {"timestamp": "2024-01-01T00:00:00Z", "domain": "example-domain-name.com", "ip": ["192.0.2.1"]}
+
+
+def feed_api(body, compressed):
+    headers = {"Content-Encoding": "gzip"} if compressed else {}
+    content = gzip.compress(body) if compressed else body
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=content, headers=headers))
+    return API("bench", "key", rate_limit=False, client=httpx.Client(transport=transport))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=300000, help="number of records in the feed")
+    args = parser.parse_args()
+
+    body = (json.dumps(RECORD) + "\n").encode("utf-8") * args.records
+
+    started = time.perf_counter()
+    for line in feed_api(body, compressed=False).nod(after=-60).response():
+        if line:
+            json.loads(line)
+    elapsed = time.perf_counter() - started
+    print(f"response() + json.loads: {args.records / elapsed:12,.0f} records/s")
+
+    for backend in DECODER_BACKENDS:
+        try:
+            started = time.perf_counter()
+            for record in feed_api(body, compressed=True).nod(after=-60).records(backend=backend):
+                pass
+        except ImportError:
+            print(f"records({backend!r}): not installed")
+            continue
+        elapsed = time.perf_counter() - started
+        print(f"records({backend!r}):{' ' * (13 - len(backend))}{args.records / elapsed:12,.0f} records/s")
+
+
+if __name__ == "__main__":
+    main()
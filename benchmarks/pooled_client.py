@@ -0,0 +1,83 @@
+"""Benchmarks requests/sec against a local stub server with and without the API's pooled HTTP client.
+
+    python benchmarks/pooled_client.py --requests 500
+
+The "before" run mimics the old behaviour of opening a new `httpx.Client` for every request while the "after"
+run goes through `API`, which reuses the pooled connections owned by the API instance.
+"""
+
+import argparse
+import json
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from httpx import Client
+
+from domaintools import API
+
+
+PAYLOAD = json.dumps({"response": {"domain": "domaintools.com", "risk_score": 0}}).encode("utf-8")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, *args):
+        return
+
+
+def start_stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def run_per_request_client(api, total):
+    """Replays the pre-pooling behaviour: one short-lived Client per request."""
+    url = f"{api._rest_api_url}/v1/risk"
+    started = time.perf_counter()
+    for _ in range(total):
+        with Client(timeout=None) as session:
+            session.get(url, params={"domain": "domaintools.com"}).json()
+    return time.perf_counter() - started
+
+
+def run_pooled_client(api, total):
+    started = time.perf_counter()
+    for _ in range(total):
+        api.risk("domaintools.com").data()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500, help="Number of requests per run.")
+    args = parser.parse_args()
+
+    server = start_stub_server()
+    host, port = server.server_address
+    try:
+        with API("benchmark", "benchmark", rate_limit=False, api_url=f"http://{host}", api_port=port) as api:
+            before = run_per_request_client(api, args.requests)
+            after = run_pooled_client(api, args.requests)
+    finally:
+        server.shutdown()
+
+    print(f"client per request: {args.requests / before:10.1f} req/s ({before:.3f}s)")
+    print(f"pooled client:      {args.requests / after:10.1f} req/s ({after:.3f}s)")
+    print(f"speedup:            {before / after:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,15 @@
 """DomainTools Official Python API"""
 
 from domaintools._version import current
-from domaintools.api import API
 
 __version__ = current
+__all__ = ["API"]
+
+
+def __getattr__(name):
+    # API pulls in the HTTP stack, so it is only imported once it is actually used
+    if name == "API":
+        from domaintools.api import API
+
+        return API
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,38 +1,48 @@
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from hashlib import sha1, sha256
 from hmac import new as hmac
-from pathlib import Path
+from itertools import chain, islice
 from typing import Union
 
 import re
-import ssl
-import yaml
+import threading
+import weakref
 
+# httpx, asyncio and ssl are imported where they are first needed to keep `import domaintools` fast
 
 from domaintools.constants import (
     Endpoint,
     OutputFormat,
     ENDPOINT_TO_SOURCE_MAP,
+    IRIS_MAX_DOMAINS_PER_REQUEST,
     RTTF_PRODUCTS_LIST,
     RTTF_PRODUCTS_CMD_MAPPING,
     SPECS_MAPPING,
 )
 from domaintools._version import current as version
 from domaintools.results import (
+    ChunkedIrisResults,
     GroupedIterable,
+    IrisDetectResults,
+    IrisResults,
     ParsedWhois,
     ParsedDomainRdap,
     Reputation,
     Results,
     FeedsResults,
 )
+from domaintools.cache import MemoryCache
+from domaintools.concurrency import SingleFlight
 from domaintools.decorators import api_endpoint, auto_patch_docstrings
+from domaintools.rate_limiter import RateLimiter
+from domaintools.retry import RetryPolicy
+from domaintools.spec_loader import load_spec, spec_path
 from domaintools.filters import (
+    CompiledFilters,
     filter_by_riskscore,
     filter_by_expire_date,
     filter_by_date_updated_after,
     filter_by_field,
-    DTResultFilter,
 )
 from domaintools.utils import validate_feeds_parameters
 
@@ -57,16 +67,53 @@ class API(object):
      By default the API will automatically space out your requests to match your rate limits.
      If your running over multiple Python runtimes, have your own rate limiting approach, or are doing a one-off
      query (such as for a CLI command) you can set rate_limit=False to turn this feature off.
+     Rate limits are tracked per username. To share one quota budget between processes pass a
+     rate_limit_backend, for example FileBackend('/tmp/domaintools-limits') for workers on the same host or
+     RedisBackend('redis://host:6379/0') for workers spread over several hosts (see domaintools.rate_limiter).
+
+     Transient failures (5xx responses, timeouts and connection errors) are retried with exponential backoff and
+     jitter, honoring any Retry-After header sent by the server. Pass a RetryPolicy to tune the number of attempts,
+     the delays and the overall time budget, or RetryPolicy(max_attempts=1) to disable retries:
+
+        from domaintools.retry import RetryPolicy
+
+        api = API('my_name', 'my_key', retry_policy=RetryPolicy(max_attempts=5, max_elapsed=60))
+
+     Responses can be cached so that repeated lookups of the same query are served without a round trip (and
+     without using quota). Caching is off by default: pass cache=True for an in-memory LRU cache, or a cache from
+     domaintools.cache, e.g. SQLiteCache('/tmp/domaintools-cache.db', ttls={'risk': 60}) to share it between runs:
+
+        api = API('my_name', 'my_key', cache=MemoryCache(ttl=300, max_entries=10000))
+
+     Identical requests made at the same time, from several threads or tasks, share a single request in flight
+     (endpoints changing data excepted). Pass coalesce_requests=False to always send each of them.
+
+     Arguments of the Iris endpoints are validated against the bundled OpenAPI spec before a request is sent.
+     Pass validate_requests=False to skip the validation on hot paths where the input is already known to be valid.
 
      If you encounter SSL errors you can pass in verify_ssl=False to avoid verification of the SSL cert.
      To use the API without SSL in it's entirety pass in https=False.
 
+     All requests made through an API instance share one pooled HTTP client, so connections (and their TLS sessions)
+     are reused between calls. The pool can be tuned with max_connections, max_keepalive_connections,
+     keepalive_expiry and http2 (requires the `h2` package). Call close() or use the API as a context manager
+     to release the pooled connections:
+
+        with API('my_name', 'my_key') as api:
+            api.domain_profile('domaintools.com')
+
+     Awaited results share a single pooled `httpx.AsyncClient` per event loop, bounded by the same pool limits.
+     Use `async with` (or `await api.aclose()`) to release it:
+
+        async with API('my_name', 'my_key') as api:
+            async def risk(domain):
+                return await api.risk(domain)
+
+            results = await asyncio.gather(*map(risk, domains))
+
     For detailed usage information of all API calls see: https://www.domaintools.com/resources/api-documentation/
     """
 
-    limits = {}
-    limits_set = False
-
     def __init__(
         self,
         username,
@@ -82,6 +129,18 @@ class API(object):
         app_version=version,
         api_url=None,
         api_port=None,
+        max_connections=100,
+        max_keepalive_connections=20,
+        keepalive_expiry=5.0,
+        http2=False,
+        timeout=None,
+        client=None,
+        async_client=None,
+        rate_limit_backend=None,
+        retry_policy=None,
+        validate_requests=True,
+        cache=None,
+        coalesce_requests=True,
         **default_parameters,
     ):
         if not default_parameters:
@@ -93,6 +152,10 @@ class API(object):
         self.https = https
         self.verify_ssl = self._get_ssl_default_context(verify_ssl)
         self.rate_limit = rate_limit
+        self.rate_limit_backend = rate_limit_backend
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.limits = {}
+        self.limits_set = False
         self.proxy_url = proxy_url
         self.extra_request_params = {}
         self.always_sign_api_key = always_sign_api_key
@@ -101,6 +164,23 @@ class API(object):
         self.default_parameters["app_name"] = app_name
         self.default_parameters["app_version"] = app_version
         self.specs = {}
+        self.validate_requests = validate_requests
+        self.single_flight = SingleFlight() if coalesce_requests else None
+        # caches define __len__, so an empty one is falsy
+        self.cache = MemoryCache() if cache is True else (None if cache is False else cache)
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self.timeout = timeout
+        self._client = client
+        # a client passed in belongs to the caller, who closes it
+        self._owns_client = client is None
+        self._client_lock = threading.Lock()
+        self._async_client = async_client
+        # the pooled async clients created for each event loop, see async_client
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._closing_tasks = set()
 
         self._build_api_url(api_url, api_port)
         self._initialize_specs()
@@ -113,27 +193,157 @@ class API(object):
             raise Exception("Proxy URL must be a string. For example: '127.0.0.1:8888'")
 
     def _initialize_specs(self):
-        package_root = Path(__file__).parent
-        for spec_name, file_path in SPECS_MAPPING.items():
-            specs_file_path = f"{package_root}/specs/{file_path}"
+        for spec_name in SPECS_MAPPING:
+            specs_file_path = spec_path(spec_name)
             try:
-                with open(specs_file_path, "r", encoding="utf-8") as f:
-                    spec_content = yaml.safe_load(f)
-                if not spec_content:
-                    raise ValueError("Spec file is empty or invalid.")
-
-                self.specs[spec_name] = spec_content
-
+                self.specs[spec_name] = load_spec(specs_file_path)
             except Exception as e:
                 print(f"Error loading {specs_file_path}: {e}")
 
-    def _get_ssl_default_context(self, verify_ssl: Union[str, bool]):
-        return (
-            ssl.create_default_context(cafile=verify_ssl)
-            if isinstance(verify_ssl, str)
-            else verify_ssl
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def client(self):
+        """The pooled `httpx.Client` shared by every request made through this API instance"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from httpx import Client
+
+                    self._client = Client(
+                        verify=self.verify_ssl,
+                        proxy=self.proxy_url,
+                        timeout=self.timeout,
+                        limits=self._get_connection_limits(),
+                        http2=self.http2,
+                    )
+        return self._client
+
+    @property
+    def async_client(self):
+        """The pooled `httpx.AsyncClient` shared by every awaited result on the running event loop"""
+        if self._async_client is not None:
+            # given when creating the API, used on any loop
+            return self._async_client
+
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        with self._client_lock:
+            async_client = self._async_clients.get(loop)
+            if async_client is None:
+                from httpx import AsyncClient
+
+                # httpx.AsyncClient connections are bound to the loop that opened them. The clients of loops that
+                # have been closed since (e.g. by a previous asyncio.run()) can not be used any more.
+                self._discard_async_clients(self._pop_closed_loop_clients())
+
+                async_client = self._async_clients[loop] = AsyncClient(
+                    verify=self.verify_ssl,
+                    proxy=self.proxy_url,
+                    timeout=self.timeout,
+                    limits=self._get_connection_limits(),
+                    http2=self.http2,
+                )
+        return async_client
+
+    def _pop_closed_loop_clients(self):
+        """Removes the async clients of the event loops that have been closed and returns them. Call with the lock."""
+        return [self._async_clients.pop(loop) for loop in list(self._async_clients) if loop.is_closed()]
+
+    @staticmethod
+    async def _aclose_discarded(async_client):
+        try:
+            await async_client.aclose()
+        except Exception:
+            # its connections belong to a closed loop and can not be shut down cleanly any more
+            pass
+
+    def _discard_async_clients(self, async_clients):
+        """Closes the async clients of closed event loops, releasing their connections and the closed loops: in the
+        background of the running event loop if there is one, on an event loop of their own otherwise"""
+        if not async_clients:
+            return
+
+        import asyncio
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+
+            async def aclose_all():
+                for async_client in async_clients:
+                    await self._aclose_discarded(async_client)
+
+            asyncio.run(aclose_all())
+            return
+
+        for async_client in async_clients:
+            task = loop.create_task(self._aclose_discarded(async_client))
+            self._closing_tasks.add(task)
+            task.add_done_callback(self._closing_tasks.discard)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    async def aclose(self):
+        """Closes the pooled HTTP clients: the async one of the running event loop, those of event loops closed since
+        they were used and the sync one. New ones are created on the next request. Clients passed in when creating the
+        API are left open."""
+        import asyncio
+
+        with self._client_lock:
+            async_client = self._async_clients.pop(asyncio.get_running_loop(), None)
+            discarded = self._pop_closed_loop_clients()
+            client = self._take_own_client()
+        if async_client is not None:
+            await async_client.aclose()
+        for discarded_client in discarded:
+            await self._aclose_discarded(discarded_client)
+        if client is not None:
+            client.close()
+
+    def _get_connection_limits(self):
+        from httpx import Limits
+
+        return Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
         )
 
+    def _take_own_client(self):
+        """Returns the sync client created by the API, forgetting it, or None. Call with the lock."""
+        if not self._owns_client:
+            return None
+        client, self._client = self._client, None
+        return client
+
+    def close(self):
+        """Closes the pooled HTTP client and the async ones of event loops closed since they were used. New ones are
+        created on the next request. Clients passed in when creating the API are left open."""
+        with self._client_lock:
+            client = self._take_own_client()
+            discarded = self._pop_closed_loop_clients()
+        if client is not None:
+            client.close()
+        self._discard_async_clients(discarded)
+
+    def _get_ssl_default_context(self, verify_ssl: Union[str, bool]):
+        if not isinstance(verify_ssl, str):
+            return verify_ssl
+
+        import ssl
+
+        return ssl.create_default_context(cafile=verify_ssl)
+
     def _build_api_url(self, api_url=None, api_port=None):
         """Build the API url based on the given url and port. Defaults to `https://api.domaintools.com`"""
         rest_api_url = "https://api.domaintools.com"
@@ -153,16 +363,12 @@ class API(object):
 
         self.limits_set = True
         for product in self.account_information():
-            limit_minutes = product["per_minute_limit"] or None
-            limit_hours = product["per_hour_limit"] or None
-
-            default = 3600
-            hours = limit_hours and 3600 / float(limit_hours)
-            minutes = limit_minutes and 60 / float(limit_minutes)
-
-            self.limits[product["id"]] = {
-                "interval": timedelta(seconds=minutes or hours or default)
-            }
+            self.limits[product["id"]] = RateLimiter.from_limits(
+                per_minute_limit=product["per_minute_limit"] or None,
+                per_hour_limit=product["per_hour_limit"] or None,
+                key=f"{self.username}:{product['id']}",
+                backend=self.rate_limit_backend,
+            )
 
     def _results(self, product, path, cls=Results, **kwargs):
         """Returns _results for the specified API path with the specified **kwargs parameters"""
@@ -194,7 +400,10 @@ class API(object):
             }
         )
 
-        return cls(self, product, uri, **parameters)
+        results = cls(self, product, uri, **parameters)
+        # what was asked for, before signing, so that further pages of the query are signed when they are requested
+        results.query = (path, kwargs)
+        return results
 
     def _handle_api_key_parameters(self, is_rttf_product):
         if self.always_sign_api_key is None:
@@ -573,6 +782,24 @@ class API(object):
             **kwargs,
         )
 
+    def _chunked_iris_results(self, product, path, domains, page_factory):
+        """Returns page_factory(domains) when the domains fit in a single request, otherwise ChunkedIrisResults
+        that request them IRIS_MAX_DOMAINS_PER_REQUEST at a time. Only the first chunk is read upfront."""
+        domains = iter(domains)
+        first_chunk = list(islice(domains, IRIS_MAX_DOMAINS_PER_REQUEST + 1))
+        if not first_chunk:
+            raise ValueError("One or more domains must be provided")
+        if len(first_chunk) <= IRIS_MAX_DOMAINS_PER_REQUEST:
+            return page_factory(first_chunk).apply_result_filters()
+
+        return ChunkedIrisResults(
+            self,
+            product,
+            "/".join((self._rest_api_url, path.lstrip("/"))),
+            chain(first_chunk, domains),
+            page_factory,
+        )
+
     def iris_enrich(self, *domains, **kwargs):
         """Returns back enriched data related to the specified domains using our Iris Enrich service
         each domain should be passed in as an un-named argument to the method:
@@ -588,50 +815,58 @@ class API(object):
         for example:
             enrich_domains = ['google.com', 'amazon.com']
             assert api.iris_enrich(*enrich_domains)['missing_domains'] == []
+
+        A single iterable of domains (a list, a generator over a large file, ...) can be passed instead. More domains
+        than a request accepts are split into chunks that are requested concurrently and merged in order:
+
+            for enrichment in api.iris_enrich(line.strip() for line in open('domains.txt')).iter_all():
+
+        Results can be filtered with an expression of domaintools.filters.F, evaluated as they are received:
+
+            api.iris_enrich(*DOMAIN_LIST, where=(F.risk_score > 70) & (F.tld == 'com'))
         """
+        if len(domains) == 1 and not isinstance(domains[0], str):
+            domains = domains[0]  # a single list, set, generator, ... of domains
         if not domains:
             raise ValueError("One or more domains to enrich must be provided")
 
-        domains = ",".join(domains)
-        data_updated_after = kwargs.get("data_updated_after", None)
+        data_updated_after = kwargs.pop("data_updated_after", None)
         if hasattr(data_updated_after, "strftime"):
             data_updated_after = data_updated_after.strftime("%Y-%m-%d")
+        # Iris Enrich takes no search filter parameters, the whole expression is evaluated locally
+        where = kwargs.pop("where", None)
 
-        results = self._results(
-            "iris-enrich",
-            "/v1/iris-enrich/",
-            domain=domains,
-            data_updated_after=data_updated_after,
-            items_path=("results",),
-            **kwargs,
-        )
-
-        risk_score = kwargs.pop("risk_score", {}) or None
-        younger_than_date = kwargs.pop("younger_than_date", {}) or None
-        older_than_date = kwargs.pop("older_than_date", {}) or None
-        updated_after = kwargs.pop("updated_after", {}) or None
-        include_domains_with_missing_field = (
-            kwargs.pop("include_domains_with_missing_field", {}) or None
-        )
-        exclude_domains_with_missing_field = (
-            kwargs.pop("exclude_domains_with_missing_field", {}) or None
-        )
-
-        filtered_results = DTResultFilter(result_set=results).by(
+        # kept on the results so every chunk of domains is filtered the same way
+        result_filters = CompiledFilters(
             [
-                filter_by_riskscore(threshold=risk_score),
-                filter_by_expire_date(date=younger_than_date, lookup_type="before"),
-                filter_by_expire_date(date=older_than_date, lookup_type="after"),
-                filter_by_date_updated_after(date=updated_after),
-                filter_by_field(field=include_domains_with_missing_field, filter_type="include"),
-                filter_by_field(field=exclude_domains_with_missing_field, filter_type="exclude"),
+                filter_by_riskscore(threshold=kwargs.get("risk_score") or None),
+                filter_by_expire_date(date=kwargs.get("younger_than_date") or None, lookup_type="before"),
+                filter_by_expire_date(date=kwargs.get("older_than_date") or None, lookup_type="after"),
+                filter_by_date_updated_after(date=kwargs.get("updated_after") or None),
+                filter_by_field(
+                    field=kwargs.get("include_domains_with_missing_field") or None, filter_type="include"
+                ),
+                filter_by_field(
+                    field=kwargs.get("exclude_domains_with_missing_field") or None, filter_type="exclude"
+                ),
             ]
+            + ([where] if where is not None else [])
         )
 
-        results["results"] = filtered_results
-        results["results_count"] = len(filtered_results)
+        def enrich(chunk):
+            results = self._results(
+                "iris-enrich",
+                "/v1/iris-enrich/",
+                domain=",".join(chunk),
+                data_updated_after=data_updated_after,
+                items_path=("results",),
+                cls=IrisResults,
+                **kwargs,
+            )
+            results.result_filters = result_filters
+            return results
 
-        return results
+        return self._chunked_iris_results("iris-enrich", "/v1/iris-enrich/", domains, enrich)
 
     def iris_enrich_cli(self, domains=None, **kwargs):
         """Returns back enriched data related to the specified domains using our Iris Enrich service.
@@ -653,20 +888,7 @@ class API(object):
         if not domains:
             raise ValueError("One or more domains to enrich must be provided")
 
-        if isinstance(domains, (list, tuple)):
-            domains = ",".join(domains)
-        data_updated_after = kwargs.get("data_updated_after", None)
-        if hasattr(data_updated_after, "strftime"):
-            data_updated_after = data_updated_after.strftime("%Y-%m-%d")
-
-        return self._results(
-            "iris-enrich",
-            "/v1/iris-enrich/",
-            domain=domains,
-            data_updated_after=data_updated_after,
-            items_path=("results",),
-            **kwargs,
-        )
+        return self.iris_enrich(domains.split(",") if isinstance(domains, str) else domains, **kwargs)
 
     @api_endpoint(spec_name="iris", path="/v1/iris-investigate/", methods="post")
     def iris_investigate(
@@ -683,6 +905,7 @@ class API(object):
         updated_after=None,
         include_domains_with_missing_field=None,
         exclude_domains_with_missing_field=None,
+        where=None,
         **kwargs,
     ):
         """Returns back a list of domains based on the provided filters.
@@ -698,6 +921,20 @@ class API(object):
         api.iris_investigate(QUERY)['position'] Returns the position key that can be used to retrieve the next page:
             next_page = api.iris_investigate(QUERY, position=api.iris_investigate(QUERY)['position'])
 
+        To stream the results of every page (the next page is fetched while the current one is processed):
+
+            for result in api.iris_investigate(QUERY).iter_all():
+            async for result in api.iris_investigate(QUERY).aiter_all():
+
+        `domains` can be any iterable. More domains than a request accepts are split into chunks that are requested
+        concurrently, iter_all() then streams the results of every chunk.
+
+        `where` filters the results with an expression of domaintools.filters.F. The conditions Iris can apply
+        (on create_date, expiration_date, active and tld) are sent as search filter parameters, so the results they
+        exclude are never downloaded. The rest of the expression is evaluated locally as the results are received:
+
+            api.iris_investigate(ip='199.30.228.112', where=(F.risk_score > 70) & (F.create_date >= '2024-01-01'))
+
         for enrichment in api.iris_enrich(i):  # Enables looping over all returned enriched domains
 
         """
@@ -708,8 +945,6 @@ class API(object):
         if not (kwargs or domains):
             raise ValueError("Need to define investigation using kwarg filters or domains")
 
-        if isinstance(domains, (list, tuple)):
-            domains = ",".join(domains)
         if hasattr(data_updated_after, "strftime"):
             data_updated_after = data_updated_after.strftime("%Y-%m-%d")
         if hasattr(expiration_date, "strftime"):
@@ -719,18 +954,16 @@ class API(object):
         if isinstance(active, bool):
             kwargs["active"] = str(active).lower()
 
-        results = self._results(
-            "iris-investigate",
-            "/v1/iris-investigate/",
-            domain=domains,
-            data_updated_after=data_updated_after,
-            expiration_date=expiration_date,
-            create_date=create_date,
-            items_path=("results",),
-            **kwargs,
-        )
+        if where is not None:
+            # parameters given explicitly are kept, the conditions they would have been sent as are evaluated locally
+            given = {"expiration_date": expiration_date, "create_date": create_date, **kwargs}
+            parameters, where = where.pushdown(reserved=[name for name, value in given.items() if value is not None])
+            expiration_date = parameters.pop("expiration_date", expiration_date)
+            create_date = parameters.pop("create_date", create_date)
+            kwargs.update(parameters)
 
-        filtered_results = DTResultFilter(result_set=results).by(
+        # kept on the results so every page fetched by iter_all() (or chunk of domains) is filtered the same way
+        result_filters = CompiledFilters(
             [
                 filter_by_riskscore(threshold=risk_score),
                 filter_by_expire_date(date=younger_than_date, lookup_type="before"),
@@ -739,12 +972,30 @@ class API(object):
                 filter_by_field(field=include_domains_with_missing_field, filter_type="include"),
                 filter_by_field(field=exclude_domains_with_missing_field, filter_type="exclude"),
             ]
+            + ([where] if where is not None else [])
         )
 
-        results["results"] = filtered_results
-        results["results_count"] = len(filtered_results)
+        def investigate(chunk):
+            results = self._results(
+                "iris-investigate",
+                "/v1/iris-investigate/",
+                domain=",".join(chunk) if chunk is not None else None,
+                data_updated_after=data_updated_after,
+                expiration_date=expiration_date,
+                create_date=create_date,
+                items_path=("results",),
+                cls=IrisResults,
+                **kwargs,
+            )
+            results.result_filters = result_filters
+            return results
 
-        return results
+        if not domains:
+            return investigate(None).apply_result_filters()
+
+        if isinstance(domains, str):
+            domains = domains.split(",")
+        return self._chunked_iris_results("iris-investigate", "/v1/iris-investigate/", domains, investigate)
 
     def iris_detect_monitors(
         self,
@@ -772,6 +1023,8 @@ class API(object):
         offset: int: default 0. Offset for pagination
 
         limit: int: default 500. Limit for pagination. Restricted to maximum 100 if include_counts is set to True.
+
+        Call iter_all() on the results to stream the items of every page, fetched concurrently by offset.
         """
 
         if include_counts:
@@ -793,6 +1046,7 @@ class API(object):
             limit=limit,
             items_path=("monitors",),
             response_path=(),
+            cls=IrisDetectResults,
             **kwargs,
         )
 
@@ -847,6 +1101,8 @@ class API(object):
 
         preview: bool: default None. Preview mode used for testing. If set to True, only the first 10 results are
         returned but not limited by hourly restrictions.
+
+        Call iter_all() on the results to stream the items of every page, fetched concurrently by offset.
         """
         if discovered_since:
             if isinstance(discovered_since, datetime):
@@ -879,6 +1135,7 @@ class API(object):
             limit=limit,
             items_path=("watchlist_domains",),
             response_path=(),
+            cls=IrisDetectResults,
             **kwargs,
         )
 
@@ -942,6 +1199,8 @@ class API(object):
 
         preview: bool: default None. Preview mode used for testing. If set to True, only the first 10 results are
         returned but not limited by hourly restrictions.
+
+        Call iter_all() on the results to stream the items of every page, fetched concurrently by offset.
         """
         if discovered_since:
             if isinstance(discovered_since, datetime):
@@ -981,6 +1240,7 @@ class API(object):
             limit=limit,
             items_path=("watchlist_domains",),
             response_path=(),
+            cls=IrisDetectResults,
             **kwargs,
         )
 
@@ -1080,6 +1340,8 @@ class API(object):
 
         preview: bool: default None. Preview mode used for testing. If set to True, only the first 10 results are
         returned but not limited by hourly restrictions.
+
+        Call iter_all() on the results to stream the items of every page, fetched concurrently by offset.
         """
         if discovered_since:
             if isinstance(discovered_since, datetime):
@@ -1119,6 +1381,7 @@ class API(object):
             limit=limit,
             items_path=("watchlist_domains",),
             response_path=(),
+            cls=IrisDetectResults,
             **kwargs,
         )
 
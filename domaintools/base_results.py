@@ -1,14 +1,14 @@
 """Defines the base result object - which specifies how DomainTools API endpoints will be interacted with"""
 
+import io
 import json
 import re
-import time
 import logging
 
 from copy import deepcopy
-from datetime import datetime
-from httpx import Client
+from itertools import chain
 
+from domaintools.cache import MUTATING_PRODUCTS, request_key
 from domaintools.constants import (
     RTTF_PRODUCTS_LIST,
     OutputFormat,
@@ -33,6 +33,13 @@ except ImportError:  # pragma: no cover
 
 log = logging.getLogger(__name__)
 
+# formats rendered from the JSON response instead of being requested from the API
+LOCAL_FORMATS = ("jsonl", "csv")
+
+
+def _csv_record(record):
+    return record if isinstance(record, dict) else {"value": record}
+
 
 class Results(MutableMapping, MutableSequence):
     """The base (abstract) DomainTools result definition"""
@@ -59,25 +66,20 @@ class Results(MutableMapping, MutableSequence):
         self._data = None
         self._status = None
 
-    def _wait_time(self):
-        if not self.api.rate_limit or not self.product in self.api.limits:
-            return 0
-
-        now = datetime.now()
-        limit = self.api.limits[self.product]
-        if "last_scheduled" not in limit:
-            limit["last_scheduled"] = now
+    def _rate_limiter(self):
+        if not self.api.rate_limit or self.product == "account-information":
             return None
 
-        safe_after = limit["last_scheduled"] + limit["interval"]
-        wait_for = 0
-        if now < safe_after:
-            wait_for = safe_after - now
-            wait_for = float(wait_for.seconds) + (float(wait_for.microseconds) / 1000000.0)
-            limit["last_scheduled"] = safe_after
-        else:
-            limit["last_scheduled"] = now
+        return self.api.limits.get(self.product)
 
+    def _wait_for_rate_limit(self):
+        limiter = self._rate_limiter()
+        if limiter is None:
+            return 0
+
+        wait_for = limiter.wait()
+        if wait_for > 0:
+            log.info("Slept for [%s] prior to requesting [%s].", wait_for, self.product)
         return wait_for
 
     def _get_session_params_and_headers(self):
@@ -100,60 +102,89 @@ class Results(MutableMapping, MutableSequence):
         return session_param_and_headers
 
     def _make_request(self):
-        with Client(verify=self.api.verify_ssl, proxy=self.api.proxy_url, timeout=None) as session:
-            session_params_and_headers = self._get_session_params_and_headers()
-            headers = session_params_and_headers.get("headers")
-            if self.product in [
-                "iris-investigate",
-                "iris-enrich",
-                "iris-detect-escalate-domains",
-            ]:
-                post_data = self.kwargs.copy()
-                post_data.update(self.api.extra_request_params)
-                return session.post(url=self.url, data=post_data, headers=headers)
-            elif self.product in ["iris-detect-manage-watchlist-domains"]:
-                patch_data = self.kwargs.copy()
-                patch_data.update(self.api.extra_request_params)
-                return session.patch(url=self.url, json=patch_data, headers=headers)
-            else:
-                parameters = session_params_and_headers.get("parameters")
-                return session.get(
-                    url=self.url,
-                    params=parameters,
-                    headers=headers,
-                    **self.api.extra_request_params,
-                )
+        session = self.api.client
+        session_params_and_headers = self._get_session_params_and_headers()
+        headers = session_params_and_headers.get("headers")
+        if self.product in [
+            "iris-investigate",
+            "iris-enrich",
+            "iris-detect-escalate-domains",
+        ]:
+            post_data = self.kwargs.copy()
+            post_data.update(self.api.extra_request_params)
+            return session.post(url=self.url, data=post_data, headers=headers)
+        elif self.product in ["iris-detect-manage-watchlist-domains"]:
+            patch_data = self.kwargs.copy()
+            patch_data.update(self.api.extra_request_params)
+            return session.patch(url=self.url, json=patch_data, headers=headers)
+        else:
+            parameters = session_params_and_headers.get("parameters")
+            return session.get(
+                url=self.url,
+                params=parameters,
+                headers=headers,
+                **self.api.extra_request_params,
+            )
+
+    def _send_request(self):
+        self._wait_for_rate_limit()
+        return self._make_request()
+
+    def _is_idempotent(self):
+        """Whether the request can be sent again after a failure. A request changing data may have been applied."""
+        return self.product not in MUTATING_PRODUCTS
 
     def _get_results(self):
-        wait_for = self._wait_time()
-        if self.api.rate_limit and (wait_for is None or self.product == "account-information"):
-            data = self._make_request()
-            if data.status_code == 503:  # pragma: no cover
-                sleeptime = 60
-                log.info(
-                    "503 encountered for [%s] - sleeping [%s] seconds before retrying request.",
-                    self.product,
-                    sleeptime,
-                )
-                time.sleep(sleeptime)
-                self._wait_time()
-                data = self._make_request()
-            return data
+        return self.api.retry_policy.call(self._send_request, idempotent=self._is_idempotent())
 
-        if wait_for > 0:
-            log.info("Sleeping for [%s] prior to requesting [%s].", wait_for, self.product)
-            time.sleep(wait_for)
-        return self._make_request()
+    def _request_key(self):
+        return request_key(self.product, self.url, self.kwargs, credential=(self.api.username, self.api.key))
+
+    def _flight_key(self):
+        """The key requests are coalesced on, None when this request has to be sent regardless"""
+        if getattr(self.api, "single_flight", None) is None or self.product in MUTATING_PRODUCTS:
+            return None
+        return self._request_key()
+
+    def _coalesced(self, send):
+        """Returns send(), or the response of the identical request already in flight in another thread"""
+        key = self._flight_key()
+        return send() if key is None else self.api.single_flight.do(key, send)
+
+    def _cache_key(self):
+        cache = getattr(self.api, "cache", None)
+        if cache is None or not cache.caches(self.product):
+            return None
+        return self._request_key()
+
+    def _load_cached(self):
+        """Takes the data from the response cache of the API, returns whether it was cached"""
+        key = self._cache_key()
+        data = self.api.cache.get(key) if key is not None else None
+        if data is None:
+            return False
+
+        self._data = data
+        self._status = 200
+        return True
+
+    def _store_cached(self):
+        key = self._cache_key()
+        if key is not None:
+            self.api.cache.set(key, self._data, self.product)
 
     def data(self):
-        if self._data is None:
-            results = self._get_results()
+        if self._data is None and not self._load_cached():
+            results = self._coalesced(self._get_results)
             self.setStatus(results.status_code, results)
             if self.kwargs.get("format", "json") == "json":
                 self._data = results.json()
             else:
                 self._data = results.text
 
+            self.check_limit_exceeded()
+            self._store_cached()
+
         self.check_limit_exceeded()
 
         return self._data
@@ -175,6 +206,8 @@ class Results(MutableMapping, MutableSequence):
     @property
     def status(self):
         if not getattr(self, "_status", None) and not self.product in RTTF_PRODUCTS_LIST:
+            if self._data is None and self._load_cached():
+                return self._status
             self._status = self._get_results().status_code
 
         return self._status
@@ -275,70 +308,93 @@ class Results(MutableMapping, MutableSequence):
     def __exit__(self, *args):
         return
 
-    @property
-    def json(self):
-        self.kwargs.pop("format", None)
-        return self.__class__(
-            format="json",
-            product=self.product,
-            url=self.url,
+    def _with_format(self, format, data=None):
+        """Returns these results in another format, already holding `data` when it was rendered locally"""
+        results = self.__class__(
+            self.api,
+            self.product,
+            self.url,
             items_path=self.items_path,
             response_path=self.response_path,
-            api=self.api,
-            **self.kwargs,
+            proxy_url=self.proxy_url,
+            **dict(self.kwargs, format=format),
         )
+        if data is not None:
+            results._data, results._status = data, 200
+        return results
+
+    def _records(self):
+        """The records written by write_jsonl() and write_csv(): the items, or the whole response without items"""
+        source = self if self.kwargs.get("format", "json") == "json" else self._with_format("json")
+        records = source._items() if source.items_path else None
+        return records if isinstance(records, list) else [source.response()]
+
+    def write_jsonl(self, out):
+        """Writes the records of the results to the text file out, one JSON document per line"""
+        for record in self._records():
+            out.write(json.dumps(record))
+            out.write("\n")
+
+    def write_csv(self, out, columns=None):
+        """Writes the records of the results to the text file out as CSV, nested values encoded as JSON.
+
+        The columns default to every key of the records, or to the keys of the first record when the records are
+        streamed (see ChunkedIrisResults).
+        """
+        import csv
+
+        records = self._records()
+        if columns is None:
+            if isinstance(records, list):
+                columns = list(dict.fromkeys(key for record in records for key in _csv_record(record)))
+            else:
+                records = iter(records)
+                first = next(records, None)
+                columns = list(_csv_record(first)) if first is not None else []
+                records = chain([first], records) if first is not None else records
+
+        writer = csv.DictWriter(out, fieldnames=columns, restval="", extrasaction="ignore")
+        writer.writeheader()
+        for record in records:
+            writer.writerow(
+                {
+                    key: json.dumps(value, separators=(",", ":")) if isinstance(value, (dict, list)) else value
+                    for key, value in _csv_record(record).items()
+                }
+            )
+
+    def _rendered(self, format, write):
+        out = io.StringIO()
+        write(out)
+        return self._with_format(format, data=out.getvalue())
+
+    @property
+    def json(self):
+        if self.kwargs.get("format", "json") == "json":
+            return self
+        return self._with_format("json")
 
     @property
     def jsonl(self):
-        self.kwargs.pop("format", None)
-        return self.__class__(
-            format="jsonl",
-            product=self.product,
-            url=self.url,
-            items_path=self.items_path,
-            response_path=self.response_path,
-            api=self.api,
-            **self.kwargs,
-        )
+        """The results as JSON lines, rendered from the JSON response"""
+        return self._rendered("jsonl", self.write_jsonl)
 
     @property
     def csv(self):
-        self.kwargs.pop("format", None)
-        return self.__class__(
-            format="csv",
-            product=self.product,
-            url=self.url,
-            items_path=self.items_path,
-            response_path=self.response_path,
-            api=self.api,
-            **self.kwargs,
-        )
+        """The results as CSV, rendered from the JSON response"""
+        return self._rendered("csv", self.write_csv)
 
     @property
     def xml(self):
-        self.kwargs.pop("format", None)
-        return self.__class__(
-            format="xml",
-            product=self.product,
-            url=self.url,
-            items_path=self.items_path,
-            response_path=self.response_path,
-            api=self.api,
-            **self.kwargs,
-        )
+        if self.kwargs.get("format") == "xml":
+            return self
+        return self._with_format("xml")
 
     @property
     def html(self):
-        self.kwargs.pop("format", None)
-        return self.__class__(
-            api=self.api,
-            product=self.product,
-            url=self.url,
-            items_path=self.items_path,
-            response_path=self.response_path,
-            format="html",
-            **self.kwargs,
-        )
+        if self.kwargs.get("format") == "html":
+            return self
+        return self._with_format("html")
 
     def as_list(self):
         return "\n".join(
@@ -0,0 +1,217 @@
+"""An opt-in cache of API responses, so that repeated lookups of the same query are served without a round trip"""
+
+import json
+import os
+import threading
+import time
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from hashlib import blake2b
+
+from domaintools.constants import RTTF_PRODUCTS_LIST
+
+# parameters added to every request by API.handle_api_key that do not change what the request returns
+VOLATILE_PARAMETERS = frozenset(("timestamp", "signature", "api_key"))
+
+# the endpoints changing data, whose requests must each be sent
+MUTATING_PRODUCTS = frozenset(("iris-detect-escalate-domains", "iris-detect-manage-watchlist-domains"))
+
+# streamed feeds, the account usage and the endpoints changing data are always requested
+UNCACHEABLE_PRODUCTS = frozenset(RTTF_PRODUCTS_LIST + ["account-information"]) | MUTATING_PRODUCTS
+
+DEFAULT_TTL = 300
+
+# registration data changes far less often than risk and reputation scores
+DEFAULT_PRODUCT_TTLS = {
+    "domain-profile": 3600,
+    "hosting-history": 3600,
+    "parsed-domain-rdap": 3600,
+    "parsed-whois": 3600,
+    "whois": 3600,
+    "whois-history": 3600,
+}
+
+
+def _normalize(value):
+    if isinstance(value, (list, tuple)):
+        return [str(item) for item in value]
+    return str(value)
+
+
+def request_key(product, url, parameters, credential=None):
+    """Returns the identity of a request: a digest of its product, url and parameters, without the volatile ones.
+
+    Parameters are compared as the strings they are sent as, regardless of the order they were given in. credential,
+    the (username, key) the request is sent with, keeps the responses of different accounts sharing a cache apart.
+    """
+    normalized = sorted(
+        (name, _normalize(value)) for name, value in parameters.items() if name not in VOLATILE_PARAMETERS
+    )
+    identity = json.dumps([product, url, normalized, credential], separators=(",", ":"))
+    return blake2b(identity.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ResponseCache(ABC):
+    """Where responses are cached, by request key. Implement _load(), _store() and clear() to keep them elsewhere.
+
+    Each product is cached for `ttls[product]` seconds (DEFAULT_PRODUCT_TTLS by default), other products for `ttl`
+    seconds; a TTL of 0 disables caching of that product. Once more than `max_entries` responses (or more than
+    `max_bytes` of them) are cached, the least recently used ones are evicted.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, ttls=None, max_entries=1024, max_bytes=None):
+        self.ttl = ttl
+        self.ttls = dict(DEFAULT_PRODUCT_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def ttl_for(self, product):
+        return self.ttls.get(product, self.ttl)
+
+    def caches(self, product):
+        """Returns whether the responses of product are cached"""
+        return product not in UNCACHEABLE_PRODUCTS and bool(self.ttl_for(product))
+
+    def get(self, key):
+        """Returns the data cached under key, or None if it is missing or expired"""
+        payload = self._load(key)
+        return json.loads(payload) if payload is not None else None
+
+    def set(self, key, data, product):
+        """Caches data (the decoded JSON or the text of a response) under key for the TTL of product"""
+        # kept serialized: every hit decodes its own copy, so callers changing their results can not alter the cache
+        self._store(key, json.dumps(data, separators=(",", ":")), self.ttl_for(product))
+
+    @abstractmethod
+    def _load(self, key):
+        """Returns the serialized data cached under key, or None if it is missing or expired"""
+
+    @abstractmethod
+    def _store(self, key, payload, ttl):
+        """Caches the serialized payload under key for ttl seconds, evicting entries over the limits"""
+
+    @abstractmethod
+    def clear(self):
+        """Removes every cached response"""
+
+
+class MemoryCache(ResponseCache):
+    """Caches responses in memory for the lifetime of the process"""
+
+    def __init__(self, ttl=DEFAULT_TTL, ttls=None, max_entries=1024, max_bytes=None):
+        super().__init__(ttl=ttl, ttls=ttls, max_entries=max_entries, max_bytes=max_bytes)
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _load(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._discard(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def _store(self, key, payload, ttl):
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (time.monotonic() + ttl, payload)
+            self._size += len(payload)
+            while self._entries and (
+                len(self._entries) > self.max_entries or (self.max_bytes and self._size > self.max_bytes)
+            ):
+                self._discard(next(iter(self._entries)))
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class SQLiteCache(ResponseCache):
+    """Caches responses in a SQLite database at path, so that they are shared between runs and processes"""
+
+    def __init__(self, path, ttl=DEFAULT_TTL, ttls=None, max_entries=100000, max_bytes=None):
+        import sqlite3
+
+        super().__init__(ttl=ttl, ttls=ttls, max_entries=max_entries, max_bytes=max_bytes)
+        self.path = os.fspath(path)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, expires REAL, accessed REAL, size INTEGER, payload TEXT)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _load(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT expires, payload FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[0] <= now:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+
+            self._connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            return row[1]
+
+    def _store(self, key, payload, ttl):
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, now + ttl, now, len(payload), payload),
+            )
+            self._evict(now)
+
+    def _evict(self, now):
+        execute = self._connection.execute
+        execute("DELETE FROM responses WHERE expires <= ?", (now,))
+        count, size = execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        excess = max(count - self.max_entries, 0)
+        if self.max_bytes and size > self.max_bytes:
+            # the least recently used responses that have to go to bring the total size under max_bytes
+            rows = execute("SELECT size FROM responses ORDER BY accessed").fetchall()
+            freed, needed = 0, 0
+            for (row_size,) in rows:
+                if size - freed <= self.max_bytes:
+                    break
+                freed += row_size
+                needed += 1
+            excess = max(excess, needed)
+        if excess:
+            execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed LIMIT ?)",
+                (excess,),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,330 @@
+"""Records how far a Real Time Threat Feed has been consumed so that a consumer can resume where it stopped"""
+
+import json
+import os
+import tempfile
+import threading
+
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime, timedelta
+from hashlib import blake2b
+
+# the feeds serve records roughly, not strictly, in timestamp order. Records up to this many seconds older than the
+# newest acknowledged one are still told apart by their fingerprint instead of being dropped as already delivered.
+DEFAULT_LOOKBACK_SECONDS = 60
+
+# at most this many fingerprints are kept (and saved with every commit), so that the cost of a commit does not grow
+# with the rate of the feed. Past it the window told apart by fingerprint starts at the oldest one kept.
+DEFAULT_MAX_RECENT = 10000
+
+# without a sessionID or time range the feeds return the last hour, which is replayed when nothing was acknowledged
+DEFAULT_REPLAY_AFTER = -3600
+
+
+class FeedCheckpoint:
+    """How far a feed has been consumed:
+
+    session_id: the sessionID of the feed
+    timestamp: the newest timestamp of the acknowledged records
+    recent: [timestamp, fingerprint] of the latest records acknowledged within the lookback of `timestamp`
+    records: the number of acknowledged records
+    partial: whether the last response of the session was partial (206), i.e. more data is waiting
+    in_flight: whether a response was being consumed when the checkpoint was saved
+    """
+
+    __slots__ = ("session_id", "timestamp", "recent", "records", "partial", "in_flight")
+
+    def __init__(self, session_id=None, timestamp=None, recent=(), records=0, partial=False, in_flight=False):
+        self.session_id = session_id
+        self.timestamp = timestamp
+        self.recent = [list(entry) for entry in recent]
+        self.records = records
+        self.partial = partial
+        self.in_flight = in_flight
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(session_id={self.session_id!r}, timestamp={self.timestamp!r}, "
+            f"records={self.records})"
+        )
+
+
+class CheckpointStore(ABC):
+    """Where checkpoints are kept, by key. Implement load(), save() and delete() to keep them elsewhere."""
+
+    @abstractmethod
+    def load(self, key):
+        """Returns the FeedCheckpoint saved under key or None"""
+
+    @abstractmethod
+    def save(self, key, checkpoint):
+        """Saves checkpoint under key, replacing the one saved before"""
+
+    @abstractmethod
+    def delete(self, key):
+        """Deletes the checkpoint saved under key, if any"""
+
+
+class MemoryCheckpointStore(CheckpointStore):
+    """Keeps checkpoints for the lifetime of the process"""
+
+    def __init__(self):
+        self._checkpoints = {}
+
+    def load(self, key):
+        data = self._checkpoints.get(key)
+        return FeedCheckpoint.from_dict(data) if data is not None else None
+
+    def save(self, key, checkpoint):
+        self._checkpoints[key] = json.loads(json.dumps(checkpoint.to_dict()))
+
+    def delete(self, key):
+        self._checkpoints.pop(key, None)
+
+
+class FileCheckpointStore(CheckpointStore):
+    """Keeps checkpoints in a JSON file. Every save atomically replaces the file and is fsynced before returning.
+    The file is only read again when it was replaced by someone else (e.g. another process) since."""
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self._lock = threading.Lock()
+        self._checkpoints = None
+        self._signature = None
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _read(self):
+        signature = self._file_signature()
+        if self._checkpoints is None or signature != self._signature:
+            try:
+                with open(self.path, "r", encoding="utf-8") as checkpoint_file:
+                    self._checkpoints = json.load(checkpoint_file)
+            except FileNotFoundError:
+                self._checkpoints = {}
+            self._signature = signature
+        return dict(self._checkpoints)
+
+    def _write(self, checkpoints):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as temp_file:
+                json.dump(checkpoints, temp_file)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_path, self.path)
+            self._checkpoints, self._signature = checkpoints, self._file_signature()
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+        # make the rename itself durable
+        try:
+            directory_fd = os.open(directory, os.O_RDONLY)
+        except OSError:  # pragma: no cover
+            return
+        try:
+            os.fsync(directory_fd)
+        except OSError:  # pragma: no cover
+            pass
+        finally:
+            os.close(directory_fd)
+
+    def load(self, key):
+        with self._lock:
+            data = self._read().get(key)
+        return FeedCheckpoint.from_dict(data) if data is not None else None
+
+    def save(self, key, checkpoint):
+        with self._lock:
+            checkpoints = self._read()
+            checkpoints[key] = checkpoint.to_dict()
+            self._write(checkpoints)
+
+    def delete(self, key):
+        with self._lock:
+            checkpoints = self._read()
+            if checkpoints.pop(key, None) is not None:
+                self._write(checkpoints)
+
+
+def fingerprint(record):
+    """Returns a short digest identifying a decoded feed record"""
+    return blake2b(json.dumps(record, sort_keys=True).encode("utf-8"), digest_size=8).hexdigest()
+
+
+class CheckpointedFeed:
+    """Iterates over the decoded records of a feed while keeping a checkpoint of the records acknowledged so far.
+
+    A record is acknowledged once the next one is requested (or commit() is called), and the checkpoint is saved
+    every `commit_every` acknowledged records, at the end of every response and when the iteration stops. Records
+    are told apart by `fingerprint(record)`, a digest of the whole record by default. The remaining options
+    (backend, compressed, chunk_size) are passed on to FeedsResults.records().
+
+    If the previous run stopped in the middle of a response, the session has already moved past it. The data from
+    `lookback_seconds` before the newest acknowledged timestamp is then requested again (without the sessionID) and
+    the records already acknowledged are skipped, before the session carries on. Records older than that window are
+    considered delivered. Only the fingerprints of the latest `max_recent` acknowledged records are kept: on a busy
+    feed, the window starts at the oldest of them instead.
+    """
+
+    def __init__(
+        self,
+        results,
+        store,
+        key=None,
+        commit_every=1000,
+        timestamp_field="timestamp",
+        lookback_seconds=DEFAULT_LOOKBACK_SECONDS,
+        fingerprint=fingerprint,
+        max_recent=DEFAULT_MAX_RECENT,
+        **records_options,
+    ):
+        self.results = results
+        self.store = store
+        self.key = key or f"{results.product}:{results.kwargs.get('sessionID') or ''}"
+        self.commit_every = commit_every
+        self.timestamp_field = timestamp_field
+        self.lookback = timedelta(seconds=lookback_seconds)
+        self.fingerprint = fingerprint
+        self.max_recent = max_recent
+        self.records_options = records_options
+
+        self.checkpoint = store.load(self.key) or FeedCheckpoint(session_id=results.kwargs.get("sessionID"))
+        self._recent = deque(self.checkpoint.recent[-max_recent:])
+        self._seen = {entry[1] for entry in self._recent}
+        self._cutoff = None
+        self._cutoff_second = None
+        self._update_cutoff()
+        self._pending = None
+        self._uncommitted = 0
+
+    def _update_cutoff(self):
+        """Moves the start of the lookback window along with the newest acknowledged timestamp (to the second)"""
+        timestamp = self.checkpoint.timestamp
+        if timestamp is None or timestamp[:19] == self._cutoff_second:
+            return
+
+        self._cutoff_second = timestamp[:19]
+        cutoff = datetime.strptime(self._cutoff_second, "%Y-%m-%dT%H:%M:%S") - self.lookback
+        # no "Z" suffix: the cutoff then sorts before every timestamp of the same second, with or without a fraction
+        self._cutoff = cutoff.strftime("%Y-%m-%dT%H:%M:%S")
+        while self._recent and self._recent[0][0] < self._cutoff:
+            self._seen.discard(self._recent.popleft()[1])
+
+    def _window_start(self):
+        """Returns where the window of records told apart by fingerprint starts: the lookback before the newest
+        acknowledged timestamp, or the second of the oldest fingerprint kept once there are max_recent of them"""
+        cutoff = self._cutoff
+        if cutoff is not None and len(self._recent) >= self.max_recent:
+            cutoff = max(cutoff, self._recent[0][0][:19])
+        return cutoff
+
+    def _replay_results(self):
+        kwargs = dict(self.results.kwargs)
+        kwargs.pop("sessionID", None)
+        cutoff = self._window_start()
+        if cutoff is not None:
+            kwargs["after"] = cutoff + "Z"
+            kwargs.pop("before", None)
+        elif not (kwargs.get("after") or kwargs.get("before")):
+            kwargs["after"] = DEFAULT_REPLAY_AFTER
+
+        return self.results.__class__(
+            self.results.api,
+            self.results.product,
+            self.results.url,
+            items_path=self.results.items_path,
+            response_path=self.results.response_path,
+            proxy_url=self.results.proxy_url,
+            **kwargs,
+        )
+
+    def __iter__(self):
+        try:
+            replay = self.checkpoint.in_flight
+            if replay:
+                yield from self._consume(self._replay_results(), deduplicate=True)
+            yield from self._consume(self.results, deduplicate=replay)
+        finally:
+            self._save()
+
+    def _unseen(self, records):
+        """Skips the records acknowledged before, judged against the window at the start of the response"""
+        cutoff = self._window_start()
+        for record in records:
+            timestamp = record.get(self.timestamp_field)
+            if timestamp is not None and cutoff is not None:
+                if timestamp < cutoff or self.fingerprint(record) in self._seen:
+                    continue
+            yield record
+
+    def _consume(self, results, deduplicate=False):
+        """Yields the records of results, following 206 responses of a session. Only the first response (the one
+        that may overlap with what was consumed before) is deduplicated."""
+        checkpoint = self.checkpoint
+        while True:
+            checkpoint.in_flight = True
+            self._save()
+            records = results._decoded_records(**self.records_options)
+            for record in self._unseen(records) if deduplicate else records:
+                self._pending = record
+                yield record
+                self._acknowledge()
+
+            deduplicate = False
+            checkpoint.partial = results.status == 206
+            checkpoint.in_flight = False
+            self._save()
+            if not checkpoint.partial or not results.kwargs.get("sessionID"):
+                break
+        results._status = None
+
+    def _acknowledge(self):
+        record, self._pending = self._pending, None
+        if record is None:
+            return
+
+        checkpoint = self.checkpoint
+        checkpoint.records += 1
+        timestamp = record.get(self.timestamp_field)
+        if timestamp is not None:
+            record_fingerprint = self.fingerprint(record)
+            self._recent.append([timestamp, record_fingerprint])
+            self._seen.add(record_fingerprint)
+            if len(self._recent) > self.max_recent:
+                self._seen.discard(self._recent.popleft()[1])
+            if checkpoint.timestamp is None or timestamp > checkpoint.timestamp:
+                checkpoint.timestamp = timestamp
+                self._update_cutoff()
+
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self._save()
+
+    def _save(self):
+        self.checkpoint.recent = list(self._recent)
+        self.store.save(self.key, self.checkpoint)
+        self._uncommitted = 0
+
+    def commit(self):
+        """Acknowledges every record handed out so far, including the current one, and saves the checkpoint"""
+        self._acknowledge()
+        self._save()
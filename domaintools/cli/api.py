@@ -6,10 +6,9 @@ import _io
 
 from datetime import datetime
 from typing import Optional, Dict, Tuple
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from domaintools.api import API
-from domaintools.constants import Endpoint, RTTF_PRODUCTS_LIST, OutputFormat
+from domaintools.constants import Endpoint, RTTF_PRODUCTS_CMD_MAPPING, RTTF_PRODUCTS_LIST, OutputFormat
+from domaintools.base_results import LOCAL_FORMATS
 from domaintools.cli.utils import get_file_extension
 from domaintools.exceptions import ServiceException
 from domaintools._version import current as version
@@ -29,7 +28,7 @@ class DTCLICommand:
 
     @staticmethod
     def validate_format_input(value: str):
-        VALID_FORMATS = ("list", "json", "xml", "html")
+        VALID_FORMATS = ("list", "json", "jsonl", "csv", "xml", "html")
         if value not in VALID_FORMATS:
             raise typer.BadParameter(f"{value} is not in available formats: {VALID_FORMATS}")
         return value
@@ -48,6 +47,26 @@ class DTCLICommand:
             raise typer.BadParameter(f"{value} is not in available endpoints: {VALID_ENDPOINTS}")
         return value
 
+    @staticmethod
+    def validate_compression_input(value: str):
+        from domaintools.cli.writers import COMPRESSIONS
+
+        if value not in COMPRESSIONS:
+            raise typer.BadParameter(f"{value} is not in available compressions: {COMPRESSIONS}")
+        return value
+
+    @staticmethod
+    def validate_size_input(value: str):
+        from domaintools.cli.writers import parse_size
+
+        if value is None:
+            return value
+        try:
+            parse_size(value)
+        except ValueError:
+            raise typer.BadParameter(f"{value} is not a valid size, e.g. 500000, 64KB, 100MB or 2GB")
+        return value
+
     @staticmethod
     def validate_after_or_before_input(value: str):
         if value is None or value.replace("-", "").isdigit():
@@ -150,19 +169,46 @@ class DTCLICommand:
                     next(reader)  # skip header
                     domains.extend([row.get("domain") or "" for row in reader])
                 else:
-                    domains.extend([domain.strip() for domain in src.readlines()])
-
-                total_domains_found = len(domains)
-                if total_domains_found > 100:
-                    raise typer.BadParameter(
-                        f"Domains in source file exceeds the maximum count of 100. Current source file domain count: {total_domains_found}"
-                    )
+                    domains.extend([domain.strip() for domain in src])
 
         except FileNotFoundError:
             raise typer.BadParameter(f"File '{source}' not found.")
 
         return ",".join(domains)
 
+    @classmethod
+    def _get_api(cls, user, key, verify_ssl, rate_limit, always_sign_api_key, header_authentication):
+        from domaintools.api import API
+
+        return API(
+            user,
+            key,
+            app_name=cls.APP_PARTNER_NAME,
+            verify_ssl=verify_ssl,
+            rate_limit=rate_limit,
+            always_sign_api_key=always_sign_api_key,
+            header_authentication=header_authentication,
+        )
+
+    @classmethod
+    def _stream_feed(cls, response, out_file=None, compression=None, rotate_size=None, rotate_interval=None):
+        """Writes the raw bytes of a feed to out_file (or stdout) as they arrive, without any formatting"""
+        from domaintools.cli.writers import FeedWriter, parse_size
+
+        if out_file is None and (rotate_size or rotate_interval):
+            raise typer.BadParameter("--rotate-size and --rotate-interval require --out-file")
+
+        writer = FeedWriter(
+            path=out_file,
+            fileobj=sys.stdout.buffer if out_file is None else None,
+            compression=compression,
+            rotate_bytes=parse_size(rotate_size),
+            rotate_seconds=rotate_interval,
+        )
+        with writer:
+            for chunk in response.chunks():
+                writer.write(chunk)
+
     @classmethod
     def run(cls, name: str, params: Optional[Dict] = {}, **kwargs):
         """Run the domaintools command given with specified parameters.
@@ -172,6 +218,9 @@ class DTCLICommand:
             params (Optional[Dict], optional): The command available parameters. Defaults to {}.
             kwargs (Optional[Dict], optional): The command available kwargs to pass in domaintools API
         """
+        # deferred so that building the CLI (e.g. for --help or --version) stays fast
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+
         try:
             rate_limit = params.pop("rate_limit", False)
             response_format = (
@@ -186,6 +235,9 @@ class DTCLICommand:
             always_sign_api_key = params.pop("no_sign_api_key", False)
             header_authentication = params.pop("no_header_authentication", False)
             source = None
+            stream_options = {
+                option: params.pop(option, None) for option in ("compression", "rotate_size", "rotate_interval")
+            }
 
             if "src_file" in params:
                 source = params.pop("src_file") or None
@@ -201,6 +253,13 @@ class DTCLICommand:
                 else:
                     params["domains"] = domains
 
+            if name in RTTF_PRODUCTS_CMD_MAPPING.values():
+                # feeds are bulk output: stream them as is, without the progress display or rich formatting
+                dt_api = cls._get_api(user, key, verify_ssl, rate_limit, always_sign_api_key, header_authentication)
+                response = getattr(dt_api, name)(**(params | kwargs))
+                cls._stream_feed(response, out_file=out_file, **stream_options)
+                return
+
             with Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
@@ -212,15 +271,7 @@ class DTCLICommand:
                     total=None,
                 )
 
-                dt_api = API(
-                    user,
-                    key,
-                    app_name=cls.APP_PARTNER_NAME,
-                    verify_ssl=verify_ssl,
-                    rate_limit=rate_limit,
-                    always_sign_api_key=always_sign_api_key,
-                    header_authentication=header_authentication,
-                )
+                dt_api = cls._get_api(user, key, verify_ssl, rate_limit, always_sign_api_key, header_authentication)
                 dt_api_func = getattr(dt_api, name)
                 params = params | kwargs
 
@@ -230,6 +281,15 @@ class DTCLICommand:
                     description=f"Preparing results with format of {response_format}...",
                 )
 
+                if response_format in LOCAL_FORMATS and not isinstance(out_file, _io.TextIOWrapper):
+                    progress.update(
+                        task_id,
+                        description=f"Writing results to {out_file}",
+                    )
+                    # rendered from the JSON response straight into the file
+                    getattr(response, f"write_{response_format}")(out_file)
+                    return
+
                 output = cls._get_formatted_output(
                     cmd_name=name, response=response, out_format=response_format
                 )
@@ -240,11 +300,7 @@ class DTCLICommand:
                         description=f"Printing the results with format of {response_format}...",
                     )
                     # use rich `print` command to prettify the ouput in sys.stdout
-                    if name not in ("available_api_calls",) and response.product in RTTF_PRODUCTS_LIST:
-                        for feeds in response.response():
-                            print(feeds)
-                    else:
-                        print(response)
+                    print(output)
                 else:
                     progress.update(
                         task_id,
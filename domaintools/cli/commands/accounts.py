@@ -32,7 +32,7 @@ def account_information(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(
@@ -71,7 +71,7 @@ def available_api_calls(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(
@@ -60,7 +60,7 @@ def iris_detect_monitors(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(
@@ -158,7 +158,7 @@ def iris_detect_new_domains(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(
@@ -269,7 +269,7 @@ def iris_detect_watched_domains(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(
@@ -317,7 +317,7 @@ def iris_detect_manage_watchlist_domains(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(
@@ -367,7 +367,7 @@ def iris_detect_escalate_domains(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(
@@ -478,7 +478,7 @@ def iris_detect_ignored_domains(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(
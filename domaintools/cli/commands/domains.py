@@ -36,7 +36,7 @@ def brand_monitor(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(sys.stdout, "-o", "--out-file", help="Output file (defaults to stdout)"),
@@ -74,7 +74,7 @@ def domain_profile(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(sys.stdout, "-o", "--out-file", help="Output file (defaults to stdout)"),
@@ -122,7 +122,7 @@ def domain_search(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(sys.stdout, "-o", "--out-file", help="Output file (defaults to stdout)"),
@@ -160,7 +160,7 @@ def hosting_history(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(sys.stdout, "-o", "--out-file", help="Output file (defaults to stdout)"),
@@ -200,7 +200,7 @@ def name_server_monitor(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(sys.stdout, "-o", "--out-file", help="Output file (defaults to stdout)"),
@@ -238,7 +238,7 @@ def parsed_whois(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(sys.stdout, "-o", "--out-file", help="Output file (defaults to stdout)"),
@@ -276,7 +276,7 @@ def parsed_domain_rdap(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(sys.stdout, "-o", "--out-file", help="Output file (defaults to stdout)"),
@@ -321,7 +321,7 @@ def registrant_monitor(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(sys.stdout, "-o", "--out-file", help="Output file (defaults to stdout)"),
@@ -360,7 +360,7 @@ def reputation(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(sys.stdout, "-o", "--out-file", help="Output file (defaults to stdout)"),
@@ -399,7 +399,7 @@ def reverse_ip(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(sys.stdout, "-o", "--out-file", help="Output file (defaults to stdout)"),
@@ -438,7 +438,7 @@ def reverse_nameserver(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(sys.stdout, "-o", "--out-file", help="Output file (defaults to stdout)"),
@@ -483,7 +483,7 @@ def reverse_whois(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(sys.stdout, "-o", "--out-file", help="Output file (defaults to stdout)"),
@@ -521,7 +521,7 @@ def whois(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(sys.stdout, "-o", "--out-file", help="Output file (defaults to stdout)"),
@@ -575,7 +575,7 @@ def whois_history(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(sys.stdout, "-o", "--out-file", help="Output file (defaults to stdout)"),
@@ -613,7 +613,7 @@ def risk(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(sys.stdout, "-o", "--out-file", help="Output file (defaults to stdout)"),
@@ -651,7 +651,7 @@ def risk_evidence(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(sys.stdout, "-o", "--out-file", help="Output file (defaults to stdout)"),
@@ -84,6 +84,30 @@ def feeds_nad(
         "--top",
         help="Number of results to return in the response payload. This is ignored in download endpoint",
     ),
+    out_file: str = typer.Option(
+        None,
+        "-o",
+        "--out-file",
+        "--out_file",
+        help="Stream the feed to this file instead of stdout",
+    ),
+    compression: str = typer.Option(
+        "none",
+        "--compression",
+        help="Compress the output on the fly: none, gzip or zstd",
+        callback=DTCLICommand.validate_compression_input,
+    ),
+    rotate_size: str = typer.Option(
+        None,
+        "--rotate-size",
+        help="Start a new output file after this much data, e.g. 100MB. Requires --out-file",
+        callback=DTCLICommand.validate_size_input,
+    ),
+    rotate_interval: int = typer.Option(
+        None,
+        "--rotate-interval",
+        help="Start a new output file every this many seconds. Requires --out-file",
+    ),
 ):
     DTCLICommand.run(name=c.FEEDS_NAD, params=ctx.params)
 
@@ -164,6 +188,30 @@ def feeds_nod(
         "--top",
         help="Number of results to return in the response payload. This is ignored in download endpoint",
     ),
+    out_file: str = typer.Option(
+        None,
+        "-o",
+        "--out-file",
+        "--out_file",
+        help="Stream the feed to this file instead of stdout",
+    ),
+    compression: str = typer.Option(
+        "none",
+        "--compression",
+        help="Compress the output on the fly: none, gzip or zstd",
+        callback=DTCLICommand.validate_compression_input,
+    ),
+    rotate_size: str = typer.Option(
+        None,
+        "--rotate-size",
+        help="Start a new output file after this much data, e.g. 100MB. Requires --out-file",
+        callback=DTCLICommand.validate_size_input,
+    ),
+    rotate_interval: int = typer.Option(
+        None,
+        "--rotate-interval",
+        help="Start a new output file every this many seconds. Requires --out-file",
+    ),
 ):
     DTCLICommand.run(name=c.FEEDS_NOD, params=ctx.params)
 
@@ -232,6 +280,30 @@ def feeds_domainrdap(
         "--top",
         help="Number of results to return in the response payload",
     ),
+    out_file: str = typer.Option(
+        None,
+        "-o",
+        "--out-file",
+        "--out_file",
+        help="Stream the feed to this file instead of stdout",
+    ),
+    compression: str = typer.Option(
+        "none",
+        "--compression",
+        help="Compress the output on the fly: none, gzip or zstd",
+        callback=DTCLICommand.validate_compression_input,
+    ),
+    rotate_size: str = typer.Option(
+        None,
+        "--rotate-size",
+        help="Start a new output file after this much data, e.g. 100MB. Requires --out-file",
+        callback=DTCLICommand.validate_size_input,
+    ),
+    rotate_interval: int = typer.Option(
+        None,
+        "--rotate-interval",
+        help="Start a new output file every this many seconds. Requires --out-file",
+    ),
 ):
     DTCLICommand.run(name=c.FEEDS_DOMAINRDAP, params=ctx.params)
 
@@ -312,6 +384,30 @@ def feeds_domaindiscovery(
         "--top",
         help="Number of results to return in the response payload. This is ignored in download endpoint",
     ),
+    out_file: str = typer.Option(
+        None,
+        "-o",
+        "--out-file",
+        "--out_file",
+        help="Stream the feed to this file instead of stdout",
+    ),
+    compression: str = typer.Option(
+        "none",
+        "--compression",
+        help="Compress the output on the fly: none, gzip or zstd",
+        callback=DTCLICommand.validate_compression_input,
+    ),
+    rotate_size: str = typer.Option(
+        None,
+        "--rotate-size",
+        help="Start a new output file after this much data, e.g. 100MB. Requires --out-file",
+        callback=DTCLICommand.validate_size_input,
+    ),
+    rotate_interval: int = typer.Option(
+        None,
+        "--rotate-interval",
+        help="Start a new output file every this many seconds. Requires --out-file",
+    ),
 ):
     DTCLICommand.run(name=c.FEEDS_DOMAINDISCOVERY, params=ctx.params)
 
@@ -392,6 +488,30 @@ def feeds_noh(
         "--top",
         help="Number of results to return in the response payload. This is ignored in download endpoint",
     ),
+    out_file: str = typer.Option(
+        None,
+        "-o",
+        "--out-file",
+        "--out_file",
+        help="Stream the feed to this file instead of stdout",
+    ),
+    compression: str = typer.Option(
+        "none",
+        "--compression",
+        help="Compress the output on the fly: none, gzip or zstd",
+        callback=DTCLICommand.validate_compression_input,
+    ),
+    rotate_size: str = typer.Option(
+        None,
+        "--rotate-size",
+        help="Start a new output file after this much data, e.g. 100MB. Requires --out-file",
+        callback=DTCLICommand.validate_size_input,
+    ),
+    rotate_interval: int = typer.Option(
+        None,
+        "--rotate-interval",
+        help="Start a new output file every this many seconds. Requires --out-file",
+    ),
 ):
     DTCLICommand.run(name=c.FEEDS_NOH, params=ctx.params)
 
@@ -472,6 +592,30 @@ def feeds_domainhotlist(
         "--top",
         help="Number of results to return in the response payload. This is ignored in download endpoint",
     ),
+    out_file: str = typer.Option(
+        None,
+        "-o",
+        "--out-file",
+        "--out_file",
+        help="Stream the feed to this file instead of stdout",
+    ),
+    compression: str = typer.Option(
+        "none",
+        "--compression",
+        help="Compress the output on the fly: none, gzip or zstd",
+        callback=DTCLICommand.validate_compression_input,
+    ),
+    rotate_size: str = typer.Option(
+        None,
+        "--rotate-size",
+        help="Start a new output file after this much data, e.g. 100MB. Requires --out-file",
+        callback=DTCLICommand.validate_size_input,
+    ),
+    rotate_interval: int = typer.Option(
+        None,
+        "--rotate-interval",
+        help="Start a new output file every this many seconds. Requires --out-file",
+    ),
 ):
     DTCLICommand.run(name=c.FEEDS_DOMAINHOTLIST, params=ctx.params)
 
@@ -552,5 +696,29 @@ def feeds_realtime_domain_risk(
         "--top",
         help="Number of results to return in the response payload. This is ignored in download endpoint",
     ),
+    out_file: str = typer.Option(
+        None,
+        "-o",
+        "--out-file",
+        "--out_file",
+        help="Stream the feed to this file instead of stdout",
+    ),
+    compression: str = typer.Option(
+        "none",
+        "--compression",
+        help="Compress the output on the fly: none, gzip or zstd",
+        callback=DTCLICommand.validate_compression_input,
+    ),
+    rotate_size: str = typer.Option(
+        None,
+        "--rotate-size",
+        help="Start a new output file after this much data, e.g. 100MB. Requires --out-file",
+        callback=DTCLICommand.validate_size_input,
+    ),
+    rotate_interval: int = typer.Option(
+        None,
+        "--rotate-interval",
+        help="Start a new output file every this many seconds. Requires --out-file",
+    ),
 ):
     DTCLICommand.run(name=c.FEEDS_REALTIME_DOMAIN_RISK, params=ctx.params)
@@ -35,7 +35,7 @@ def ip_monitor(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(
@@ -86,7 +86,7 @@ def ip_registrant_monitor(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(
@@ -127,7 +127,7 @@ def host_domains(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(
@@ -176,7 +176,7 @@ def reverse_ip_whois(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(
@@ -27,7 +27,7 @@ def iris_investigate(
         None,
         "-s",
         "--source-file",
-        help="Comma-separated list of maximum 100 domains. Supports only {.csv, .txt} format",
+        help="File of domains, one per line. Over 100 domains are requested in concurrent chunks. Supports only {.csv, .txt} format",
         callback=DTCLICommand.validate_source_file_extension,
     ),
     user: str = typer.Option(None, "-u", "--user", help="Domaintools API Username."),
@@ -48,7 +48,7 @@ def iris_investigate(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(sys.stdout, "-o", "--out-file", help="Output file (defaults to stdout)"),
@@ -86,7 +86,7 @@ def iris_enrich(
         None,
         "-s",
         "--source-file",
-        help="Comma-separated list of maximum 100 domains. Supports only {.csv, .txt} format",
+        help="File of domains, one per line. Over 100 domains are requested in concurrent chunks. Supports only {.csv, .txt} format",
         callback=DTCLICommand.validate_source_file_extension,
     ),
     user: str = typer.Option(None, "-u", "--user", help="Domaintools API Username."),
@@ -107,7 +107,7 @@ def iris_enrich(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(sys.stdout, "-o", "--out-file", help="Output file (defaults to stdout)"),
@@ -157,7 +157,7 @@ def iris(
         "json",
         "-f",
         "--format",
-        help="Output format in {'list', 'json', 'xml', 'html'}",
+        help="Output format in {'list', 'json', 'jsonl', 'csv', 'xml', 'html'}",
         callback=DTCLICommand.validate_format_input,
     ),
     out_file: typer.FileTextWrite = typer.Option(sys.stdout, "-o", "--out-file", help="Output file (defaults to stdout)"),
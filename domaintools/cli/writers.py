@@ -0,0 +1,170 @@
+"""Writers streaming bulk feed output to files, optionally compressed and rotated"""
+
+import io
+import time
+
+from pathlib import Path
+
+COMPRESSIONS = ("none", "gzip", "zstd")
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+# bytes buffered before a write reaches the (compressed) file
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+
+def parse_size(value):
+    """Returns the number of bytes of a size such as 500000, 64KB, 100MB or 2GB"""
+    if value is None:
+        return None
+
+    units = {"KB": 1024, "MB": 1024**2, "GB": 1024**3, "B": 1}
+    value = str(value).strip().upper()
+    for unit, multiplier in units.items():
+        if value.endswith(unit):
+            return int(float(value[: -len(unit)]) * multiplier)
+    return int(value)
+
+
+def _zstd_writer(raw):
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("zstd compression requires the zstandard package: pip install zstandard")
+
+    return zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+
+
+class FeedWriter:
+    """Writes the bytes of a feed to `path` (or to an open binary `fileobj`) through a large buffer.
+
+    With `compression` ("gzip" or "zstd") the output is compressed as it is written. With `rotate_bytes`
+    and/or `rotate_seconds` a new file is started once that many bytes (before compression) were written to
+    the current one or that many seconds passed. Files are only rotated at line boundaries and are named after
+    path with a sequence number, e.g. nod.00000.jsonl.gz, nod.00001.jsonl.gz, ...
+    """
+
+    def __init__(
+        self,
+        path=None,
+        fileobj=None,
+        compression=None,
+        rotate_bytes=None,
+        rotate_seconds=None,
+        buffer_size=DEFAULT_BUFFER_SIZE,
+    ):
+        compression = None if compression in (None, "none") else compression
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f"{compression} is not in available compressions: {COMPRESSIONS}")
+        if (path is None) == (fileobj is None):
+            raise ValueError("Either a path or a fileobj must be given")
+        if fileobj is not None and (rotate_bytes or rotate_seconds):
+            raise ValueError("Rotation requires writing to a file path")
+
+        self.path = Path(path) if path is not None else None
+        self.fileobj = fileobj
+        self.compression = compression
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.buffer_size = buffer_size
+        self.paths = []
+
+        self._index = 0
+        self._raw = None
+        self._file = None
+        self._written = 0
+        self._opened_at = None
+        self._at_line_start = True
+
+    @property
+    def rotating(self):
+        return bool(self.rotate_bytes or self.rotate_seconds)
+
+    def _next_path(self):
+        suffixes = "".join(self.path.suffixes)
+        name = self.path.name[: len(self.path.name) - len(suffixes)] if suffixes else self.path.name
+        if self.rotating:
+            name = f"{name}.{self._index:05d}"
+        suffix = COMPRESSION_SUFFIXES.get(self.compression, "")
+        if suffixes.endswith(suffix):
+            suffix = ""
+        self._index += 1
+        return self.path.with_name(f"{name}{suffixes}{suffix}")
+
+    def _open(self):
+        if self.fileobj is not None:
+            raw = self.fileobj
+        else:
+            path = self._next_path()
+            self.paths.append(path)
+            raw = open(path, "wb", buffering=self.buffer_size)
+
+        if self.compression == "gzip":
+            import gzip
+
+            # a lower level than the default 9 keeps compression from becoming the bottleneck
+            compressor = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6)
+            self._file = io.BufferedWriter(compressor, self.buffer_size)
+        elif self.compression == "zstd":
+            self._file = io.BufferedWriter(_zstd_writer(raw), self.buffer_size)
+        else:
+            self._file = raw
+
+        self._raw = raw
+        self._written = 0
+        self._opened_at = time.monotonic()
+
+    def _close_current(self):
+        if self._file is None:
+            return
+
+        if self._file is not self._raw:
+            # flushes the buffer and ends the compressed stream, the underlying file is left open
+            self._file.close()
+        if self.fileobj is None:
+            self._raw.close()
+        else:
+            self._raw.flush()
+        self._file = self._raw = None
+
+    def _rotation_due(self):
+        if self.rotate_bytes and self._written >= self.rotate_bytes:
+            return True
+        return bool(self.rotate_seconds and time.monotonic() - self._opened_at >= self.rotate_seconds)
+
+    def write(self, data):
+        """Writes bytes, rotating the file at the first line boundary once a rotation is due"""
+        if not data:
+            return
+        if self._file is None:
+            self._open()
+
+        if self.rotating and self._rotation_due():
+            if self._at_line_start:
+                self._close_current()
+                self._open()
+            else:
+                newline = data.find(b"\n")
+                if newline != -1:
+                    self._file.write(data[: newline + 1])
+                    self._close_current()
+                    self._open()
+                    data = data[newline + 1 :]
+
+        self._file.write(data)
+        self._written += len(data)
+        self._at_line_start = data.endswith(b"\n")
+
+    def write_line(self, line):
+        """Writes a single line, adding the newline if it is missing"""
+        if isinstance(line, str):
+            line = line.encode("utf-8")
+        self.write(line if line.endswith(b"\n") else line + b"\n")
+
+    def close(self):
+        self._close_current()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,140 @@
+"""Flattens Iris Investigate and Enrich results into typed columns, for analytics that work on whole columns at once:
+
+    columns = to_columns(api.iris_investigate(search_hash=QUERY).iter_all())
+    table = api.iris_enrich(*DOMAINS).to_arrow()
+
+NumPy arrays (numpy=True) and Arrow tables (to_arrow()) require the numpy and pyarrow packages respectively.
+"""
+
+from datetime import date
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from domaintools.utils import DATE_CACHE_SIZE
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _date(value: str) -> Optional[date]:
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+def _value(field: str) -> Callable[[dict], Any]:
+    def extract(result):
+        value = result.get(field)
+        if isinstance(value, dict):
+            value = value.get("value")
+        # Iris reports missing values as empty strings
+        return value if value != "" else None
+
+    return extract
+
+
+def _count(field: str) -> Callable[[dict], int]:
+    def extract(result):
+        value = result.get(field)
+        return (value.get("count") or 0) if isinstance(value, dict) else 0
+
+    return extract
+
+
+def _date_value(field: str) -> Callable[[dict], Optional[date]]:
+    value_of = _value(field)
+
+    def extract(result):
+        value = value_of(result)
+        return _date(value) if isinstance(value, str) else None
+
+    return extract
+
+
+def _list_values(field: str, key: str, item: str) -> Callable[[dict], List[Any]]:
+    """Extracts the `item` ("value" or "count") of the `key` pair of every entry of a list field, e.g. ip.address"""
+
+    def extract(result):
+        return [entry[key].get(item) for entry in result.get(field) or () if (entry.get(key) or {}).get("value")]
+
+    return extract
+
+
+def _risk_score(result: dict) -> Optional[int]:
+    return (result.get("domain_risk") or {}).get("risk_score")
+
+
+# the columns of to_columns(), in order: how each is extracted from a result and the type of its values.
+# Missing values are None, but for the pivot counts where Iris counts them as 0.
+IRIS_COLUMNS = {
+    "domain": (_value("domain"), "string"),
+    "tld": (_value("tld"), "string"),
+    "risk_score": (_risk_score, "int"),
+    "create_date": (_date_value("create_date"), "date"),
+    "create_date_count": (_count("create_date"), "count"),
+    "expiration_date": (_date_value("expiration_date"), "date"),
+    "expiration_date_count": (_count("expiration_date"), "count"),
+    "registrar": (_value("registrar"), "string"),
+    "registrar_count": (_count("registrar"), "count"),
+    "ip": (_list_values("ip", "address", "value"), "strings"),
+    "ip_count": (_list_values("ip", "address", "count"), "counts"),
+    "name_server": (_list_values("name_server", "host", "value"), "strings"),
+    "name_server_count": (_list_values("name_server", "host", "count"), "counts"),
+}
+
+
+def to_columns(results: Iterable[dict], numpy: bool = False) -> Dict[str, Any]:
+    """Returns the IRIS_COLUMNS of results (any iterable, e.g. a stream of every page) as lists, in a single pass.
+
+    With numpy=True the columns are NumPy arrays instead: risk scores as floats (NaN when missing), dates as
+    datetime64[D] (NaT when missing), counts as int64 and strings and lists as objects.
+    """
+    columns = {name: [] for name in IRIS_COLUMNS}
+    extractors = [(columns[name].append, extract) for name, (extract, _) in IRIS_COLUMNS.items()]
+    for result in results:
+        for append, extract in extractors:
+            append(extract(result))
+
+    return _numpy_columns(columns) if numpy else columns
+
+
+def _numpy_columns(columns: Dict[str, list]) -> Dict[str, Any]:
+    try:
+        import numpy
+    except ImportError:
+        raise ValueError("NumPy columns require the numpy package: pip install numpy")
+
+    dtypes = {"string": object, "int": numpy.float64, "date": "datetime64[D]", "count": numpy.int64}
+    arrays = {}
+    for name, values in columns.items():
+        kind = IRIS_COLUMNS[name][1]
+        if kind in ("strings", "counts"):
+            # lists of different lengths, kept as they are
+            array = numpy.empty(len(values), dtype=object)
+            array[:] = values
+        elif kind == "int":
+            array = numpy.array([numpy.nan if value is None else value for value in values], dtype=dtypes[kind])
+        else:
+            array = numpy.array(values, dtype=dtypes[kind])
+        arrays[name] = array
+    return arrays
+
+
+def to_arrow(results: Iterable[dict]):
+    """Returns the IRIS_COLUMNS of results as a pyarrow.Table, with missing values as nulls"""
+    try:
+        import pyarrow
+    except ImportError:
+        raise ValueError("Arrow tables require the pyarrow package: pip install pyarrow")
+
+    types = {
+        "string": pyarrow.string(),
+        "int": pyarrow.int64(),
+        "date": pyarrow.date32(),
+        "count": pyarrow.int64(),
+        "strings": pyarrow.list_(pyarrow.string()),
+        "counts": pyarrow.list_(pyarrow.int64()),
+    }
+    columns = to_columns(results)
+    return pyarrow.table(
+        {name: pyarrow.array(values, type=types[IRIS_COLUMNS[name][1]]) for name, values in columns.items()}
+    )
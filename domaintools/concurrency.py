@@ -0,0 +1,122 @@
+"""Helpers to run independent requests concurrently while handing their results back in order"""
+
+from collections import deque
+from itertools import islice
+
+
+def chunked(iterable, size):
+    """Lazily yields lists of up to `size` consecutive items of iterable"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def map_ordered(function, arguments, concurrency=4):
+    """Yields function(argument) for every argument, in order, running up to `concurrency` calls at once in threads.
+
+    `arguments` is consumed lazily and only `concurrency` results are ever held at a time, so it can be a generator
+    of any size. Stopping the iteration early cancels the calls that have not started yet.
+    """
+    if concurrency <= 1:
+        for argument in arguments:
+            yield function(argument)
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    arguments = iter(arguments)
+    pending = deque()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        for argument in arguments:
+            pending.append(executor.submit(function, argument))
+            if len(pending) >= concurrency:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+async def amap_ordered(function, arguments, concurrency=4):
+    """Asynchronously yields (await function(argument)) for every argument, in order, with up to `concurrency`
+    coroutines in flight. Like map_ordered, `arguments` is consumed lazily."""
+    import asyncio
+
+    pending = deque()
+    try:
+        for argument in arguments:
+            pending.append(asyncio.ensure_future(function(argument)))
+            if len(pending) >= max(concurrency, 1):
+                yield await pending.popleft()
+
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class SingleFlight:
+    """Lets concurrent calls for the same key share a single call in flight:
+
+        flights = SingleFlight()
+        response = flights.do(key, send)  # in threads
+        response = await flights.ado(key, asend)  # in tasks
+
+    The first caller of a key runs the call and every caller arriving before it completes gets its result (or its
+    exception) instead of making a call of its own. Once the call completed, the next caller starts a new one.
+    """
+
+    def __init__(self):
+        import threading
+
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+
+    def do(self, key, function):
+        """Returns function(), unless a call for key is already in flight in another thread: then returns its result"""
+        from concurrent.futures import Future
+
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            result = function()
+        except BaseException as error:
+            self._land(key)
+            future.set_exception(error)
+            raise
+        self._land(key)
+        future.set_result(result)
+        return result
+
+    def _land(self, key):
+        with self._lock:
+            del self._calls[key]
+
+    async def ado(self, key, function):
+        """Returns await function(), sharing the call in flight for key on the running event loop if there is one.
+
+        The call runs as its own task, so cancelling one of the callers does not cancel it for the others.
+        """
+        import asyncio
+
+        flight = (asyncio.get_running_loop(), key)
+        task = self._tasks.get(flight)
+        if task is None:
+            task = self._tasks[flight] = asyncio.ensure_future(function())
+            task.add_done_callback(lambda _: self._tasks.pop(flight, None))
+        return await asyncio.shield(task)
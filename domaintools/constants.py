@@ -18,6 +18,9 @@ class OutputFormat(Enum):
 
 HEADER_ACCEPT_KEY_CSV_FORMAT = "text/csv"
 
+# the most domains Iris Enrich and Iris Investigate accept in a single request
+IRIS_MAX_DOMAINS_PER_REQUEST = 100
+
 ENDPOINT_TO_SOURCE_MAP = {
     Endpoint.FEED.value: Source.API,
     Endpoint.DOWNLOAD.value: Source.S3,
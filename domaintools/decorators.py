@@ -27,9 +27,13 @@ def api_endpoint(spec_name: str, path: str, methods: Union[str, List[str]]):
 
         # Get the signature of the original function ONCE
         sig = inspect.signature(func)
+        # Methods expect the instance as their first argument, plain functions (e.g. in tests) do not
+        takes_self = next(iter(sig.parameters), None) == "self"
 
         @functools.wraps(func)
         def wrapper(self, *args, **kwargs):
+            if takes_self:
+                args = (self,) + args
 
             try:
                 bound_args = sig.bind(*args, **kwargs)
@@ -39,11 +43,8 @@ def api_endpoint(spec_name: str, path: str, methods: Union[str, List[str]]):
 
             arguments = bound_args.arguments
 
-            # Robustly find 'self' (it's usually the first argument in bound_args)
-            # We look for the first value in arguments, or try to get 'self' explicitly.
-            instance = arguments.pop("self", None)
-            if not instance and args:
-                instance = args[0]
+            # 'self' is not a parameter of the endpoint
+            arguments.pop("self", None)
 
             # Retrieve the Spec from the instance
             # We assume 'self' has a .specs attribute (like DocstringPatcher expects)
@@ -51,17 +52,23 @@ def api_endpoint(spec_name: str, path: str, methods: Union[str, List[str]]):
 
             if "domains" in arguments.keys():
                 domains = arguments.pop("domains")
-                arguments["domain"] = (
-                    ",".join(domains) if isinstance(domains, (list, tuple)) else domains
-                )
-
-            if spec:
+                if isinstance(domains, (list, tuple)):
+                    arguments["domain"] = ",".join(domains)
+                elif domains is None or isinstance(domains, str):
+                    arguments["domain"] = domains
+                else:
+                    # other iterables (e.g. generators) are chunked lazily by the endpoint and must not be consumed
+                    # here. They are checked as the comma-separated string every chunk is sent as.
+                    arguments["domain"] = ""
+
+            # validation can be turned off on hot paths with API(validate_requests=False)
+            if spec and getattr(self, "validate_requests", True):
                 # Determine which HTTP method is currently being executed.
                 # If the function allows dynamic methods (e.g. method="POST"), use that.
                 # Otherwise, default to the first method defined in the decorator.
                 current_method = kwargs.get("method", normalized_methods[0])
 
-                # Run Validation
+                # Run Validation against the plan compiled for this operation on first use
                 # This will raise a ValueError and stop execution if validation fails.
                 try:
                     RequestValidator.validate(
@@ -88,18 +95,10 @@ def api_endpoint(spec_name: str, path: str, methods: Union[str, List[str]]):
 
 
 def auto_patch_docstrings(cls):
-    original_init = cls.__init__
-
-    @functools.wraps(original_init)
-    def new_init(self, *args, **kwargs):
-        original_init(self, *args, **kwargs)
-        try:
-            # We instantiate our patcher and run it
-            patcher = DocstringPatcher()
-            patcher.patch(self)
-        except Exception as e:
-            print(f"Auto-patching failed: {e}")
-
-    cls.__init__ = new_init
+    """
+    Extends the docstrings of the @api_endpoint methods of cls with the details of their spec operations.
+    The patching happens once per class, lazily on first lookup of each method, rather than on every instance.
+    """
+    DocstringPatcher().patch_class(cls)
 
     return cls
@@ -3,6 +3,8 @@ import functools
 import textwrap
 import logging
 
+from domaintools.spec_loader import load_spec, spec_path
+
 
 class DocstringPatcher:
     """
@@ -12,9 +14,10 @@ class DocstringPatcher:
     def patch(self, api_instance):
         method_names = []
         for attr_name in dir(api_instance):
-            attr = getattr(api_instance, attr_name)
+            # Look the attribute up statically so properties (e.g. the pooled clients) are not evaluated
+            attr = inspect.getattr_static(api_instance, attr_name, None)
             if (
-                inspect.ismethod(attr)
+                (inspect.ismethod(attr) or inspect.isfunction(attr))
                 and hasattr(attr, "_api_spec_name")
                 and hasattr(attr, "_api_path")
                 and hasattr(attr, "_api_methods")
@@ -24,34 +27,11 @@ class DocstringPatcher:
         for attr_name in method_names:
             original_method = getattr(api_instance, attr_name)
             original_function = original_method.__func__
-
-            spec_name = getattr(original_function, "_api_spec_name", None)
-            path = getattr(original_function, "_api_path", None)
-            http_methods_to_check = getattr(original_function, "_api_methods", [])
-
-            spec_to_use = api_instance.specs.get(spec_name)
-            original_doc = inspect.getdoc(original_function) or ""
-
-            all_doc_sections = []
-            if spec_to_use:
-                path_item = spec_to_use.get("paths", {}).get(path, {})
-                for http_method in http_methods_to_check:
-                    if http_method.lower() in path_item:
-                        # Helper is called via self, but it's an instance method calling a static method internally
-                        api_doc = self._generate_api_doc_string(spec_to_use, path, http_method)
-                        all_doc_sections.append(api_doc)
-
-            if not all_doc_sections:
-                all_doc_sections.append(
-                    f"\n--- API Details Error ---"
-                    f"\n  (Could not find operations {http_methods_to_check} for path '{path}' in spec '{spec_name}')"
-                )
-
-            new_doc = textwrap.dedent(original_doc) + "\n\n" + "\n\n".join(all_doc_sections)
+            new_doc = self.build_docstring(original_function, api_instance.specs)
 
             @functools.wraps(original_function)
-            def method_wrapper(*args, _orig_meth=original_method, **kwargs):
-                return _orig_meth(*args, **kwargs)
+            def method_wrapper(*args, _orig_func=original_function, **kwargs):
+                return _orig_func(*args, **kwargs)
 
             method_wrapper.__doc__ = new_doc
             setattr(
@@ -60,6 +40,41 @@ class DocstringPatcher:
                 method_wrapper.__get__(api_instance, api_instance.__class__),
             )
 
+    def patch_class(self, cls):
+        """
+        Swaps every @api_endpoint method defined on cls for a LazyDocstring, which patches the method's docstring
+        in place on first lookup. Instances then use the plain functions without any wrapper.
+        """
+        for attr_name, attr in list(vars(cls).items()):
+            if inspect.isfunction(attr) and hasattr(attr, "_api_spec_name"):
+                setattr(cls, attr_name, LazyDocstring(cls, attr_name, attr, self))
+
+    def build_docstring(self, function, specs) -> str:
+        """Returns the docstring of an @api_endpoint function extended with the details of its operations."""
+        spec_name = getattr(function, "_api_spec_name", None)
+        path = getattr(function, "_api_path", None)
+        http_methods_to_check = getattr(function, "_api_methods", [])
+
+        spec_to_use = specs.get(spec_name)
+        original_doc = inspect.getdoc(function) or ""
+
+        all_doc_sections = []
+        if spec_to_use:
+            path_item = spec_to_use.get("paths", {}).get(path, {})
+            for http_method in http_methods_to_check:
+                if http_method.lower() in path_item:
+                    # Helper is called via self, but it's an instance method calling a static method internally
+                    api_doc = self._generate_api_doc_string(spec_to_use, path, http_method)
+                    all_doc_sections.append(api_doc)
+
+        if not all_doc_sections:
+            all_doc_sections.append(
+                f"\n--- API Details Error ---"
+                f"\n  (Could not find operations {http_methods_to_check} for path '{path}' in spec '{spec_name}')"
+            )
+
+        return textwrap.dedent(original_doc) + "\n\n" + "\n\n".join(all_doc_sections)
+
     @staticmethod
     def get_operation_details(spec: dict, path: str, method: str) -> dict:
         """
@@ -343,3 +358,40 @@ class DocstringPatcher:
                 lines.append(f"      Description: {resp['description']}")
 
         return "\n".join(lines)
+
+
+class _SharedSpecs:
+    """Looks up the process wide specs (see domaintools.spec_loader) by name, the way api_instance.specs would."""
+
+    @staticmethod
+    def get(spec_name):
+        try:
+            return load_spec(spec_path(spec_name))
+        except Exception as e:
+            logging.warning(f"Could not load spec '{spec_name}' for docstrings: {e}")
+            return None
+
+
+class LazyDocstring:
+    """
+    Stands in for an @api_endpoint function in its class until it is first looked up (a call, `__doc__` or help()).
+    The lookup patches the function's docstring and puts the function itself back into the class, so every later
+    lookup is an ordinary method lookup.
+    """
+
+    def __init__(self, owner, name, function, patcher):
+        self.owner = owner
+        self.name = name
+        self.function = function
+        self.patcher = patcher
+
+    def __get__(self, instance, owner=None):
+        function = self.function
+        if vars(self.owner).get(self.name) is self:
+            try:
+                function.__doc__ = self.patcher.build_docstring(function, _SharedSpecs)
+            except Exception as e:
+                logging.warning(f"Docstring patching failed for {self.name}: {e}")
+            setattr(self.owner, self.name, function)
+
+        return function.__get__(instance, owner)
@@ -0,0 +1,169 @@
+"""Bulk downloads of the files listed by the `download` endpoint of the Real Time Threat Feeds"""
+
+import mmap
+import os
+
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from domaintools.concurrency import map_ordered
+from domaintools.exceptions import ServiceException
+from domaintools.ndjson import get_decoder, resolve_backend
+
+# files larger than this are fetched as several concurrent range requests of this size
+DEFAULT_PART_SIZE = 16 * 1024 * 1024
+
+
+def manifest_files(manifest):
+    """Returns the URLs of the files listed by a download manifest"""
+    files = manifest.get("response", manifest).get("files") or []
+    return [file if isinstance(file, str) else file["url"] for file in files]
+
+
+def _file_name(url):
+    return os.path.basename(urlsplit(url).path) or "download"
+
+
+def _file_names(urls):
+    """Returns a distinct file name for every url: its base name, or its whole path when base names collide (e.g.
+    files of the same name under different prefixes). URLs that still collide are told apart by their index."""
+    names = [_file_name(url) for url in urls]
+    counts = Counter(names)
+    unique = []
+    for index, (url, name) in enumerate(zip(urls, names)):
+        if counts[name] > 1:
+            name = urlsplit(url).path.strip("/").replace("/", "_") or name
+        while name in unique:
+            name = f"{index}_{name}"
+        unique.append(name)
+    return unique
+
+
+def _probe(api, url):
+    """Returns the size of the file at url if the server serves byte ranges of it, otherwise None"""
+    request = api.client.build_request("GET", url, headers={"Range": "bytes=0-0"})
+    # streamed so that a server ignoring the range is not downloaded twice
+    response = api.retry_policy.call(lambda: api.client.send(request, stream=True))
+    try:
+        if response.status_code == 206:
+            total = response.headers.get("Content-Range", "").rpartition("/")[2]
+            return int(total) if total.isdigit() else None
+        if response.status_code != 200:
+            response.read()
+            raise ServiceException(response.status_code, response.text)
+        return None
+    finally:
+        response.close()
+
+
+def _fetch_part(api, url, path, start, end):
+    response = api.retry_policy.call(lambda: api.client.get(url, headers={"Range": f"bytes={start}-{end}"}))
+    if response.status_code != 206 or len(response.content) != end - start + 1:
+        raise ServiceException(response.status_code, f"Could not download bytes {start}-{end} of {url}")
+
+    with open(path, "r+b") as download:
+        download.seek(start)
+        download.write(response.content)
+
+
+def _fetch_whole(api, url, path):
+    request = api.client.build_request("GET", url)
+    response = api.retry_policy.call(lambda: api.client.send(request, stream=True))
+    try:
+        if response.status_code != 200:
+            response.read()
+            raise ServiceException(response.status_code, response.text)
+        with open(path, "wb") as download:
+            for chunk in response.iter_bytes(DEFAULT_PART_SIZE // 16):
+                download.write(chunk)
+    finally:
+        response.close()
+
+
+def _inflate(path):
+    """Replaces a gzip file by its inflated content, returning the new path"""
+    import gzip
+    import shutil
+
+    inflated = path.with_suffix("")
+    with gzip.open(path, "rb") as source, open(inflated, "wb") as target:
+        shutil.copyfileobj(source, target, DEFAULT_PART_SIZE // 16)
+    path.unlink()
+    return inflated
+
+
+def download_files(api, urls, directory, concurrency=4, part_size=DEFAULT_PART_SIZE, decompress=True):
+    """Downloads every url into directory and returns the paths of the files, in the order of urls.
+
+    Every file is first probed with a one byte range request. Files served with byte ranges are preallocated and
+    fetched as parts of `part_size` bytes, written in place. The parts of every file (and the files that can only be
+    fetched whole) share a pool of `concurrency` threads, so both small and large files keep every connection busy.
+    Each request goes through the retry policy of the API. With `decompress`, `.gz` files are inflated afterwards.
+    Files are named after their URL, see _file_names().
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    urls = list(urls)
+    paths = [directory / name for name in _file_names(urls)]
+
+    jobs = []
+    for url, path, size in zip(urls, paths, map_ordered(lambda url: _probe(api, url), urls, concurrency)):
+        if size is None:
+            jobs.append((_fetch_whole, url, path))
+            continue
+
+        with open(path, "wb") as download:
+            download.truncate(size)
+        jobs.extend(
+            (_fetch_part, url, path, start, min(start + part_size, size) - 1) for start in range(0, size, part_size)
+        )
+
+    for _ in map_ordered(lambda job: job[0](api, *job[1:]), jobs, concurrency):
+        pass
+
+    if decompress:
+        paths = [_inflate(path) if path.suffix == ".gz" else path for path in paths]
+    return paths
+
+
+def iter_lines(path):
+    """Yields the lines of the file at path as memoryviews of the memory mapped file, without copying them.
+
+    A line is only valid until the next one is requested (bytes(line) keeps a copy). Blank lines are skipped.
+    """
+    with open(path, "rb") as source:
+        if os.fstat(source.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                find, size, start = mapped.find, len(mapped), 0
+                while start < size:
+                    end = find(b"\n", start)
+                    if end == -1:
+                        end = size
+                    if end > start:
+                        line = view[start:end]
+                        try:
+                            yield line
+                        finally:
+                            line.release()
+                    start = end + 1
+            finally:
+                view.release()
+
+
+def iter_records(path, backend=None):
+    """Yields the decoded records of a downloaded jsonl file, read with iter_lines()"""
+    backend = resolve_backend(backend)
+    decode = get_decoder(backend)
+    if backend == "json":
+        # the standard library decoder does not take memoryviews
+        for line in iter_lines(path):
+            yield decode(line.tobytes())
+        return
+
+    for line in iter_lines(path):
+        yield decode(line)
@@ -1,6 +1,68 @@
-from typing import List, Dict, Optional, Any, Callable
+import operator
+import re
 
-from domaintools.utils import convert_str_to_dateobj
+from datetime import date, datetime
+from typing import List, Dict, Optional, Any, Callable, Iterable, Iterator, Tuple
+
+from domaintools.utils import convert_str_to_dateobj, date_ordinal, datetime_ordinal, iso_ordinal
+
+Result = Dict[str, Any]
+Predicate = Callable[[Result], bool]
+
+
+class CompiledFilters:
+    """A chain of filters compiled into a single pass, so that each result is visited exactly once.
+
+    Filters without anything to filter on (e.g. filter_by_riskscore(threshold=None)) are left out. When none is left
+    the chain is falsy and results pass through untouched. The predicates of the remaining filters are chained
+    lazily, so no intermediate list is built and a result stops being checked at the first predicate it fails.
+    """
+
+    def __init__(self, filters: Iterable[Callable]):
+        self.filters = list(filters)
+        self.predicates = []
+        # filters written as plain callables over a list of results are still applied, after the predicates
+        self._list_filters = []
+        for _dt_filter in self.filters:
+            if not hasattr(_dt_filter, "predicate"):
+                self._list_filters.append(_dt_filter)
+                continue
+            predicate = _dt_filter.predicate()
+            if predicate is not None:
+                self.predicates.append(predicate)
+
+    def __bool__(self):
+        return bool(self.predicates or self._list_filters)
+
+    def __iter__(self):
+        return iter(self.filters)
+
+    def matches(self, result: Result) -> bool:
+        """Returns whether a single result passes every predicate"""
+        return all(predicate(result) for predicate in self.predicates)
+
+    def _filtered(self, results: Iterable[Result]) -> Iterator[Result]:
+        for predicate in self.predicates:
+            results = filter(predicate, results)
+        return results
+
+    def iter(self, results: Iterable[Result]) -> Iterator[Result]:
+        """Lazily yields the results matching every filter, e.g. over a stream of pages"""
+        if self._list_filters:
+            return iter(self(list(results)))
+        return iter(self._filtered(results))
+
+    def __call__(self, results: List[Result]) -> List[Result]:
+        if self.predicates:
+            results = list(self._filtered(results))
+        for _dt_filter in self._list_filters:
+            results = _dt_filter(results)
+        return results
+
+
+def compile_filters(filters: Iterable[Callable]) -> CompiledFilters:
+    """Returns filters compiled into a single pass, unless they already are"""
+    return filters if isinstance(filters, CompiledFilters) else CompiledFilters(filters)
 
 
 class DTResultFilter:
@@ -9,14 +71,29 @@ class DTResultFilter:
     def __init__(self, result_set, item_path: Optional[str] = "results"):
         self._result_set = result_set.get(item_path) or []
 
-    def by(self, available_filters: List[Callable]):
-        for _dt_filter in available_filters:
-            self._result_set = _dt_filter(self._result_set)
-
+    def by(self, available_filters: Iterable[Callable]):
+        self._result_set = compile_filters(available_filters)(self._result_set)
         return self._result_set
 
+    def iter_by(self, available_filters: Iterable[Callable]) -> Iterator[Result]:
+        return compile_filters(available_filters).iter(self._result_set)
+
+
+class _PredicateFilter:
+    """Filters a list of results with the predicate of the filter"""
 
-class filter_by_field:
+    def predicate(self) -> Optional[Predicate]:
+        """Returns a function telling whether a result is kept, or None when the filter keeps every result"""
+        raise NotImplementedError
+
+    def __call__(self, results: List[Result]) -> List[Result]:
+        predicate = self.predicate()
+        if predicate is None:
+            return results
+        return [result for result in results if predicate(result)]
+
+
+class filter_by_field(_PredicateFilter):
     """
     Returns the filtered result by checking if the field exits on each results.
     Can be included or excluded based on the `filter_type` param given.
@@ -26,67 +103,46 @@ class filter_by_field:
         self._field = field
         self._filter_type = filter_type
 
-    def __call__(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        self._results = results
+    def predicate(self) -> Optional[Predicate]:
+        if self._field is None or self._filter_type == "include":
+            # for 'include' case the result is kept even when the key is missing or the value inside of it is empty
+            return None
 
-        if self._field is None:
-            return self._results
+        field = self._field
+        if self._filter_type == "exclude":
+            # for 'exclude' case keep the result ONLY when the key exists and the value inside of it has value
+            return lambda result: bool(result.get(field))
+        return lambda result: False
 
-        filtered_result = []
-        for result in self._results:
-            result_keys = result.keys()
-            lookup_field = result.get(self._field) or None
 
-            if self._filter_type == "include":
-                # for 'include' case
-                # append/include the result even the key is missing or the value inside of it is empty
-                if not lookup_field or lookup_field:
-                    filtered_result.append(result)
-                continue
-
-            elif self._filter_type == "exclude":
-                # for 'exclude' case
-                # append the result ONLY when the key exists and the value inside of it has value
-                if lookup_field:
-                    filtered_result.append(result)
-
-        return filtered_result
-
-
-class filter_by_date_updated_after:
+class filter_by_date_updated_after(_PredicateFilter):
     """Returns the filtered result set by checking each result's 'date_updated_after' field."""
 
     def __init__(self, date: str):
         self._updated_after_date = date
 
-    def __call__(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        self._results = results
-
+    def predicate(self) -> Optional[Predicate]:
         if self._updated_after_date is None:
             # Don't do any filtering if date is not given
-            return self._results
+            return None
 
-        # convert string date to datetime object before comparing
-        if isinstance(self._updated_after_date, str):
-            self._updated_after_date = convert_str_to_dateobj(self._updated_after_date)
+        # dates are compared as the integers of datetime_ordinal()
+        threshold = self._updated_after_date
+        if isinstance(threshold, str):
+            threshold = convert_str_to_dateobj(threshold)
+        threshold = datetime_ordinal(threshold)
 
-        filtered_result = []
-        for result in self._results:
-            data_updated_timestamp = result.get("data_updated_timestamp") or None
+        def updated_after(result):
+            data_updated_timestamp = result.get("data_updated_timestamp")
             if not data_updated_timestamp:
                 # skip uncomparable date
-                continue
-            data_updated_timestamp = convert_str_to_dateobj(
-                data_updated_timestamp, date_format="%Y-%m-%dT%H:%M:%S.%f"
-            )
-
-            if data_updated_timestamp > self._updated_after_date:
-                filtered_result.append(result)
+                return False
+            return date_ordinal(data_updated_timestamp, "%Y-%m-%dT%H:%M:%S.%f") > threshold
 
-        return filtered_result
+        return updated_after
 
 
-class filter_by_expire_date:
+class filter_by_expire_date(_PredicateFilter):
     """
     Returns the filtered result set by checking each result's expiration date.
     Can be before or after the given date.
@@ -96,54 +152,321 @@ class filter_by_expire_date:
         self._date = date
         self._type = lookup_type
 
-    def __call__(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        self._results = results
-
+    def predicate(self) -> Optional[Predicate]:
         if self._date is None:
             # Don't do any filtering if date is not given
-            return self._results
+            return None
 
-        # convert string date to datetime object before comparing
-        if isinstance(self._date, str):
-            self._date = convert_str_to_dateobj(self._date)
+        # dates are compared as the integers of datetime_ordinal()
+        threshold = self._date
+        if isinstance(threshold, str):
+            threshold = convert_str_to_dateobj(threshold)
+        threshold = datetime_ordinal(threshold)
+        lookup_type = self._type
 
-        filtered_result = []
-        for result in self._results:
-            domain_exp_date = result.get("expiration_date", {}).get("value") or None
+        def expires(result):
+            domain_exp_date = result.get("expiration_date", {}).get("value")
             if not domain_exp_date:
                 # skip uncomparable date
-                continue
-            domain_exp_date = convert_str_to_dateobj(domain_exp_date)
+                return False
+            domain_exp_date = date_ordinal(domain_exp_date)
 
-            if self._type == "before":
+            if lookup_type == "before":
                 # check if given date is less than the expiration date
-                if self._date < domain_exp_date:
-                    filtered_result.append(result)
-            elif self._type == "after":
-                # check if given date is greather than the expiration date
-                if self._date > domain_exp_date:
-                    filtered_result.append(result)
+                return threshold < domain_exp_date
+            # check if given date is greather than the expiration date
+            return lookup_type == "after" and threshold > domain_exp_date
 
-        return filtered_result
+        return expires
 
 
-class filter_by_riskscore:
+class filter_by_riskscore(_PredicateFilter):
     """Returns the filtered result set by a given risk score threshold."""
 
     def __init__(self, threshold: Optional[int] = None):
         self._threshold = threshold
 
-    def __call__(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        self._results = results
-
+    def predicate(self) -> Optional[Predicate]:
         if self._threshold is None:
             # Don't do any filtering if threshold is not given
-            return self._results
+            return None
+
+        threshold = self._threshold
+        return lambda result: result.get("domain_risk", {}).get("risk_score") > threshold
+
+
+# fields of F standing for a path in the Iris results other than their own name
+FIELD_PATHS = {
+    "risk_score": "domain_risk.risk_score",
+    "ip": "ip.address",
+    "name_server": "name_server.host",
+    "mx": "mx.host",
+}
+
+# fields holding ISO 8601 dates or timestamps, compared as dates rather than as strings
+DATE_FIELDS = frozenset(("create_date", "expiration_date", "first_seen", "data_updated_timestamp"))
+
+# the Iris Investigate search filter parameters conditions on a field can be sent as, with the comparisons they take
+PUSHDOWN_OPERATORS = {
+    "create_date": ("==", "<", "<=", ">", ">="),
+    "expiration_date": ("==",),
+    "active": ("==",),
+    "tld": ("==",),
+}
+
+COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+_DAY = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_TLD = re.compile(r"^[a-z]{2,63}(\.[a-z]{2,63})*$")
+
+
+def _field_values(value: Any, path: List[str]) -> List[Any]:
+    """Returns the values found at path in value, unwrapping the {'value': ..., 'count': ...} pairs of Iris"""
+    for index, key in enumerate(path):
+        if isinstance(value, list):
+            return [found for item in value for found in _field_values(item, path[index:])]
+        if not isinstance(value, dict):
+            return []
+        value = value.get(key)
+
+    values = value if isinstance(value, list) else [value]
+    values = [value.get("value") if isinstance(value, dict) and "value" in value else value for value in values]
+    # Iris reports missing values as empty strings
+    return [value for value in values if value is not None and value != ""]
+
+
+def _day(value: Any) -> Optional[str]:
+    """Returns value as a YYYY-MM-DD date, or None if it is not a whole day"""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d") if value.time() == datetime.min.time() else None
+    if isinstance(value, date):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, str) and _DAY.match(value):
+        return value
+    return None
+
+
+class Expression(_PredicateFilter):
+    """A condition on Iris results, built from the fields of F and combined with & (and), | (or) and ~ (not):
+
+        api.iris_investigate(search_hash=..., where=(F.risk_score > 70) & (F.expiration_date < "2026-01-01"))
+
+    Comparisons have to be parenthesized, as & and | bind tighter than them in Python. Expressions are filters
+    themselves: they can be applied to a list of results or added to CompiledFilters.
+    """
+
+    def __and__(self, other: "Expression") -> "Expression":
+        return AllOf(self, other)
+
+    def __or__(self, other: "Expression") -> "Expression":
+        return AnyOf(self, other)
+
+    def __invert__(self) -> "Expression":
+        return Not(self)
+
+    def __bool__(self):
+        # e.g. `F.risk_score > 70 & F.active == True` or `F.create_date > "2024-01-01" and F.active == True`
+        raise TypeError("Filter expressions have no truth value: combine them with &, | and ~, in parentheses")
+
+    def parameter(self) -> Optional[Tuple[str, str]]:
+        """Returns the Iris Investigate parameter (name and value) that selects the same results, if there is one"""
+        return None
+
+    def pushdown(self, reserved: Iterable[str] = ()) -> Tuple[Dict[str, str], Optional["Expression"]]:
+        """Splits the expression into the Iris Investigate parameters it can be sent as, and what is left to evaluate
+        locally (None if nothing is). Parameters in reserved (e.g. already given) are not used."""
+        parameter = self.parameter()
+        if parameter is None or parameter[0] in reserved:
+            return {}, self
+        return dict([parameter]), None
+
+
+class Comparison(Expression):
+    """Compares a field of each result to a value. Results where the field is missing never match.
+
+    Fields holding several values (e.g. ip) match when any of their values does.
+    """
+
+    def __init__(self, field: "Field", comparison: str, value: Any):
+        self.field = field
+        self.comparison = comparison
+        self.value = value
+
+    def __repr__(self):
+        return f"(F.{self.field.name} {self.comparison} {self.value!r})"
+
+    def predicate(self) -> Optional[Predicate]:
+        compare = COMPARISONS[self.comparison]
+        values = self.field.values
+        value = self.value
+        if self.field.name not in DATE_FIELDS:
+
+            def compares(result):
+                for found in values(result):
+                    try:
+                        if compare(found, value):
+                            return True
+                    except TypeError:
+                        # uncomparable value
+                        continue
+                return False
+
+            return compares
+
+        # dates are compared as the integers of datetime_ordinal()
+        if isinstance(value, str):
+            value = iso_ordinal(value)
+            if value is None:
+                raise ValueError(f"{self!r}: {self.value!r} is not an ISO 8601 date")
+        else:
+            value = datetime_ordinal(value)
+
+        def compares_dates(result):
+            for found in values(result):
+                found = iso_ordinal(found) if isinstance(found, str) else None
+                if found is not None and compare(found, value):
+                    return True
+            return False
+
+        return compares_dates
+
+    def parameter(self) -> Optional[Tuple[str, str]]:
+        name = self.field.name
+        if self.comparison not in PUSHDOWN_OPERATORS.get(name, ()):
+            return None
+
+        value = self.value
+        if name in DATE_FIELDS:
+            value = _day(value)
+            if value is None:
+                return None
+            if self.comparison != "==":
+                value = self.comparison + value
+        elif name == "active":
+            if not isinstance(value, bool):
+                return None
+            value = str(value).lower()
+        elif not (isinstance(value, str) and _TLD.match(value)):
+            return None
+        return name, value
+
+
+class AllOf(Expression):
+    """Matches the results matching every expression"""
+
+    def __init__(self, *expressions: Expression):
+        self.expressions = []
+        for expression in expressions:
+            self.expressions.extend(expression.expressions if isinstance(expression, AllOf) else [expression])
+
+    def __repr__(self):
+        return " & ".join(map(repr, self.expressions))
+
+    def predicate(self) -> Optional[Predicate]:
+        predicates = [expression.predicate() for expression in self.expressions]
+        return lambda result: all(predicate(result) for predicate in predicates)
+
+    def pushdown(self, reserved: Iterable[str] = ()) -> Tuple[Dict[str, str], Optional[Expression]]:
+        parameters = {}
+        remainder = []
+        reserved = set(reserved)
+        for expression in self.expressions:
+            parameter = expression.parameter()
+            # a parameter is sent once, any other condition on it is evaluated locally
+            if parameter is None or parameter[0] in reserved or parameter[0] in parameters:
+                remainder.append(expression)
+            else:
+                parameters[parameter[0]] = parameter[1]
+
+        if len(remainder) > 1:
+            return parameters, AllOf(*remainder)
+        return parameters, remainder[0] if remainder else None
+
+
+class AnyOf(Expression):
+    """Matches the results matching at least one of the expressions"""
+
+    def __init__(self, *expressions: Expression):
+        self.expressions = []
+        for expression in expressions:
+            self.expressions.extend(expression.expressions if isinstance(expression, AnyOf) else [expression])
+
+    def __repr__(self):
+        return "(" + " | ".join(map(repr, self.expressions)) + ")"
+
+    def predicate(self) -> Optional[Predicate]:
+        predicates = [expression.predicate() for expression in self.expressions]
+        return lambda result: any(predicate(result) for predicate in predicates)
+
+
+class Not(Expression):
+    """Matches the results not matching the expression"""
+
+    def __init__(self, expression: Expression):
+        self.expression = expression
+
+    def __repr__(self):
+        return f"~{self.expression!r}"
+
+    def predicate(self) -> Optional[Predicate]:
+        predicate = self.expression.predicate()
+        return lambda result: not predicate(result)
+
+
+class Field:
+    """A field of the Iris results, compared to a value to build an Expression.
+
+    Nested fields are reached with a dotted path, e.g. F["registrant_contact.country"].
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._path = FIELD_PATHS.get(name, name).split(".")
+
+    def values(self, result: Result) -> List[Any]:
+        """Returns the values of the field in result, none if it is missing"""
+        return _field_values(result, self._path)
+
+    def __eq__(self, value: Any) -> Expression:
+        return Comparison(self, "==", value)
+
+    def __ne__(self, value: Any) -> Expression:
+        return Comparison(self, "!=", value)
+
+    def __lt__(self, value: Any) -> Expression:
+        return Comparison(self, "<", value)
+
+    def __le__(self, value: Any) -> Expression:
+        return Comparison(self, "<=", value)
+
+    def __gt__(self, value: Any) -> Expression:
+        return Comparison(self, ">", value)
+
+    def __ge__(self, value: Any) -> Expression:
+        return Comparison(self, ">=", value)
+
+    def isin(self, values: Iterable[Any]) -> Expression:
+        """Matches the results where the field equals any of values"""
+        return AnyOf(*(self == value for value in values))
+
+
+class _Fields:
+    """The fields of the Iris results, by attribute (F.risk_score) or by path (F["domain_risk.risk_score"])"""
+
+    def __getattr__(self, name: str) -> Field:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return Field(name)
+
+    def __getitem__(self, name: str) -> Field:
+        return Field(name)
 
-        filtered_result = []
-        for result in self._results:
-            domain_risk_score = result.get("domain_risk", {}).get("risk_score")
-            if domain_risk_score > self._threshold:
-                filtered_result.append(result)
 
-        return filtered_result
+F = _Fields()
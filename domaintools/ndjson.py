@@ -0,0 +1,114 @@
+"""Decodes newline delimited JSON (as served by the Real Time Threat Feeds) straight from the bytes of a stream"""
+
+import json
+
+# bytes read from the response at a time when decoding feed records
+DEFAULT_CHUNK_SIZE = 256 * 1024
+
+DECODER_BACKENDS = ("orjson", "msgspec", "json")
+
+
+def _orjson_decoder():
+    import orjson
+
+    return orjson.loads
+
+
+def _msgspec_decoder():
+    import msgspec
+
+    return msgspec.json.Decoder().decode
+
+
+def _json_decoder():
+    return json.loads
+
+
+_DECODER_FACTORIES = {
+    "orjson": _orjson_decoder,
+    "msgspec": _msgspec_decoder,
+    "json": _json_decoder,
+}
+
+
+def resolve_backend(backend=None):
+    """Returns the name of the given JSON decoder backend, or of the fastest one installed"""
+    if backend is not None:
+        if backend not in _DECODER_FACTORIES:
+            raise ValueError(f"Unknown JSON decoder backend {backend!r}, expected one of {DECODER_BACKENDS}")
+        return backend
+
+    for name in DECODER_BACKENDS[:-1]:
+        try:
+            _DECODER_FACTORIES[name]()
+        except ImportError:
+            continue
+        return name
+    return "json"
+
+
+def get_decoder(backend=None):
+    """Returns a function decoding one JSON document from bytes.
+
+    backend is one of DECODER_BACKENDS. By default the fastest one installed is used: orjson, then msgspec and
+    finally the standard library json module.
+    """
+    return _DECODER_FACTORIES[resolve_backend(backend)]()
+
+
+class RecordDecoder:
+    """Incrementally decodes newline delimited JSON fed as bytes chunks, e.g. straight from a (async) stream:
+
+        decoder = RecordDecoder()
+        for chunk in chunks:
+            records = decoder.feed(chunk)
+        records = decoder.close()
+
+    Every chunk is split into lines at once and each line is handed to the decoder as bytes, without decoding it to
+    str first. Blank lines are skipped and a final line without a trailing newline is decoded by close().
+    """
+
+    def __init__(self, backend=None):
+        backend = resolve_backend(backend)
+        if backend == "json":
+            import codecs
+
+            # json.loads spends more time sniffing the encoding of bytes than parsing them, so the standard library
+            # backend decodes each chunk to str once and parses the str lines instead
+            self._text = codecs.getincrementaldecoder("utf-8")()
+            self._newline = "\n"
+            self._decode = json.JSONDecoder().decode
+        else:
+            self._text = None
+            self._newline = b"\n"
+            self._decode = get_decoder(backend)
+        self._remainder = None
+
+    def feed(self, chunk):
+        """Returns the records completed by chunk"""
+        if self._text is not None:
+            chunk = self._text.decode(chunk)
+        if self._remainder:
+            chunk = self._remainder + chunk
+
+        lines = chunk.split(self._newline)
+        self._remainder = lines.pop()
+        decode = self._decode
+        return [decode(line) for line in lines if line and not line.isspace()]
+
+    def close(self):
+        """Returns the record of a last line without a trailing newline, if any"""
+        remainder, self._remainder = self._remainder, None
+        if self._text is not None:
+            remainder = (remainder or "") + self._text.decode(b"", final=True)
+        if remainder and not remainder.isspace():
+            return [self._decode(remainder)]
+        return []
+
+
+def iter_records(chunks, backend=None):
+    """Yields the decoded records of an iterable of bytes chunks holding newline delimited JSON"""
+    decoder = RecordDecoder(backend)
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.close()
@@ -0,0 +1,319 @@
+"""Defines the rate limiters used to space out requests to match the per product limits of an account"""
+
+import json
+import math
+import os
+import re
+import threading
+import time
+
+from abc import ABC, abstractmethod
+from urllib.parse import urlparse
+
+
+def _reserve_slot(send_times, windows, now):
+    """Books the next slot admitted by every (period, limit) window.
+
+    Each window keeps a log of the send times of its last `limit` requests and a request is sent no sooner than one
+    period after the oldest of them, so any `period` seconds admit at most `limit` requests. Returns the time the
+    request may be sent at along with the updated logs.
+    """
+    send_times = list(send_times or [])
+    if len(send_times) != len(windows):
+        send_times = [[] for _ in windows]
+
+    send_at = now
+    for (period, limit), log in zip(windows, send_times):
+        if log:
+            # slots are handed out in order, which keeps every log sorted
+            send_at = max(send_at, log[-1])
+        if len(log) >= limit:
+            send_at = max(send_at, log[-limit] + period)
+
+    next_send_times = []
+    for (period, limit), log in zip(windows, send_times):
+        # requests sent a period or more ago no longer count against the window
+        log = [sent for sent in log if sent > send_at - period] + [send_at]
+        next_send_times.append(log[-limit:])
+
+    return send_at, next_send_times
+
+
+class RateLimitBackend(ABC):
+    """The storage of rate limiter state. Implementations must make reserve() atomic for their scope."""
+
+    @abstractmethod
+    def reserve(self, key, windows):
+        """Reserves the next slot for key and returns the number of seconds to wait before using it"""
+
+    async def reserve_async(self, key, windows):
+        """reserve() for coroutines. Runs it in a worker thread so a backend blocking on a lock or on the network
+        does not stall the event loop."""
+        import asyncio
+
+        return await asyncio.to_thread(self.reserve, key, windows)
+
+
+class MemoryBackend(RateLimitBackend):
+    """Keeps rate limiter state in memory. Shared by every thread and coroutine within the process."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._send_times = {}
+
+    def reserve(self, key, windows):
+        with self._lock:
+            now = self._clock()
+            send_at, self._send_times[key] = _reserve_slot(self._send_times.get(key), windows, now)
+            return send_at - now
+
+    async def reserve_async(self, key, windows):
+        # the lock is only ever held for the bookkeeping, which is cheaper than a hop to a worker thread
+        return self.reserve(key, windows)
+
+
+class FileBackend(RateLimitBackend):
+    """Keeps rate limiter state in lock protected files so every process on the host shares one quota budget.
+
+    Every key is stored in its own small JSON file inside `directory`, guarded by an exclusive `fcntl` lock.
+    """
+
+    def __init__(self, directory, clock=time.time):
+        try:
+            import fcntl
+        except ImportError:  # pragma: no cover
+            raise RuntimeError("FileBackend requires fcntl file locks, which are not available on this platform")
+
+        self._fcntl = fcntl
+        self._clock = clock
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, re.sub(r"[^\w.-]", "_", key) + ".json")
+
+    def reserve(self, key, windows):
+        with open(self._path(key), "a+", encoding="utf-8") as state_file:
+            self._fcntl.flock(state_file, self._fcntl.LOCK_EX)
+            try:
+                state_file.seek(0)
+                try:
+                    send_times = json.loads(state_file.read() or "null")
+                except ValueError:
+                    send_times = None
+
+                now = self._clock()
+                send_at, send_times = _reserve_slot(send_times, windows, now)
+
+                state_file.seek(0)
+                state_file.truncate()
+                state_file.write(json.dumps(send_times))
+                state_file.flush()
+            finally:
+                self._fcntl.flock(state_file, self._fcntl.LOCK_UN)
+
+        return send_at - now
+
+
+class RedisConnection:
+    """A minimal Redis protocol (RESP) client, enough to drive the RedisBackend without extra dependencies"""
+
+    def __init__(self, host="localhost", port=6379, db=0, password=None, timeout=5.0):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._sock = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        """Creates a connection from a redis://[:password@]host[:port][/db] url"""
+        parsed = urlparse(url)
+        return cls(
+            host=parsed.hostname or "localhost",
+            port=parsed.port or 6379,
+            db=int(parsed.path.lstrip("/") or 0),
+            password=parsed.password,
+            **kwargs,
+        )
+
+    def _connect(self):
+        import socket
+
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._reader = self._sock.makefile("rb")
+        if self.password:
+            self._send("AUTH", self.password)
+        if self.db:
+            self._send("SELECT", self.db)
+
+    def close(self):
+        with self._lock:
+            if self._sock is not None:
+                self._reader.close()
+                self._sock.close()
+            self._sock = self._reader = None
+
+    def _send(self, *args):
+        command = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            arg = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            command.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        self._sock.sendall(b"".join(command))
+        return self._read_reply()
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by the Redis server")
+
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload.decode("utf-8")
+        if prefix == b"-":
+            raise RuntimeError(f"Redis error: {payload.decode('utf-8')}")
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            length = int(payload)
+            return None if length == -1 else [self._read_reply() for _ in range(length)]
+        raise RuntimeError(f"Unexpected Redis reply: {line!r}")
+
+    def execute_command(self, *args):
+        with self._lock:
+            if self._sock is None:
+                self._connect()
+            try:
+                return self._send(*args)
+            except (ConnectionError, OSError):
+                self._sock = self._reader = None
+                raise
+
+
+class RedisBackend(RateLimitBackend):
+    """Shares rate limiter state through Redis so workers on any number of hosts draw from one quota budget.
+
+    The send time logs of every key are kept as JSON and reserved the same way as by the other backends. Each
+    reservation holds a short lived lock (SET NX PX, expiring after `lock_timeout` seconds should its holder die),
+    which keeps it atomic with plain commands and no server side scripting.
+
+    Pass either a `url` (redis://host:port/db) or an existing `client` exposing `execute_command` such as redis-py.
+    """
+
+    def __init__(
+        self,
+        url="redis://localhost:6379/0",
+        client=None,
+        prefix="domaintools:rate-limit",
+        clock=time.time,
+        lock_timeout=5.0,
+        lock_poll_interval=0.005,
+    ):
+        self.client = client if client is not None else RedisConnection.from_url(url)
+        self.prefix = prefix
+        self.lock_timeout = lock_timeout
+        self.lock_poll_interval = lock_poll_interval
+        self._clock = clock
+
+    def _acquire(self, lock_key, token):
+        timeout = int(math.ceil(self.lock_timeout * 1000))
+        while not self.client.execute_command("SET", lock_key, token, "NX", "PX", timeout):
+            time.sleep(self.lock_poll_interval)
+
+    def _release(self, lock_key, token):
+        holder = self.client.execute_command("GET", lock_key)
+        # an expired lock may have been taken over by another worker, which keeps it
+        if holder in (token, token.encode("utf-8")):
+            self.client.execute_command("DEL", lock_key)
+
+    def reserve(self, key, windows):
+        state_key = f"{self.prefix}:{key}"
+        lock_key = f"{state_key}:lock"
+        token = os.urandom(16).hex()
+        self._acquire(lock_key, token)
+        try:
+            try:
+                send_times = json.loads(self.client.execute_command("GET", state_key) or "null")
+            except ValueError:
+                send_times = None
+
+            now = self._clock()
+            send_at, send_times = _reserve_slot(send_times, windows, now)
+            # the logs matter until the last of their requests has left the longest window
+            expire_after = send_at - now + max(period for period, _limit in windows)
+            self.client.execute_command(
+                "SET", state_key, json.dumps(send_times), "PX", int(math.ceil(expire_after * 1000))
+            )
+        finally:
+            self._release(lock_key, token)
+
+        return send_at - now
+
+
+_default_backend = MemoryBackend()
+
+
+class RateLimiter:
+    """A sliding window rate limiter that can be shared by threads and coroutines.
+
+    Each window admits at most `limit` requests in any `period` seconds. They may all go at once, after which every
+    request waits for the one sent `limit` requests earlier to leave the window, so a window built from a per minute
+    limit of 60 lets 60 requests through immediately and the 61st a minute after the first.
+
+    reserve() books the next free slot atomically in the backend and returns how long the caller has to wait for it.
+    The sleep itself happens outside of any lock, which means concurrent callers wait for their own slot side by side
+    instead of being serialized behind each other.
+
+    Limiters with the same key and backend share one budget. By default every limiter in the process shares one
+    in-memory backend; use a FileBackend or RedisBackend to share the budget between processes.
+    """
+
+    def __init__(self, windows, key="default", backend=None):
+        """windows: an iterable of (period, limit) pairs that all have to admit a request before it is sent."""
+        self.windows = [(float(period), max(int(limit), 1)) for period, limit in windows]
+        if not self.windows:
+            raise ValueError("At least one rate limit window must be provided")
+
+        self.key = key
+        self.backend = backend if backend is not None else _default_backend
+
+    @classmethod
+    def from_limits(cls, per_minute_limit=None, per_hour_limit=None, **kwargs):
+        """Returns a RateLimiter for the given account limits or None if the product is not limited"""
+        windows = []
+        if per_minute_limit:
+            windows.append((60.0, per_minute_limit))
+        if per_hour_limit:
+            windows.append((3600.0, per_hour_limit))
+
+        return cls(windows, **kwargs) if windows else None
+
+    def reserve(self):
+        """Reserves the next available slot and returns the number of seconds to wait before using it"""
+        return self.backend.reserve(self.key, self.windows)
+
+    def wait(self):
+        """Blocks the current thread until a request may be sent. Returns the number of seconds waited."""
+        wait_for = self.reserve()
+        if wait_for > 0:
+            time.sleep(wait_for)
+        return wait_for
+
+    async def wait_async(self):
+        """Suspends the current coroutine until a request may be sent. Returns the number of seconds waited."""
+        import asyncio
+
+        wait_for = await self.backend.reserve_async(self.key, self.windows)
+        if wait_for > 0:
+            await asyncio.sleep(wait_for)
+        return wait_for
@@ -16,6 +16,9 @@ class RequestValidator:
         "object": dict,
     }
 
+    MAX_CACHED_PLANS = 512
+    _plans = {}
+
     @staticmethod
     def validate(
         spec: dict,
@@ -26,93 +29,145 @@ class RequestValidator:
         """
         Orchestrator: Decides which validation to run based on the HTTP method.
         """
-        method = method.upper()
+        return RequestValidator.get_plan(spec, path, method).validate(parameters)
 
-        # GET requests: Validate Query Parameters only
-        if method == "GET":
-            RequestValidator.validate_query_params(spec, path, method, parameters)
+    @staticmethod
+    def compile_plan(spec: dict, path: str, method: str) -> "ValidationPlan":
+        """
+        Resolves the rules of one operation into a ValidationPlan that can be reused for every request.
+        """
+        return ValidationPlan(DocstringPatcher.get_operation_details(spec, path, method), method)
 
-        # POST/PUT/PATCH: Validate Request Body
-        elif method in ["POST", "PUT", "PATCH"]:
-            RequestValidator.validate_body(spec, path, method, parameters)
+    @staticmethod
+    def get_plan(spec: dict, path: str, method: str) -> "ValidationPlan":
+        """
+        Returns the cached ValidationPlan of an operation, compiling it on first use.
+        Plans are keyed on the identity of the spec dict, so specs must not be modified once used.
+        """
+        key = (id(spec), path, method.upper())
+        cached = RequestValidator._plans.get(key)
+        # the cached entry keeps its spec alive, so a matching id always refers to the same dict
+        if cached is None or cached[0] is not spec:
+            if len(RequestValidator._plans) >= RequestValidator.MAX_CACHED_PLANS:
+                RequestValidator._plans.clear()
+            cached = (spec, RequestValidator.compile_plan(spec, path, method))
+            RequestValidator._plans[key] = cached
 
-        return True
+        return cached[1]
 
     @staticmethod
     def validate_query_params(spec: dict, path: str, method: str, q_params: dict):
         """
         Validates ONLY the query parameters.
         """
+        RequestValidator.get_plan(spec, path, method).validate_query_params(q_params)
+
+    @staticmethod
+    def validate_body(spec: dict, path: str, method: str, body_data: dict):
+        """
+        Validates ONLY the request body.
+        """
+        RequestValidator.get_plan(spec, path, method).validate_body(body_data)
+
+    @staticmethod
+    def _simple_type(openapi_type):
+        """Returns the TYPE_MAP key an OpenAPI type is checked against, or None if it can't be checked."""
+        if "array" in openapi_type:
+            return "array"
+        if openapi_type in RequestValidator.TYPE_MAP:
+            return openapi_type
+        return None
+
+    @staticmethod
+    def _check_type(value, openapi_type, field_name, errors):
+        """Helper to check python types against OpenAPI string types."""
+        simple_type = RequestValidator._simple_type(openapi_type)
+        if simple_type is None:
+            return
+
+        RequestValidator._check_simple_type(value, simple_type, field_name, errors)
+
+    @staticmethod
+    def _check_simple_type(value, simple_type, field_name, errors):
+        expected_type = RequestValidator.TYPE_MAP.get(simple_type)
+
+        if expected_type and not isinstance(value, expected_type):
+            errors.append(
+                f"Invalid type for '{field_name}'. Expected {simple_type}, got {type(value).__name__}."
+            )
+
+
+class ValidationPlan:
+    """
+    The precompiled rules of a single operation: the query parameters in spec order (with their required flag and
+    checkable type) and the typed body properties. Compiling walks the spec once; validate() only does dict lookups.
+    """
+
+    __slots__ = ("method", "query_params", "has_body", "body_properties")
+
+    def __init__(self, details: dict, method: str):
+        self.method = method.upper()
+        self.query_params = tuple(
+            (param["name"], param["required"], RequestValidator._simple_type(param["type"]))
+            for param in details["query_params"]
+        )
+
+        body_rules = details["request_body"]
+        self.has_body = bool(body_rules)
+        self.body_properties = ()
+        if body_rules:
+            body_properties = []
+            for prop in body_rules.get("properties") or []:
+                simple_type = RequestValidator._simple_type(prop["type"])
+                if simple_type is not None:
+                    body_properties.append((prop["name"], simple_type))
+            self.body_properties = tuple(body_properties)
+
+    def validate(self, parameters: dict = None):
+        # GET requests: Validate Query Parameters only
+        if self.method == "GET":
+            self.validate_query_params(parameters)
+
+        # POST/PUT/PATCH: Validate Request Body
+        elif self.method in ["POST", "PUT", "PATCH"]:
+            self.validate_body(parameters)
+
+        return True
+
+    def validate_query_params(self, q_params: dict):
         q_params = q_params or {}
-        details = DocstringPatcher.get_operation_details(spec, path, method)
         errors = []
 
-        for param in details["query_params"]:
-            param_name = param["name"]
-            is_required = param["required"]
-            param_type = param["type"]
-
+        for param_name, is_required, simple_type in self.query_params:
             # Check existence
-            if is_required and param_name not in q_params:
-                errors.append(f"Missing required query parameter: '{param_name}'")
+            if param_name not in q_params:
+                if is_required:
+                    errors.append(f"Missing required query parameter: '{param_name}'")
                 continue
 
             # Check Type (only if present)
-            if param_name in q_params:
-                val = q_params[param_name]
-                RequestValidator._check_type(val, param_type, f"query.{param_name}", errors)
+            if simple_type is not None:
+                RequestValidator._check_simple_type(q_params[param_name], simple_type, f"query.{param_name}", errors)
 
         if errors:
             raise ValueError("Query Parameter Validation Failed:\n  - " + "\n  - ".join(errors))
 
-    @staticmethod
-    def validate_body(spec: dict, path: str, method: str, body_data: dict):
-        """
-        Validates ONLY the request body.
-        """
-        details = DocstringPatcher.get_operation_details(spec, path, method)
-        errors = []
-
-        if not details["request_body"]:
+    def validate_body(self, body_data: dict):
+        if not self.has_body:
             # If spec has no body defined, but user sent one, you might want to warn
             # or simply ignore. We will ignore here.
             return
 
-        body_rules = details["request_body"]
-
         # Check Body Existence
         if not body_data:
             raise ValueError("Validation Failed: Missing required request body.")
 
         # Check Body Properties
-        # Only proceed if we have data and the spec defines properties
-        if body_data and body_rules.get("properties"):
-            for prop in body_rules["properties"]:
-                p_name = prop["name"]
-                p_type = prop["type"]
-
-                # Check Type if the property exists in the user input
-                if p_name in body_data:
-                    RequestValidator._check_type(
-                        body_data[p_name], p_type, f"body.{p_name}", errors
-                    )
+        errors = []
+        for p_name, simple_type in self.body_properties:
+            # Check Type if the property exists in the user input
+            if p_name in body_data:
+                RequestValidator._check_simple_type(body_data[p_name], simple_type, f"body.{p_name}", errors)
 
         if errors:
             raise ValueError("Body Validation Failed:\n  - " + "\n  - ".join(errors))
-
-    @staticmethod
-    def _check_type(value, openapi_type, field_name, errors):
-        """Helper to check python types against OpenAPI string types."""
-        simple_type = openapi_type
-
-        if "array" in openapi_type:
-            simple_type = "array"
-        elif openapi_type not in RequestValidator.TYPE_MAP:
-            return
-
-        expected_type = RequestValidator.TYPE_MAP.get(simple_type)
-
-        if expected_type and not isinstance(value, expected_type):
-            errors.append(
-                f"Invalid type for '{field_name}'. Expected {simple_type}, got {type(value).__name__}."
-            )
@@ -3,12 +3,11 @@ Defines the used Result object based on the current versions and/or features ava
 Additionally, defines any custom result objects that may be used to enable more Pythonic interaction with endpoints.
 """
 
+import json
 import logging
 from itertools import zip_longest, chain
 from typing import Generator
 
-import httpx
-
 try:  # pragma: no cover
     from collections import OrderedDict
 except ImportError:  # pragma: no cover
@@ -16,6 +15,13 @@ except ImportError:  # pragma: no cover
 
 
 from domaintools_async import AsyncResults as Results
+from domaintools.checkpoint import CheckpointedFeed
+from domaintools.columns import to_arrow, to_columns
+from domaintools.concurrency import amap_ordered, chunked, map_ordered
+from domaintools.constants import IRIS_MAX_DOMAINS_PER_REQUEST, OutputFormat, Source
+from domaintools.download import DEFAULT_PART_SIZE, download_files, manifest_files
+from domaintools.filters import DTResultFilter
+from domaintools.ndjson import DEFAULT_CHUNK_SIZE, RecordDecoder, iter_records
 
 log = logging.getLogger(__name__)
 
@@ -200,6 +206,294 @@ class ParsedDomainRdap(Results):
         return flat
 
 
+class PagedResults(Results):
+    """The base of results that can fetch further pages of the same query"""
+
+    query = None
+
+    def _page(self, **parameters):
+        """Returns (unfetched) results for the same query with the given parameters replaced, freshly signed"""
+        path, kwargs = self.query
+        return self.api._results(self.product, path, cls=self.__class__, **dict(kwargs, **parameters))
+
+
+class IrisColumns:
+    """Exports Iris Investigate and Enrich results as typed columns, see domaintools.columns"""
+
+    def to_columns(self, numpy=False):
+        """Returns the results flattened into columns of domain, risk_score, dates, ips, name servers, registrar
+        and pivot counts. Lists by default, NumPy arrays with numpy=True."""
+        return to_columns(self._records(), numpy=numpy)
+
+    def to_arrow(self):
+        """Returns the results flattened into the columns of to_columns() as a pyarrow.Table"""
+        return to_arrow(self._records())
+
+
+class IrisResults(IrisColumns, PagedResults):
+    """Iris results that can stream every page of a query by following the `position` key:
+
+        for domain in api.iris_investigate(search_hash=QUERY).iter_all():
+            print(domain["domain"])
+
+        async for domain in api.iris_investigate(search_hash=QUERY).aiter_all():
+            print(domain["domain"])
+
+    By default the next page is requested while the caller works through the current one. Only the current page
+    and the one being prefetched are ever held in memory.
+
+    to_columns() and to_arrow() export the results of this page; pass iter_all() to domaintools.columns.to_columns()
+    to export every page.
+    """
+
+    result_filters = ()
+
+    def apply_result_filters(self):
+        """Applies the client side result_filters to the results of this page"""
+        if not self.result_filters:
+            return self
+
+        filtered_results = DTResultFilter(result_set=self).by(self.result_filters)
+        self["results"] = filtered_results
+        self["results_count"] = len(filtered_results)
+        return self
+
+    def _next_position(self):
+        response = self.response()
+        return response.get("position") if response.get("has_more_results") else None
+
+    def _page(self, **parameters):
+        page = super()._page(**parameters)
+        page.result_filters = self.result_filters
+        return page
+
+    def _load_page(self, position):
+        page = self._page(position=position).apply_result_filters()
+        # fetched here even without filters, so that a prefetched page is requested in the background
+        page.response()
+        return page
+
+    async def _aload_page(self, position):
+        page = await self._page(position=position)
+        return page.apply_result_filters()
+
+    def iter_all(self, prefetch=True):
+        """Yields the results of this page and every following one"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        page, pending = self, None
+        try:
+            while True:
+                position = page._next_position()
+                if position and executor is not None:
+                    pending = executor.submit(self._load_page, position)
+
+                yield from page
+
+                if not position:
+                    return
+                page = pending.result() if pending is not None else self._load_page(position)
+                pending = None
+        finally:
+            if pending is not None:
+                pending.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    async def aiter_all(self, prefetch=True):
+        """Asynchronously yields the results of this page and every following one"""
+        import asyncio
+
+        page, pending = await self, None
+        try:
+            while True:
+                position = page._next_position()
+                if position and prefetch:
+                    pending = asyncio.ensure_future(self._aload_page(position))
+
+                for result in page:
+                    yield result
+
+                if not position:
+                    return
+                page = await pending if pending is not None else await self._aload_page(position)
+                pending = None
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+
+class ChunkedIrisResults(IrisColumns, Results):
+    """Iris results for more domains than a single request accepts:
+
+        for domain in api.iris_enrich(open("domains.txt").read().split()).iter_all():
+            print(domain["domain"])
+
+    The domains (any iterable, consumed lazily) are split into chunks of `chunk_size`. Each chunk is requested
+    through `page_factory` (up to `concurrency` at a time, each request waiting for its rate limiter slot) and the
+    results are yielded in the order of the domains. `missing_domains` collects the domains missing from every chunk
+    fetched so far. Reading the results like a single response (or awaiting them) merges every chunk.
+    """
+
+    def __init__(
+        self,
+        api,
+        product,
+        url,
+        domains,
+        page_factory,
+        chunk_size=IRIS_MAX_DOMAINS_PER_REQUEST,
+        concurrency=4,
+        **kwargs,
+    ):
+        super().__init__(api, product, url, items_path=("results",), **kwargs)
+        self.page_factory = page_factory
+        self.concurrency = concurrency
+        self.missing_domains = set()
+        self._chunks = chunked(domains, chunk_size)
+
+    def _take_chunks(self):
+        chunks, self._chunks = self._chunks, None
+        if chunks is None:
+            raise RuntimeError("The domains of these results are already being iterated")
+        return chunks
+
+    def _load_page(self, chunk):
+        page = self.page_factory(chunk).apply_result_filters()
+        page.response()
+        return page
+
+    async def _aload_page(self, chunk):
+        page = await self.page_factory(chunk)
+        return page.apply_result_filters()
+
+    def _merged(self, results):
+        self._status = 200
+        self._data = {
+            "response": {
+                "results": results,
+                "results_count": len(results),
+                "missing_domains": sorted(self.missing_domains),
+                "limit_exceeded": False,
+            }
+        }
+
+    def iter_all(self, concurrency=None):
+        """Yields the results of every chunk of domains"""
+        if self._data is not None:
+            yield from self._items()
+            return
+
+        pages = map_ordered(self._load_page, self._take_chunks(), concurrency=concurrency or self.concurrency)
+        for page in pages:
+            self.missing_domains.update(page.response().get("missing_domains") or ())
+            yield from page
+
+    async def aiter_all(self, concurrency=None):
+        """Asynchronously yields the results of every chunk of domains"""
+        if self._data is not None:
+            for result in self._items():
+                yield result
+            return
+
+        pages = amap_ordered(self._aload_page, self._take_chunks(), concurrency=concurrency or self.concurrency)
+        async for page in pages:
+            self.missing_domains.update(page.response().get("missing_domains") or ())
+            for result in page:
+                yield result
+
+    def data(self):
+        if self._data is None:
+            self._merged(list(self.iter_all()))
+        return self._data
+
+    async def __awaitable__(self):
+        if self._data is None:
+            self._merged([result async for result in self.aiter_all()])
+        return self
+
+    @property
+    def status(self):
+        self.data()
+        return self._status
+
+    @property
+    def json(self):
+        return self
+
+    def _records(self):
+        # streamed chunk by chunk, so that writing the results does not hold all of them
+        return self.iter_all()
+
+    def _with_format(self, format, data=None):
+        if data is None:
+            raise ValueError("Only json, jsonl and csv are available when the domains are split over requests")
+
+        results = Results(self.api, self.product, self.url, items_path=self.items_path, **self.kwargs)
+        results.kwargs["format"] = format
+        results._data, results._status = data, 200
+        return results
+
+
+class IrisDetectResults(PagedResults):
+    """Iris Detect results that can stream every page of a listing, paginated by `offset` and `limit`:
+
+        for domain in api.iris_detect_watched_domains(monitor_id=MONITOR_ID).iter_all():
+            print(domain["domain"])
+
+    The first page tells how many items there are (`total_count`). The remaining pages are then requested up to
+    `concurrency` at a time (each request still waits for its rate limiter slot) and their items are yielded in order.
+    """
+
+    def _page_size(self):
+        return self.response().get("limit") or self.kwargs.get("limit") or len(self._items())
+
+    def _page_offsets(self):
+        response = self.response()
+        page_size = self._page_size()
+        if not page_size:
+            return range(0)
+
+        offset = int(response.get("offset") or self.kwargs.get("offset") or 0)
+        return range(offset + page_size, response.get("total_count") or 0, page_size)
+
+    def _load_page(self, offset):
+        page = self._page(offset=offset, limit=self._page_size())
+        page.response()
+        return page
+
+    async def _aload_page(self, offset):
+        return await self._page(offset=offset, limit=self._page_size())
+
+    def iter_all(self, concurrency=4):
+        """Yields the items of this page and every following one, fetching up to `concurrency` pages at once"""
+        yield from self
+        for page in map_ordered(self._load_page, self._page_offsets(), concurrency=concurrency):
+            yield from page
+
+    async def aiter_all(self, concurrency=4):
+        """Asynchronously yields the items of this page and every following one"""
+        await self
+        for item in self:
+            yield item
+        async for page in amap_ordered(self._aload_page, self._page_offsets(), concurrency=concurrency):
+            for item in page:
+                yield item
+
+
+def _line_terminated(chunks):
+    """Yields chunks, followed by a newline if they do not end with one. The body of a response may end without
+    one, which would join its last record to the first one of the next response."""
+    last = b""
+    for chunk in chunks:
+        if chunk:
+            last = chunk
+            yield chunk
+    if last and not last.endswith(b"\n"):
+        yield b"\n"
+
+
 class FeedsResults(Results):
     """
     Real Time Threat Feeds (RTTF) returns an application/ndjson stream.
@@ -217,20 +511,19 @@ class FeedsResults(Results):
         Creates and manages the httpx stream request, yielding data line by line.
         This is the core generator that communicates with the DT frontend API server.
         """
+        yield from self._stream(lambda response: response.iter_lines())
+
+    def _stream(self, read, accept_encoding="identity") -> Generator:
+        """Sends the feed request and yields from read(response) once the status of the response is set"""
         session_info = self._get_session_params_and_headers()
         headers = session_info.get("headers")
-        headers["Accept-Encoding"] = "identity"
+        headers["Accept-Encoding"] = accept_encoding
         parameters = session_info.get("parameters")
 
-        with httpx.stream(
-            "GET",
-            self.url,
-            headers=headers,
-            params=parameters,
-            verify=self.api.verify_ssl,
-            proxy=self.api.proxy_url,
-            timeout=None,
-        ) as response:
+        session = self.api.client
+        request = session.build_request("GET", self.url, headers=headers, params=parameters)
+        response = self.api.retry_policy.call(lambda: session.send(request, stream=True))
+        try:
             # set the status already
             error_text = ""
             status_code = response.status_code
@@ -240,8 +533,128 @@ class FeedsResults(Results):
 
             self.setStatus(status_code, reason_text=error_text)
 
-            for line in response.iter_lines():
-                yield line
+            yield from read(response)
+        finally:
+            response.close()
+
+    def records(self, backend=None, compressed=True, chunk_size=DEFAULT_CHUNK_SIZE) -> Generator:
+        """Yields every record of a jsonl feed decoded, following 206 responses like response() does.
+
+        The stream is read `chunk_size` bytes at a time and split into lines without decoding them to str first.
+        Records are decoded with the given JSON `backend` ("orjson", "msgspec" or "json"), by default the fastest
+        one installed. With `compressed` the feed is requested gzip encoded and inflated incrementally as it arrives.
+        """
+        if self.kwargs.get("output_format", OutputFormat.JSONL.value) != OutputFormat.JSONL.value:
+            raise ValueError("records() decodes jsonl feeds only, use response() for csv")
+
+        while self.status != 200:
+            yield from self._decoded_records(backend, compressed, chunk_size)
+
+            if not self.kwargs.get("sessionID"):
+                # same as response(): only sessions can be resumed
+                break
+        self._status = None
+
+    def chunks(self, compressed=True, chunk_size=DEFAULT_CHUNK_SIZE) -> Generator:
+        """Yields the body of the feed as raw bytes, `chunk_size` at a time, following 206 responses like
+        response() does. Nothing is decoded or split into lines, which makes it the fastest way to write a feed
+        out as is. With `compressed` the feed is transferred gzip encoded and inflated as it arrives."""
+        accept_encoding = "gzip" if compressed else "identity"
+        while self.status != 200:
+            yield from self._stream(
+                lambda response: _line_terminated(response.iter_bytes(chunk_size)), accept_encoding
+            )
+
+            if not self.kwargs.get("sessionID"):
+                break
+        self._status = None
+
+    def _decoded_records(self, backend=None, compressed=True, chunk_size=DEFAULT_CHUNK_SIZE) -> Generator:
+        """Yields the decoded records of a single feed request"""
+        accept_encoding = "gzip" if compressed else "identity"
+        chunks = self._stream(lambda response: response.iter_bytes(chunk_size), accept_encoding)
+        return iter_records(chunks, backend)
+
+    async def _astream(self, accept_encoding="gzip", chunk_size=DEFAULT_CHUNK_SIZE):
+        """Sends the feed request with the pooled AsyncClient and yields the bytes of the response"""
+        session_info = self._get_session_params_and_headers()
+        headers = session_info.get("headers")
+        headers["Accept-Encoding"] = accept_encoding
+        parameters = session_info.get("parameters")
+
+        session = self.api.async_client
+        request = session.build_request("GET", self.url, headers=headers, params=parameters)
+        response = await self.api.retry_policy.call_async(lambda: session.send(request, stream=True))
+        try:
+            error_text = ""
+            status_code = response.status_code
+            if status_code not in [200, 206]:
+                await response.aread()
+                error_text = response.text
+
+            self.setStatus(status_code, reason_text=error_text)
+
+            async for chunk in response.aiter_bytes(chunk_size):
+                yield chunk
+        finally:
+            await response.aclose()
+
+    async def arecord_batches(self, backend=None, compressed=True, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Asynchronously yields the records of a jsonl feed, as the list of records decoded from each chunk read.
+        Like records(), 206 responses of a session are followed."""
+        if self.kwargs.get("output_format", OutputFormat.JSONL.value) != OutputFormat.JSONL.value:
+            raise ValueError("arecord_batches() decodes jsonl feeds only")
+
+        accept_encoding = "gzip" if compressed else "identity"
+        while self.status != 200:
+            decoder = RecordDecoder(backend)
+            async for chunk in self._astream(accept_encoding, chunk_size):
+                records = decoder.feed(chunk)
+                if records:
+                    yield records
+            records = decoder.close()
+            if records:
+                yield records
+
+            if not self.kwargs.get("sessionID"):
+                break
+        self._status = None
+
+    async def arecords(self, backend=None, compressed=True, chunk_size=DEFAULT_CHUNK_SIZE):
+        """The async counterpart of records()"""
+        async for records in self.arecord_batches(backend, compressed, chunk_size):
+            for record in records:
+                yield record
+
+    def manifest(self) -> dict:
+        """Returns the manifest listing the files of a `download` endpoint request"""
+        if not self.product.endswith(f"({Source.S3.value})"):
+            raise ValueError("Only the download endpoint returns a manifest, request the feed with endpoint='download'")
+
+        return json.loads(b"".join(self._stream(lambda response: response.iter_bytes())))
+
+    def download(self, directory, concurrency=4, part_size=DEFAULT_PART_SIZE, decompress=True) -> list:
+        """Downloads the files listed by the manifest of a `download` endpoint request into directory, with
+        concurrent range requests, and returns their paths. Read them with domaintools.download.iter_records()."""
+        return download_files(
+            self.api,
+            manifest_files(self.manifest()),
+            directory,
+            concurrency=concurrency,
+            part_size=part_size,
+            decompress=decompress,
+        )
+
+    def checkpointed(self, store, key=None, **options) -> CheckpointedFeed:
+        """Returns the decoded records of the feed, checkpointed in store so that a consumer can resume after a crash:
+
+            feed = api.nod(sessionID="my-session").checkpointed(FileCheckpointStore("nod.checkpoint"))
+            for record in feed:
+                process(record)
+
+        See CheckpointedFeed for the options.
+        """
+        return CheckpointedFeed(self, store, key=key, **options)
 
     def data(self) -> Generator:
         self._data = self._make_request()
@@ -0,0 +1,180 @@
+"""Defines the retry policy used to recover from transient DomainTools API failures"""
+
+import logging
+import random
+import threading
+import time
+
+from datetime import datetime, timezone
+
+log = logging.getLogger(__name__)
+
+
+class RetryPolicy:
+    """Retries transient failures with exponential backoff and jitter.
+
+    A request is retried when it fails with a connect or read timeout (or a connection error) or when the response
+    status is one of `retry_statuses`. The delay before retry N is `backoff_base * 2 ** (N - 1)` capped at
+    `backoff_max`, randomized to between half and all of that value when `jitter` is set. A `Retry-After` header sent
+    by the server takes precedence over the computed delay.
+
+    Retrying stops after `max_attempts` attempts in total or once the next retry would end after `max_elapsed` seconds
+    since the first attempt. The last response is then returned (or the last error raised) as is.
+
+    Requests that are not idempotent (e.g. escalating domains) are only retried when the connection could not be
+    established, as the server never received them. Any other failure may have been applied already.
+
+    The policy keeps counters of what it did in `stats`, which can be exported for monitoring.
+    Use RetryPolicy(max_attempts=1) to disable retries.
+    """
+
+    def __init__(
+        self,
+        max_attempts=3,
+        max_elapsed=300.0,
+        backoff_base=1.0,
+        backoff_max=60.0,
+        jitter=True,
+        retry_statuses=(500, 502, 503, 504),
+        retry_on_timeouts=True,
+    ):
+        self.max_attempts = max(int(max_attempts), 1)
+        self.max_elapsed = max_elapsed
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_on_timeouts = retry_on_timeouts
+        self._lock = threading.Lock()
+        self._stats = {"attempts": 0, "retries": 0, "exhausted": 0, "retries_by_reason": {}}
+
+    @property
+    def stats(self):
+        """A snapshot of the retry counters: attempts, retries, exhausted and retries_by_reason"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["retries_by_reason"] = dict(self._stats["retries_by_reason"])
+        return stats
+
+    def _count(self, counter, reason=None):
+        with self._lock:
+            self._stats[counter] += 1
+            if reason is not None:
+                by_reason = self._stats["retries_by_reason"]
+                by_reason[reason] = by_reason.get(reason, 0) + 1
+
+    @staticmethod
+    def _retryable_exceptions():
+        import httpx
+
+        return (httpx.TimeoutException, httpx.ConnectError, httpx.RemoteProtocolError)
+
+    @staticmethod
+    def _unsent_exceptions():
+        import httpx
+
+        # raised before any of the request was sent
+        return (httpx.ConnectError, httpx.ConnectTimeout)
+
+    def is_retryable_exception(self, error, idempotent=True):
+        if not idempotent:
+            return self.retry_on_timeouts and isinstance(error, self._unsent_exceptions())
+        return self.retry_on_timeouts and isinstance(error, self._retryable_exceptions())
+
+    def is_retryable_response(self, response, idempotent=True):
+        return idempotent and response.status_code in self.retry_statuses
+
+    @staticmethod
+    def _get_retry_after(response):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if not retry_after:
+            return None
+
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass
+
+        from email.utils import parsedate_to_datetime
+
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+    def get_delay(self, attempt, response=None):
+        """Returns the number of seconds to wait before retrying after the given (1-based) failed attempt"""
+        retry_after = self._get_retry_after(response)
+        if retry_after is not None:
+            return retry_after
+
+        delay = min(self.backoff_base * (2 ** (attempt - 1)), self.backoff_max)
+        if self.jitter:
+            delay = random.uniform(delay / 2, delay)
+        return delay
+
+    def _next_delay(self, attempt, started, response=None, error=None, idempotent=True):
+        """Returns the delay before the next attempt or None when the request should not be retried"""
+        if error is not None:
+            retryable, reason = self.is_retryable_exception(error, idempotent), type(error).__name__
+        else:
+            retryable, reason = self.is_retryable_response(response, idempotent), str(response.status_code)
+
+        if not retryable:
+            return None
+
+        delay = self.get_delay(attempt, response)
+        if attempt >= self.max_attempts or time.monotonic() - started + delay > self.max_elapsed:
+            self._count("exhausted")
+            return None
+
+        self._count("retries", reason)
+        log.info("Retrying request after [%s] (attempt %s) - sleeping [%.2f] seconds.", reason, attempt, delay)
+        return delay
+
+    def call(self, send, idempotent=True):
+        """Calls send() until it returns a non retryable response or the retry budget is spent"""
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            self._count("attempts")
+            try:
+                response = send()
+            except Exception as error:
+                delay = self._next_delay(attempt, started, error=error, idempotent=idempotent)
+                if delay is None:
+                    raise
+            else:
+                delay = self._next_delay(attempt, started, response=response, idempotent=idempotent)
+                if delay is None:
+                    return response
+                response.close()
+
+            time.sleep(delay)
+
+    async def call_async(self, send, idempotent=True):
+        """Awaits send() until it returns a non retryable response or the retry budget is spent"""
+        import asyncio
+
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            self._count("attempts")
+            try:
+                response = await send()
+            except Exception as error:
+                delay = self._next_delay(attempt, started, error=error, idempotent=idempotent)
+                if delay is None:
+                    raise
+            else:
+                delay = self._next_delay(attempt, started, response=response, idempotent=idempotent)
+                if delay is None:
+                    return response
+                await response.aclose()
+
+            await asyncio.sleep(delay)
@@ -0,0 +1,100 @@
+"""Loads the bundled OpenAPI specs once per process, backed by a pickled cache stored next to each YAML file"""
+
+import os
+import pickle
+import tempfile
+import threading
+
+from pathlib import Path
+
+from domaintools.constants import SPECS_MAPPING
+
+SPECS_DIRECTORY = Path(__file__).parent / "specs"
+CACHE_SUFFIX = ".pickle"
+# bump whenever the layout of the cache files changes so stale caches are ignored
+CACHE_FORMAT_VERSION = 1
+
+_loaded_specs = {}
+_lock = threading.Lock()
+
+
+def _source_signature(file_path):
+    stat = os.stat(file_path)
+    return (CACHE_FORMAT_VERSION, stat.st_mtime_ns, stat.st_size)
+
+
+def _read_cache(cache_path, signature):
+    try:
+        with open(cache_path, "rb") as cache_file:
+            cached_signature, spec = pickle.load(cache_file)
+    except Exception:
+        return None
+
+    return spec if cached_signature == signature else None
+
+
+def _write_cache(cache_path, signature, spec):
+    """Atomically replaces the cache file. The cache is an optimization so an unwritable directory is ignored."""
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            pickle.dump((signature, spec), temp_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+
+
+def _parse_yaml(spec_file):
+    # yaml is only needed when the pickled cache is missing or stale
+    import yaml
+
+    try:  # pragma: no cover
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:  # pragma: no cover
+        from yaml import SafeLoader
+
+    return yaml.load(spec_file, Loader=SafeLoader)
+
+
+def load_spec(file_path):
+    """Returns the parsed spec stored at file_path.
+
+    Parsed specs are kept in memory for the lifetime of the process and shared by every caller, so they must be
+    treated as read-only. The first load in a process reads the pickled cache next to the YAML file and only falls
+    back to parsing the YAML (with the libyaml based loader when available) if the cache is missing or stale.
+    """
+    file_path = str(file_path)
+    signature = _source_signature(file_path)
+    with _lock:
+        loaded = _loaded_specs.get(file_path)
+        if loaded is not None and loaded[0] == signature:
+            return loaded[1]
+
+        cache_path = file_path + CACHE_SUFFIX
+        spec = _read_cache(cache_path, signature)
+        if spec is None:
+            with open(file_path, "r", encoding="utf-8") as spec_file:
+                spec = _parse_yaml(spec_file)
+            if not spec:
+                raise ValueError("Spec file is empty or invalid.")
+            _write_cache(cache_path, signature, spec)
+
+        _loaded_specs[file_path] = (signature, spec)
+        return spec
+
+
+def clear_cache():
+    """Forgets the specs loaded in this process (the cache files on disk are left untouched)"""
+    with _lock:
+        _loaded_specs.clear()
+
+
+def spec_path(spec_name):
+    return SPECS_DIRECTORY / SPECS_MAPPING[spec_name]
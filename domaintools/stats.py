@@ -0,0 +1,231 @@
+"""Statistics of the risk scores and ages of Iris Investigate and Detect result sets, computed in a single pass:
+
+    statistics = describe(api.iris_investigate(search_hash=QUERY).iter_all())
+    statistics["risk_score"]["mean"], statistics["age"]["percentiles"][50]
+
+Results can be any iterable, e.g. a stream of every page. The statistics of each field are a dict of its `count`, `sum`,
+`mean`, `min`, `max`, `percentiles` (by percentile, interpolated linearly like numpy.percentile) and `histogram`
+(`edges` and the `counts` of values in each bin, the last one including its upper edge).
+
+NumPy computes them when it is installed. Otherwise (or with backend="python") the values are tallied as they stream
+by and the statistics are derived from the tallies. Risk scores and ages in days take few distinct values, so this
+needs little memory however many results there are.
+"""
+
+from bisect import bisect_right
+from collections import Counter
+from datetime import date
+from itertools import accumulate
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+from domaintools.utils import create_date_ordinal
+
+BACKENDS = ("numpy", "python")
+
+DEFAULT_PERCENTILES = (25, 50, 75, 90, 99)
+
+# the risk score ranges of Iris: 0, 1-39, 40-69, 70-99 and 100
+RISK_SCORE_BINS = (0, 1, 40, 70, 100, 101)
+
+# a week, a month, three months, a year, two, five and ten years old and older, in days
+AGE_BINS = (0, 7, 30, 90, 365, 730, 1825, 3650, 36500)
+
+
+def result_risk_score(result: Dict[str, Any]) -> Optional[int]:
+    """Returns the risk score of an Investigate (`domain_risk.risk_score`) or Detect (`risk_score`) result"""
+    domain_risk = result.get("domain_risk")
+    if isinstance(domain_risk, dict) and "risk_score" in domain_risk:
+        return domain_risk["risk_score"]
+    return result.get("risk_score")
+
+
+def result_age(result: Dict[str, Any], today: Optional[int] = None) -> Optional[int]:
+    """Returns how many days old the domain of an Investigate (`create_date.value` as %Y-%m-%d) or Detect
+    (`create_date` as the integer %Y%m%d) result is, on the day of the ordinal today (by default the current one)"""
+    create_date = result.get("create_date")
+    if isinstance(create_date, dict):
+        create_date = create_date.get("value")
+    elif isinstance(create_date, int) and not isinstance(create_date, bool):
+        create_date = str(create_date)
+    else:
+        return None
+
+    if not create_date:
+        return None
+    return (today or date.today().toordinal()) - create_date_ordinal(create_date)
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """Returns the given backend, or numpy if it is installed and python otherwise"""
+    if backend is not None:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown statistics backend {backend!r}, expected one of {BACKENDS}")
+        return backend
+
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return "python"
+    return "numpy"
+
+
+class _Tally:
+    """Collects the values of a field, as a list for NumPy or as counts of each distinct value"""
+
+    def __init__(self, backend: str):
+        if backend == "numpy":
+            self.values = []
+            self.add = self.values.append
+        else:
+            self.values = Counter()
+            self.add = self._count
+
+    def _count(self, value):
+        self.values[value] += 1
+
+    def statistics(self, percentiles: Sequence[float], bins: Optional[Sequence[float]]) -> Dict[str, Any]:
+        if isinstance(self.values, Counter):
+            return _counted_statistics(self.values, percentiles, bins)
+        return _numpy_statistics(self.values, percentiles, bins)
+
+
+def _empty_statistics(percentiles: Sequence[float], bins: Optional[Sequence[float]]) -> Dict[str, Any]:
+    return {
+        "count": 0,
+        "sum": 0,
+        "mean": None,
+        "min": None,
+        "max": None,
+        "percentiles": {percentile: None for percentile in percentiles},
+        "histogram": {"edges": list(bins), "counts": [0] * (len(bins) - 1)} if bins else None,
+    }
+
+
+def _counted_statistics(
+    counts: Counter, percentiles: Sequence[float], bins: Optional[Sequence[float]]
+) -> Dict[str, Any]:
+    if not counts:
+        return _empty_statistics(percentiles, bins)
+
+    values = sorted(counts)
+    # cumulative[i] is the number of values up to values[i], so the value at a rank is found by bisection
+    cumulative = list(accumulate(counts[value] for value in values))
+    count = cumulative[-1]
+    total = sum(value * counts[value] for value in values)
+
+    def ranked(rank):
+        return values[bisect_right(cumulative, rank)]
+
+    by_percentile = {}
+    for percentile in percentiles:
+        rank = (count - 1) * percentile / 100
+        lower = int(rank)
+        low, high = ranked(lower), ranked(min(lower + 1, count - 1))
+        by_percentile[percentile] = low + (high - low) * (rank - lower)
+
+    histogram = None
+    if bins:
+        histogram_counts = [0] * (len(bins) - 1)
+        for value in values:
+            if bins[0] <= value <= bins[-1]:
+                histogram_counts[min(bisect_right(bins, value) - 1, len(histogram_counts) - 1)] += counts[value]
+        histogram = {"edges": list(bins), "counts": histogram_counts}
+
+    return {
+        "count": count,
+        "sum": total,
+        "mean": total / count,
+        "min": values[0],
+        "max": values[-1],
+        "percentiles": by_percentile,
+        "histogram": histogram,
+    }
+
+
+def _numpy_statistics(values: list, percentiles: Sequence[float], bins: Optional[Sequence[float]]) -> Dict[str, Any]:
+    import numpy
+
+    if not values:
+        return _empty_statistics(percentiles, bins)
+
+    array = numpy.asarray(values)
+    histogram = None
+    if bins:
+        histogram_counts, _ = numpy.histogram(array, bins=bins)
+        histogram = {"edges": list(bins), "counts": histogram_counts.tolist()}
+
+    return {
+        "count": int(array.size),
+        "sum": array.sum().item(),
+        "mean": float(array.mean()),
+        "min": array.min().item(),
+        "max": array.max().item(),
+        "percentiles": dict(zip(percentiles, numpy.percentile(array, percentiles).tolist())) if percentiles else {},
+        "histogram": histogram,
+    }
+
+
+def _check_percentiles(percentiles: Sequence[float]):
+    for percentile in percentiles:
+        if not 0 <= percentile <= 100:
+            raise ValueError(f"Percentiles must be between 0 and 100, got {percentile!r}")
+
+
+def describe(
+    results: Iterable[Dict[str, Any]],
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    risk_score_bins: Optional[Sequence[float]] = RISK_SCORE_BINS,
+    age_bins: Optional[Sequence[float]] = AGE_BINS,
+    backend: Optional[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Returns the statistics of the `risk_score` and `age` (in days) of results, read once.
+    Results without a risk score or a creation date are left out of the statistics of that field."""
+    _check_percentiles(percentiles)
+    backend = resolve_backend(backend)
+    today = date.today().toordinal()
+    risk_scores, ages = _Tally(backend), _Tally(backend)
+    for result in results:
+        risk_score = result_risk_score(result)
+        if risk_score is not None:
+            risk_scores.add(risk_score)
+        age = result_age(result, today)
+        if age is not None:
+            ages.add(age)
+
+    return {
+        "risk_score": risk_scores.statistics(percentiles, risk_score_bins),
+        "age": ages.statistics(percentiles, age_bins),
+    }
+
+
+def risk_score_statistics(
+    results: Iterable[Dict[str, Any]],
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    bins: Optional[Sequence[float]] = RISK_SCORE_BINS,
+    backend: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Returns the statistics of the risk scores of results"""
+    _check_percentiles(percentiles)
+    tally = _Tally(resolve_backend(backend))
+    for result in results:
+        risk_score = result_risk_score(result)
+        if risk_score is not None:
+            tally.add(risk_score)
+    return tally.statistics(percentiles, bins)
+
+
+def age_statistics(
+    results: Iterable[Dict[str, Any]],
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    bins: Optional[Sequence[float]] = AGE_BINS,
+    backend: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Returns the statistics of the ages in days of the domains of results"""
+    _check_percentiles(percentiles)
+    tally = _Tally(resolve_backend(backend))
+    today = date.today().toordinal()
+    for result in results:
+        age = result_age(result, today)
+        if age is not None:
+            tally.add(age)
+    return tally.statistics(percentiles, bins)
@@ -1,10 +1,19 @@
 import re
 
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Optional, Union
 
 from domaintools.constants import Endpoint, OutputFormat
 
+# the date layouts of Iris results, parsed with fromisoformat() instead of strptime()
+ISO_DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S.%f")
+
+# distinct dates kept parsed. Creation and expiration dates repeat heavily across results.
+DATE_CACHE_SIZE = 4096
+
+MICROSECONDS_PER_DAY = 86400 * 1000000
+
 
 def get_domain_age(create_date):
     """
@@ -14,17 +23,18 @@ def get_domain_age(create_date):
 
     Returns: Number of days between now and the create_date.
     """
-    try:
-        create_date = datetime.strptime(create_date, "%Y-%m-%d")
-    except ValueError:
-        try:
-            create_date = datetime.strptime(create_date, "%Y%m%d")
-        except ValueError:
-            raise ValueError("Invalid date format. Supported formats are %Y-%m-%d and %Y%m%d.")
+    return date.today().toordinal() - create_date_ordinal(create_date)
 
-    time_diff = datetime.now() - create_date
 
-    return time_diff.days
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def create_date_ordinal(create_date: str) -> int:
+    """Returns the proleptic Gregorian ordinal of a creation date in the form of %Y-%m-%d or %Y%m%d. Memoized."""
+    for date_format in ("%Y-%m-%d", "%Y%m%d"):
+        try:
+            return convert_str_to_dateobj(create_date, date_format).toordinal()
+        except ValueError:
+            continue
+    raise ValueError("Invalid date format. Supported formats are %Y-%m-%d and %Y%m%d.")
 
 
 def get_threat_component(components, threat_type):
@@ -47,44 +57,30 @@ def get_average_risk_score(domains):
     """
     Gets average domain risk score for Investigate and Detect result sets
     Args:
-        domains: Investigate or Detect result set
+        domains: Investigate or Detect result set, or any iterable of their results
 
     Returns: average risk score
     """
-    count = 0
-    total = 0
-    for d in domains:
-        # investigate result set
-        if "risk_score" in d.get("domain_risk", {}):
-            count += 1
-            total += d.get("domain_risk").get("risk_score")
-        # detect result set
-        elif d.get("risk_score"):
-            count += 1
-            total += d.get("risk_score")
+    from domaintools.stats import risk_score_statistics
 
-    return total // count if count else None
+    # Investigate risk scores are all averaged, Detect ones only when set and not 0
+    scored = (d for d in domains if "risk_score" in (d.get("domain_risk") or {}) or d.get("risk_score"))
+    statistics = risk_score_statistics(scored, percentiles=(), bins=None)
+    return statistics["sum"] // statistics["count"] if statistics["count"] else None
 
 
 def get_average_age(domains):
     """
     Gets average domain age for Investigate and Detect result sets
     Args:
-        domains: Investigate or Detect result set
+        domains: Investigate or Detect result set, or any iterable of their results
 
     Returns: average age
     """
-    count = 0
-    total = 0
-    for d in domains:
-        if isinstance(d.get("create_date"), dict) and d.get("create_date").get("value"):
-            count += 1
-            total += get_domain_age(d.get("create_date").get("value"))
-        elif isinstance(d.get("create_date"), int):
-            count += 1
-            total += get_domain_age(str(d.get("create_date")))
+    from domaintools.stats import age_statistics
 
-    return total // count if count else None
+    statistics = age_statistics(domains, percentiles=(), bins=None)
+    return statistics["sum"] // statistics["count"] if statistics["count"] else None
 
 
 def prune_data(data_obj):
@@ -170,10 +166,64 @@ def get_pivots(data_obj, name, return_data=None, count=0, pivot_threshold=500):
         return return_data
 
 
+def _is_iso(string_date: str, date_format: str) -> bool:
+    """Whether string_date is laid out exactly as date_format, one of ISO_DATE_FORMATS, so fromisoformat() agrees"""
+    if date_format == "%Y-%m-%d":
+        return len(string_date) == 10 and string_date[4] == string_date[7] == "-"
+    return (
+        len(string_date) == 26
+        and string_date[4] == string_date[7] == "-"
+        and string_date[10] == "T"
+        and string_date[19] == "."
+    )
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_iso_date(string_date: str, date_format: str) -> datetime:
+    if _is_iso(string_date, date_format):
+        try:
+            return datetime.fromisoformat(string_date)
+        except ValueError:
+            pass
+    # anything fromisoformat() does not take (e.g. fewer digits of microseconds) is left to strptime
+    return datetime.strptime(string_date, date_format)
+
+
 def convert_str_to_dateobj(string_date: str, date_format: Optional[str] = "%Y-%m-%d") -> datetime:
+    """Parses string_date with date_format. The ISO_DATE_FORMATS of the Iris results are parsed with fromisoformat()
+    and memoized, as the same dates repeat across a result set."""
+    if date_format in ISO_DATE_FORMATS:
+        return _parse_iso_date(string_date, date_format)
     return datetime.strptime(string_date, date_format)
 
 
+def datetime_ordinal(value: Union[date, datetime]) -> int:
+    """Returns the number of microseconds from 0001-01-01 to a date (at midnight) or a naive datetime.
+
+    Comparing these integers gives the same answer as comparing the dates and datetimes themselves, only faster.
+    """
+    ordinal = value.toordinal() * MICROSECONDS_PER_DAY
+    if isinstance(value, datetime):
+        ordinal += ((value.hour * 60 + value.minute) * 60 + value.second) * 1000000 + value.microsecond
+    return ordinal
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def date_ordinal(string_date: str, date_format: Optional[str] = "%Y-%m-%d") -> int:
+    """Returns datetime_ordinal() of string_date, parsed with convert_str_to_dateobj(). Memoized."""
+    return datetime_ordinal(convert_str_to_dateobj(string_date, date_format))
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def iso_ordinal(string_date: str) -> Optional[int]:
+    """Returns datetime_ordinal() of an ISO 8601 date or timestamp of any precision, or None if it is not one.
+    The time zone of timestamps is ignored. Memoized."""
+    try:
+        return datetime_ordinal(datetime.fromisoformat(string_date.replace("Z", "+00:00")))
+    except (AttributeError, ValueError):
+        return None
+
+
 def validate_feeds_parameters(params):
     sessionID = params.get("sessionID")
     after = params.get("after")
@@ -1,13 +1,7 @@
 """Adds async capabilities to the base product object"""
 
-import asyncio
-
-from copy import deepcopy
-from httpx import AsyncClient
-
 from domaintools.base_results import Results
 from domaintools.constants import RTTF_PRODUCTS_LIST, OutputFormat, HEADER_ACCEPT_KEY_CSV_FORMAT
-from domaintools.exceptions import ServiceUnavailableException
 
 
 class _AIter(object):
@@ -48,38 +42,42 @@ class AsyncResults(Results):
         if self.product in ["iris-investigate", "iris-enrich", "iris-detect-escalate-domains"]:
             post_data = self.kwargs.copy()
             post_data.update(self.api.extra_request_params)
-            results = await session.post(url=self.url, data=post_data, headers=headers)
+            return await session.post(url=self.url, data=post_data, headers=headers)
         elif self.product in ["iris-detect-manage-watchlist-domains"]:
             patch_data = self.kwargs.copy()
-            patch_data.update(self.api.extra_request_params, headers=headers)
-            results = await session.patch(url=self.url, json=patch_data)
+            patch_data.update(self.api.extra_request_params)
+            return await session.patch(url=self.url, json=patch_data, headers=headers)
         else:
             parameters = session_params_and_headers.get("parameters")
-            results = await session.get(url=self.url, params=parameters, headers=headers, **self.api.extra_request_params)
-        if results:
+            return await session.get(url=self.url, params=parameters, headers=headers, **self.api.extra_request_params)
+
+    async def _send_async_request(self, session):
+        limiter = self._rate_limiter()
+        if limiter is not None:
+            await limiter.wait_async()
+        return await self._make_async_request(session)
+
+    async def _acoalesced(self, send):
+        """Returns await send(), or the response of the identical request already in flight on this event loop"""
+        key = self._flight_key()
+        return await (send() if key is None else self.api.single_flight.ado(key, send))
+
+    async def __awaitable__(self):
+        if self._data is None and not self._load_cached():
+            session = self.api.async_client
+            results = await self._acoalesced(
+                lambda: self.api.retry_policy.call_async(
+                    lambda: self._send_async_request(session), idempotent=self._is_idempotent()
+                )
+            )
             self.setStatus(results.status_code, results)
             if self.kwargs.get("format", "json") == "json":
                 self._data = results.json()
             else:
-                self._data = results.text()
+                self._data = results.text
 
             self.check_limit_exceeded()
-
-    async def __awaitable__(self):
-        if self._data is None:
-
-            async with AsyncClient(verify=self.api.verify_ssl, proxy=self.api.proxy_url, timeout=None) as session:
-                wait_time = self._wait_time()
-                if wait_time is None and self.api:
-                    try:
-                        await self._make_async_request(session)
-                    except ServiceUnavailableException:
-                        await asyncio.sleep(60)
-                        self._wait_time()
-                        await self._make_async_request(session)
-                else:
-                    await asyncio.sleep(wait_time)
-                    await self._make_async_request(session)
+            self._store_cached()
 
         return self
 
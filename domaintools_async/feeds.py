@@ -0,0 +1,98 @@
+"""Consumes several Real Time Threat Feeds at once on a single event loop"""
+
+import asyncio
+
+from typing import NamedTuple
+
+from domaintools.constants import RTTF_PRODUCTS_CMD_MAPPING
+from domaintools.ndjson import DEFAULT_CHUNK_SIZE
+
+# the API methods of the feeds, e.g. "nod" or "domaindiscovery"
+FEED_COMMANDS = tuple(sorted(set(RTTF_PRODUCTS_CMD_MAPPING.values())))
+
+_DONE = object()
+
+
+class FeedRecord(NamedTuple):
+    """A decoded record tagged with the feed (API method name) it came from"""
+
+    feed: str
+    record: dict
+
+
+class MultiFeedConsumer:
+    """Streams several feeds concurrently over the pooled AsyncClient of the API and merges their records:
+
+        async with API(USER_NAME, KEY) as api:
+            feeds = {"nod": {"sessionID": "my-session"}, "noh": {"sessionID": "my-session"}}
+            async for feed, record in MultiFeedConsumer(api, feeds):
+                ...
+
+    `feeds` maps the name of each feed method (see FEED_COMMANDS) to its parameters, or lists the feed names when
+    they all share the parameters given as keyword arguments.
+
+    Each feed is read by its own task. A feed may have up to `max_pending` batches of records (the records decoded
+    from one chunk of its stream) waiting to be consumed: after that its task stops reading, so a fast feed can not
+    fill the memory while the consumer is busy with another one. 206 responses of sessions are followed and the
+    iteration ends once every feed is exhausted. The first error raised by a feed cancels the others and is re-raised.
+    """
+
+    def __init__(
+        self,
+        api,
+        feeds,
+        max_pending=4,
+        backend=None,
+        compressed=True,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        **parameters,
+    ):
+        if isinstance(feeds, str):
+            feeds = [feeds]
+        if not isinstance(feeds, dict):
+            feeds = {feed: parameters for feed in feeds}
+
+        unknown = [feed for feed in feeds if feed not in FEED_COMMANDS]
+        if unknown:
+            raise ValueError(f"Unknown feeds {unknown}, expected some of {FEED_COMMANDS}")
+
+        self.api = api
+        self.feeds = {feed: dict(feed_parameters) for feed, feed_parameters in feeds.items()}
+        self.max_pending = max_pending
+        self.record_options = {"backend": backend, "compressed": compressed, "chunk_size": chunk_size}
+
+    async def _produce(self, feed, results, queue, slots):
+        try:
+            async for records in results.arecord_batches(**self.record_options):
+                await slots.acquire()
+                queue.put_nowait((feed, records))
+        except Exception as error:
+            queue.put_nowait((feed, error))
+        finally:
+            queue.put_nowait((feed, _DONE))
+
+    async def __aiter__(self):
+        queue = asyncio.Queue()
+        slots = {feed: asyncio.Semaphore(self.max_pending) for feed in self.feeds}
+        tasks = [
+            asyncio.ensure_future(self._produce(feed, getattr(self.api, feed)(**parameters), queue, slots[feed]))
+            for feed, parameters in self.feeds.items()
+        ]
+
+        remaining = len(tasks)
+        try:
+            while remaining:
+                feed, records = await queue.get()
+                if records is _DONE:
+                    remaining -= 1
+                    continue
+                if isinstance(records, Exception):
+                    raise records
+
+                for record in records:
+                    yield FeedRecord(feed, record)
+                slots[feed].release()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
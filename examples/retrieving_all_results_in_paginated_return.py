@@ -3,9 +3,7 @@ from domaintools import API
 
 dt_api = API(USER_NAME, KEY)
 query = "SEARCH_HASH"
-response = dt_api.iris_investigate(search_hash=query)
-results = response['results']
-while response['has_more_results']:
-    response = dt_api.iris_investigate(search_hash=query, position=response['position'])
-    results.extend(response['results'])
-print(results)
+
+# iter_all() follows the `position` of every page, fetching the next page while the current one is processed
+for result in dt_api.iris_investigate(search_hash=query).iter_all():
+    print(result["domain"])
@@ -1,7 +1,10 @@
 """Configuration for test environment"""
 
+import httpx
 import pytest
 
+from domaintools import API
+
 
 @pytest.fixture
 def test_feeds_params():
@@ -12,3 +15,26 @@ def test_feeds_params():
         "output_format": "csv",
         "endpoint": "download",
     }
+
+
+@pytest.fixture
+def mock_api():
+    """Returns a factory of API instances answering their requests with an httpx MockTransport handler:
+
+    mock_api(handler, async_handler=None, username="test", key="test", **kwargs)
+
+    Sync requests go to handler and async ones to async_handler (by default the same handler). Rate limiting is off
+    unless rate_limit=True is passed along with any other API argument.
+    """
+    clients = []
+
+    def create(handler, async_handler=None, username="test", key="test", **kwargs):
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        async_client = httpx.AsyncClient(transport=httpx.MockTransport(async_handler or handler))
+        clients.append(client)
+        kwargs.setdefault("rate_limit", False)
+        return API(username, key, client=client, async_client=async_client, **kwargs)
+
+    yield create
+    for client in clients:
+        client.close()
@@ -2,6 +2,7 @@
 
 from os import environ
 
+import httpx
 import json
 import pytest
 
@@ -340,7 +341,7 @@ def test_exception_handling():
     with pytest.raises(exceptions.NotFoundException):
         api._results("i_made_this_product_up", "/v1/steianrstierstnrsiatiarstnsto.com/whois").data()
     with pytest.raises(exceptions.NotAuthorizedException):
-        API("notauser", "notakey").domain_search("amazon").data()
+        API("notauser", "notakey", rate_limit=False).domain_search("amazon").data()
     with pytest.raises(
         ValueError,
         match=r"Invalid value 'notahash' for 'key_sign_hash'. Values available are sha1,sha256",
@@ -731,3 +732,33 @@ def test_feeds_endpoint_should_raise_error_if_signed_api_key_is_used():
         feeds_api.domaindiscovery(after="-60")
 
     assert str(excinfo.value) == "Real Time Threat Feeds do not support signed API keys."
+
+
+def test_api_reuses_pooled_client():
+    pooled_api = API("test", "test", rate_limit=False, max_connections=10, keepalive_expiry=1.0)
+    client = pooled_api.client
+    assert client is pooled_api.client
+
+    pooled_api.close()
+    assert pooled_api._client is None
+    assert pooled_api.client is not client
+    pooled_api.close()
+
+
+def test_api_context_manager_leaves_a_given_client_open():
+    requested_urls = []
+
+    def handler(request):
+        requested_urls.append(str(request.url))
+        return httpx.Response(200, json={"response": {"risk_score": 0}})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    with API("test", "test", rate_limit=False, client=client) as pooled_api:
+        assert int(pooled_api.risk("google.com")) == 0
+        assert int(pooled_api.risk("amazon.com")) == 0
+        assert pooled_api.client is client
+
+    assert len(requested_urls) == 2
+    # the client belongs to the caller
+    assert not client.is_closed
+    client.close()
@@ -1,8 +1,10 @@
 """Tests async interaction support for DomainTools APIs"""
 
 import asyncio
+import httpx
 import pytest
 
+from domaintools import API
 from tests.settings import api, vcr
 
 
@@ -48,3 +50,86 @@ async def test_async_simple_await_post():
 async def test_async_simple_await_patch():
     detect_results = await api.iris_detect_manage_watchlist_domains(watchlist_domain_ids=["gae08rdVWG"], state="watched")
     assert detect_results["watchlist_domains"][0]["state"] == "watched"
+
+
+@pytest.mark.asyncio
+async def test_async_results_share_pooled_client():
+    requested_domains = []
+
+    async def handler(request):
+        requested_domains.append(request.url.params["domain"])
+        return httpx.Response(200, json={"response": {"risk_score": 0}})
+
+    async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with API("test", "test", rate_limit=False, async_client=async_client) as pooled_api:
+
+        async def risk(domain):
+            return await pooled_api.risk(domain)
+
+        results = await asyncio.gather(*(risk(domain) for domain in ("a.com", "b.com", "c.com")))
+        assert [int(result) for result in results] == [0, 0, 0]
+        assert pooled_api.async_client is async_client
+
+    assert sorted(requested_domains) == ["a.com", "b.com", "c.com"]
+    # the client belongs to the caller
+    assert not async_client.is_closed
+    await async_client.aclose()
+
+
+def test_aclose_closes_every_client_the_api_created():
+    pooled_api = API("test", "test", rate_limit=False)
+    client = pooled_api.client
+
+    async def use_and_close():
+        async_client = pooled_api.async_client
+        await pooled_api.aclose()
+        return async_client
+
+    async_client = asyncio.run(use_and_close())
+    assert async_client.is_closed
+    assert client.is_closed
+    assert pooled_api.client is not client
+    pooled_api.close()
+
+
+def test_async_client_is_recreated_per_event_loop():
+    pooled_api = API("test", "test", rate_limit=False)
+
+    async def get_async_client():
+        return pooled_api.async_client, pooled_api.async_client
+
+    first, same = asyncio.run(get_async_client())
+    second, _ = asyncio.run(get_async_client())
+    assert first is same
+    assert first is not second
+
+
+def test_async_client_of_a_closed_event_loop_is_closed():
+    pooled_api = API("test", "test", rate_limit=False)
+
+    async def get_async_client():
+        async_client = pooled_api.async_client
+        await asyncio.sleep(0)
+        # the loop is kept alive, as it is by the connections of a client that was used
+        return async_client, asyncio.get_running_loop()
+
+    first, first_loop = asyncio.run(get_async_client())
+    assert not first.is_closed
+
+    second, _ = asyncio.run(get_async_client())
+    assert first.is_closed
+    assert not second.is_closed
+    assert len(pooled_api._async_clients) == 1
+
+
+def test_close_closes_the_async_clients_of_closed_event_loops():
+    pooled_api = API("test", "test", rate_limit=False)
+
+    async def get_async_client():
+        return pooled_api.async_client, asyncio.get_running_loop()
+
+    async_client, loop = asyncio.run(get_async_client())
+    pooled_api.close()
+
+    assert async_client.is_closed
+    assert len(pooled_api._async_clients) == 0
@@ -0,0 +1,188 @@
+"""Tests the response cache"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from domaintools.cache import MemoryCache, ResponseCache, SQLiteCache, request_key
+
+
+@pytest.fixture
+def counting_api(mock_api):
+    """Returns a factory of (api, calls) pairs, calls being the requests the api sent"""
+
+    def create(cache, always_sign_api_key=False, username="test", key="test"):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"response": {"risk_score": 10, "call": len(calls)}})
+
+        api = mock_api(handler, username=username, key=key, cache=cache, always_sign_api_key=always_sign_api_key)
+        return api, calls
+
+    return create
+
+
+def test_request_key_ignores_volatile_parameters_and_order():
+    key = request_key("risk", "https://api/v1/risk", {"domain": "a.com", "api_username": "u", "api_key": "k"})
+
+    assert key == request_key(
+        "risk",
+        "https://api/v1/risk",
+        {"api_username": "u", "domain": "a.com", "timestamp": "2024-01-01T00:00:00Z", "signature": "abc"},
+    )
+    assert key != request_key("risk", "https://api/v1/risk", {"domain": "b.com", "api_username": "u"})
+    assert key != request_key("reputation", "https://api/v1/risk", {"domain": "a.com", "api_username": "u"})
+
+
+def test_request_key_tells_credentials_apart():
+    parameters = {"domain": "a.com", "api_username": "u"}
+
+    assert request_key("risk", "https://api/v1/risk", parameters, credential=("u", "k")) != request_key(
+        "risk", "https://api/v1/risk", parameters, credential=("u", "other")
+    )
+
+
+def test_repeated_lookups_are_served_from_the_cache(counting_api):
+    api, calls = counting_api(cache=True, always_sign_api_key=True)
+
+    assert api.risk("example.com")["call"] == 1
+    assert api.risk("example.com")["call"] == 1
+    assert api.risk("other.com")["call"] == 2
+    assert len(calls) == 2
+
+
+def test_no_cache_by_default(counting_api):
+    api, calls = counting_api(cache=None)
+
+    api.risk("example.com").data()
+    api.risk("example.com").data()
+    assert len(calls) == 2
+
+
+def test_cached_data_is_not_shared_between_results(counting_api):
+    api, calls = counting_api(cache=True)
+
+    api.risk("example.com")["risk_score"] = 99
+    assert api.risk("example.com")["risk_score"] == 10
+
+
+def test_status_is_served_from_the_cache(counting_api):
+    api, calls = counting_api(cache=True)
+
+    api.risk("example.com").data()
+    assert api.risk("example.com").status == 200
+    assert len(calls) == 1
+
+
+def test_async_lookups_share_the_cache(counting_api):
+    api, calls = counting_api(cache=True)
+    api.risk("example.com").data()
+
+    async def lookup():
+        return await api.risk("example.com")
+
+    assert asyncio.run(lookup())["call"] == 1
+    assert len(calls) == 1
+
+
+def test_products_with_zero_ttl_and_feeds_are_not_cached():
+    cache = MemoryCache(ttls={"risk": 0})
+
+    assert not cache.caches("risk")
+    assert cache.caches("whois")
+    assert not cache.caches("newly-observed-domains-feed-(api)")
+    assert not cache.caches("account-information")
+
+
+def test_incomplete_cache_cannot_be_created():
+    class NoClear(ResponseCache):
+        def _load(self, key):
+            return None
+
+        def _store(self, key, payload, ttl):
+            pass
+
+    with pytest.raises(TypeError):
+        NoClear()
+
+
+def test_memory_cache_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("domaintools.cache.time.monotonic", lambda: now[0])
+    cache = MemoryCache(ttl=60, ttls={})
+
+    cache.set("key", {"a": 1}, "risk")
+    now[0] += 59
+    assert cache.get("key") == {"a": 1}
+    now[0] += 1
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", 1, "risk")
+    cache.set("b", 2, "risk")
+    cache.get("a")
+    cache.set("c", 3, "risk")
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_memory_cache_is_bounded_by_size():
+    cache = MemoryCache(max_bytes=25)
+    for key in "abcd":
+        cache.set(key, "x" * 8, "risk")
+
+    assert len(cache) == 2
+    assert cache.get("d") == "x" * 8
+
+
+def test_sqlite_cache_persists_between_instances(tmp_path):
+    path = tmp_path / "cache.db"
+    cache = SQLiteCache(path)
+    cache.set("key", {"response": {"risk_score": 10}}, "risk")
+    cache.close()
+
+    assert SQLiteCache(path).get("key") == {"response": {"risk_score": 10}}
+
+
+def test_credentials_sharing_a_cache_file_do_not_share_responses(tmp_path, counting_api):
+    path = tmp_path / "cache.db"
+    first, first_calls = counting_api(cache=SQLiteCache(path))
+    same, same_calls = counting_api(cache=SQLiteCache(path))
+    other_user, other_user_calls = counting_api(cache=SQLiteCache(path), username="other")
+    other_key, other_key_calls = counting_api(cache=SQLiteCache(path), key="other")
+
+    for api in (first, same, other_user, other_key):
+        api.risk("example.com").data()
+
+    assert (len(first_calls), len(same_calls), len(other_user_calls), len(other_key_calls)) == (1, 0, 1, 1)
+
+
+def test_sqlite_cache_expires_and_evicts(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("domaintools.cache.time.time", lambda: now[0])
+    cache = SQLiteCache(tmp_path / "cache.db", ttl=60, ttls={}, max_entries=2)
+
+    for key in "abc":
+        now[0] += 1
+        cache.set(key, key, "risk")
+    assert len(cache) == 2
+    assert cache.get("a") is None
+
+    now[0] += 60
+    assert cache.get("c") is None
+
+
+@pytest.mark.parametrize("cache_factory", [MemoryCache, lambda: None])
+def test_api_accepts_cache_instances(cache_factory, counting_api):
+    cache = cache_factory()
+    api, calls = counting_api(cache=cache)
+
+    assert api.cache is cache
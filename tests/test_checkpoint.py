@@ -0,0 +1,156 @@
+"""Tests checkpointing how far a feed has been consumed"""
+
+import json
+
+import httpx
+import pytest
+
+from domaintools.checkpoint import CheckpointStore, FeedCheckpoint, FileCheckpointStore, MemoryCheckpointStore
+
+
+def record(second, domain):
+    return {"timestamp": f"2024-09-23T22:20:{second:02d}Z", "domain": domain}
+
+
+def ndjson(records):
+    return b"".join(json.dumps(item).encode("utf-8") + b"\n" for item in records)
+
+
+@pytest.fixture
+def feed_api(mock_api):
+    """Returns a factory of APIs serving the given (status, records) responses in order and keeping the query of
+    every request"""
+
+    def create(responses, requests):
+        def handler(request):
+            requests.append(dict(request.url.params))
+            status, records = responses.pop(0)
+            return httpx.Response(status, content=ndjson(records))
+
+        return mock_api(handler)
+
+    return create
+
+
+def test_file_store_round_trips_checkpoints(tmp_path):
+    store = FileCheckpointStore(tmp_path / "feeds.checkpoint")
+    assert store.load("nod:session") is None
+
+    store.save("nod:session", FeedCheckpoint(session_id="session", timestamp="2024-09-23T22:20:04Z", records=3))
+    store.save("noh:session", FeedCheckpoint(session_id="session", partial=True))
+
+    checkpoint = FileCheckpointStore(tmp_path / "feeds.checkpoint").load("nod:session")
+    assert (checkpoint.session_id, checkpoint.timestamp, checkpoint.records) == ("session", "2024-09-23T22:20:04Z", 3)
+    assert store.load("noh:session").partial is True
+
+    store.delete("nod:session")
+    assert store.load("nod:session") is None
+    assert [path.name for path in tmp_path.iterdir()] == ["feeds.checkpoint"]
+
+
+def test_incomplete_store_cannot_be_created():
+    class LoadOnly(CheckpointStore):
+        def load(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        LoadOnly()
+
+
+def test_checkpointed_feed_follows_the_session_and_commits(feed_api):
+    requests = []
+    store = MemoryCheckpointStore()
+    responses = [(206, [record(1, "a.com"), record(2, "b.com")]), (200, [record(3, "c.com")])]
+    api = feed_api(responses, requests)
+
+    feed = api.nod(sessionID="session").checkpointed(store, commit_every=2, compressed=False)
+
+    assert [item["domain"] for item in feed] == ["a.com", "b.com", "c.com"]
+    checkpoint = store.load("newly-observed-domains-feed-(api):session")
+    assert (checkpoint.records, checkpoint.timestamp) == (3, "2024-09-23T22:20:03Z")
+    assert (checkpoint.partial, checkpoint.in_flight) == (False, False)
+    assert [params.get("sessionID") for params in requests] == ["session", "session"]
+
+
+def test_checkpointed_feed_resumes_after_stopping_mid_response(feed_api):
+    store = MemoryCheckpointStore()
+    first_response = [record(4, "a.com"), record(2, "b.com"), record(3, "c.com"), record(1, "d.com")]
+    requests = []
+    api = feed_api([(200, first_response)], requests)
+
+    for item in api.nod(sessionID="session").checkpointed(store):
+        if item["domain"] == "c.com":
+            break  # c.com was handed out but is not acknowledged
+
+    assert store.load("newly-observed-domains-feed-(api):session").in_flight is True
+
+    # the replay serves the stopped response again (and newer data), the session continues after the stopped response
+    replay = first_response + [record(5, "e.com")]
+    session = [record(5, "e.com"), record(6, "f.com")]
+    requests = []
+    api = feed_api([(200, replay), (200, session)], requests)
+
+    resumed = [item["domain"] for item in api.nod(sessionID="session").checkpointed(store)]
+
+    assert resumed == ["c.com", "d.com", "e.com", "f.com"]
+    assert "sessionID" not in requests[0] and requests[0]["after"] == "2024-09-23T22:19:04Z"
+    assert requests[1]["sessionID"] == "session"
+    assert store.load("newly-observed-domains-feed-(api):session").records == 6
+
+
+def test_commit_acknowledges_the_current_record(feed_api):
+    store = MemoryCheckpointStore()
+    api = feed_api([(200, [record(1, "a.com"), record(2, "b.com")])], [])
+
+    feed = api.nod(sessionID="session").checkpointed(store)
+    for item in feed:
+        feed.commit()
+        break
+
+    assert store.load("newly-observed-domains-feed-(api):session").records == 1
+
+
+@pytest.mark.parametrize("store", [MemoryCheckpointStore(), None])
+def test_checkpoint_keys_default_to_the_product_and_session(store, tmp_path, feed_api):
+    store = store or FileCheckpointStore(tmp_path / "checkpoint.json")
+    feed = feed_api([], []).noh(sessionID="abc").checkpointed(store)
+
+    assert feed.key == "newly-observed-hosts-feed-(api):abc"
+    assert feed.checkpoint.session_id == "abc"
+
+
+def test_saved_fingerprints_are_bounded_and_the_replay_starts_at_the_oldest(feed_api):
+    store = MemoryCheckpointStore()
+    first_response = [record(second, f"{second}.com") for second in range(1, 6)]
+    api = feed_api([(200, first_response)], [])
+
+    for item in api.nod(sessionID="session").checkpointed(store, max_recent=2):
+        if item["domain"] == "5.com":
+            break
+
+    checkpoint = store.load("newly-observed-domains-feed-(api):session")
+    assert [entry[0] for entry in checkpoint.recent] == ["2024-09-23T22:20:03Z", "2024-09-23T22:20:04Z"]
+
+    requests = []
+    api = feed_api([(200, first_response[2:]), (200, [])], requests)
+
+    resumed = [item["domain"] for item in api.nod(sessionID="session").checkpointed(store, max_recent=2)]
+
+    assert resumed == ["5.com"]
+    assert requests[0]["after"] == "2024-09-23T22:20:03Z"
+
+
+def test_file_store_reads_the_file_only_when_it_changed(tmp_path, monkeypatch):
+    store = FileCheckpointStore(tmp_path / "feeds.checkpoint")
+    store.save("nod:session", FeedCheckpoint(session_id="session", records=1))
+
+    def no_read(*args, **kwargs):
+        raise AssertionError("the checkpoint file was read again")
+
+    monkeypatch.setattr("domaintools.checkpoint.json.load", no_read)
+    store.save("nod:session", FeedCheckpoint(session_id="session", records=2))
+    assert store.load("nod:session").records == 2
+    monkeypatch.undo()
+
+    FileCheckpointStore(tmp_path / "feeds.checkpoint").save("noh:session", FeedCheckpoint(session_id="other"))
+    assert store.load("noh:session").session_id == "other"
@@ -0,0 +1,127 @@
+"""Tests streaming feed output from the CLI to files"""
+
+import gzip
+import io
+import json
+
+import httpx
+import pytest
+
+from domaintools.cli.api import DTCLICommand
+from domaintools.cli.writers import FeedWriter, parse_size
+
+RECORDS = [{"timestamp": "2024-09-23T22:20:04Z", "domain": f"domain{index}.com"} for index in range(100)]
+LINES = [json.dumps(record).encode("utf-8") + b"\n" for record in RECORDS]
+CONTENT = b"".join(LINES)
+
+
+def chunks_of(data, size):
+    return [data[start : start + size] for start in range(0, len(data), size)]
+
+
+def test_parse_size():
+    assert parse_size(None) is None
+    assert parse_size("500000") == 500000
+    assert parse_size("64KB") == 64 * 1024
+    assert parse_size("1.5mb") == 1536 * 1024
+    assert parse_size("2GB") == 2 * 1024**3
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_writes_plain_file(tmp_path):
+    with FeedWriter(path=tmp_path / "nod.jsonl") as writer:
+        for chunk in chunks_of(CONTENT, 333):
+            writer.write(chunk)
+
+    assert writer.paths == [tmp_path / "nod.jsonl"]
+    assert (tmp_path / "nod.jsonl").read_bytes() == CONTENT
+
+
+def test_gzip_round_trip(tmp_path):
+    with FeedWriter(path=tmp_path / "nod.jsonl", compression="gzip") as writer:
+        for chunk in chunks_of(CONTENT, 333):
+            writer.write(chunk)
+
+    assert writer.paths == [tmp_path / "nod.jsonl.gz"]
+    assert gzip.decompress(writer.paths[0].read_bytes()) == CONTENT
+
+
+def test_zstd_round_trip(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    with FeedWriter(path=tmp_path / "nod.jsonl", compression="zstd") as writer:
+        writer.write(CONTENT)
+
+    assert writer.paths == [tmp_path / "nod.jsonl.zst"]
+    with zstandard.ZstdDecompressor().stream_reader(writer.paths[0].open("rb")) as reader:
+        assert reader.read() == CONTENT
+
+
+def test_rotates_by_size_at_line_boundaries(tmp_path):
+    with FeedWriter(path=tmp_path / "nod.jsonl.gz", compression="gzip", rotate_bytes=1000) as writer:
+        for chunk in chunks_of(CONTENT, 333):
+            writer.write(chunk)
+
+    assert len(writer.paths) > 1
+    assert writer.paths[0].name == "nod.00000.jsonl.gz"
+    contents = [gzip.decompress(path.read_bytes()) for path in writer.paths]
+    assert b"".join(contents) == CONTENT
+    for content in contents:
+        assert content.endswith(b"\n")
+        for line in content.splitlines():
+            json.loads(line)
+
+
+def test_rotates_by_time(tmp_path, monkeypatch):
+    clock = iter(range(0, 1000, 10))
+    monkeypatch.setattr("domaintools.cli.writers.time.monotonic", lambda: next(clock))
+    with FeedWriter(path=tmp_path / "nod.jsonl", rotate_seconds=15) as writer:
+        for line in LINES[:3]:
+            writer.write(line)
+
+    assert [path.name for path in writer.paths] == ["nod.00000.jsonl", "nod.00001.jsonl"]
+    assert b"".join(path.read_bytes() for path in writer.paths) == b"".join(LINES[:3])
+
+
+def test_writes_to_fileobj_without_closing_it():
+    output = io.BytesIO()
+    with FeedWriter(fileobj=output, compression="gzip") as writer:
+        writer.write_line('{"domain": "example.com"}')
+
+    assert not output.closed
+    assert gzip.decompress(output.getvalue()) == b'{"domain": "example.com"}\n'
+
+
+def test_rejects_invalid_options(tmp_path):
+    with pytest.raises(ValueError):
+        FeedWriter(path=tmp_path / "nod.jsonl", compression="bz2")
+    with pytest.raises(ValueError):
+        FeedWriter(fileobj=io.BytesIO(), rotate_bytes=1000)
+    with pytest.raises(ValueError):
+        FeedWriter()
+
+
+def test_cli_streams_feed_to_out_file(tmp_path, monkeypatch, mock_api):
+    def handler(request):
+        return httpx.Response(200, content=CONTENT)
+
+    api = mock_api(handler)
+    monkeypatch.setattr(DTCLICommand, "_get_api", classmethod(lambda cls, *args: api))
+    out_file = tmp_path / "nod.jsonl"
+
+    DTCLICommand.run(
+        name="nod",
+        params={
+            "user": "test",
+            "key": "test",
+            "output_format": "jsonl",
+            "endpoint": "feed",
+            "after": "-60",
+            "out_file": str(out_file),
+            "compression": "gzip",
+            "rotate_size": None,
+            "rotate_interval": None,
+        },
+    )
+
+    assert gzip.decompress((tmp_path / "nod.jsonl.gz").read_bytes()) == CONTENT
@@ -0,0 +1,67 @@
+"""Tests the columnar export of Iris results"""
+
+from datetime import date
+
+import httpx
+import pytest
+
+from domaintools.columns import IRIS_COLUMNS, to_arrow, to_columns
+from tests.responses import iris_investigate_data
+
+RESULTS = iris_investigate_data.domaintools()["results"] + iris_investigate_data.int_chase()["results"]
+
+
+def test_columns_flatten_the_iris_fields():
+    columns = to_columns(RESULTS)
+
+    assert list(columns) == list(IRIS_COLUMNS)
+    assert columns["domain"] == ["domaintools.com", "int-chase.com"]
+    assert columns["risk_score"] == [0, 71]
+    assert columns["create_date"] == [date(1998, 8, 2), date(2020, 10, 13)]
+    assert columns["registrar"] == ["ENOM, INC.", "NAMECHEAP INC"]
+    assert columns["registrar_count"] == [4040099, 18144909]
+    assert columns["ip"] == [["199.30.228.112"], ["99.83.154.118"]]
+    assert columns["ip_count"] == [[4], [9194795]]
+    assert len(columns["name_server"][0]) == len(columns["name_server_count"][0]) == 4
+
+
+def test_missing_values_are_none_and_missing_counts_zero():
+    columns = to_columns(iter([{"domain": "a.com", "registrar": {"value": "", "count": 0}}]))
+
+    assert columns["risk_score"] == [None]
+    assert columns["create_date"] == [None]
+    assert columns["registrar"] == [None]
+    assert columns["registrar_count"] == [0]
+    assert columns["ip"] == [[]]
+
+
+def test_numpy_columns():
+    numpy = pytest.importorskip("numpy")
+
+    columns = to_columns(RESULTS + [{"domain": "a.com"}], numpy=True)
+
+    assert columns["risk_score"].dtype == numpy.float64
+    assert numpy.isnan(columns["risk_score"][2])
+    assert columns["create_date"][0] == numpy.datetime64("1998-08-02")
+    assert numpy.isnat(columns["create_date"][2])
+    assert columns["registrar_count"].sum() == 4040099 + 18144909
+
+
+def test_arrow_table():
+    pyarrow = pytest.importorskip("pyarrow")
+
+    table = to_arrow(RESULTS)
+
+    assert table.num_rows == 2
+    assert table.schema.field("create_date").type == pyarrow.date32()
+    assert table.column("risk_score").to_pylist() == [0, 71]
+
+
+def test_results_export_their_columns(mock_api):
+    def handler(request):
+        return httpx.Response(200, json={"response": {"results": RESULTS, "missing_domains": []}})
+
+    api = mock_api(handler)
+
+    assert api.iris_enrich("domaintools.com", "int-chase.com").to_columns()["risk_score"] == [0, 71]
+    assert api.iris_investigate(search_hash="hash").to_columns()["domain"] == ["domaintools.com", "int-chase.com"]
@@ -217,3 +217,18 @@ class TestApiEndpointDecorator:
             call_kwargs = mock_validate.call_args[1]
 
             assert call_kwargs.get("parameters") == {"name": "test-name"}
+
+    def test_validation_can_be_disabled(self, mock_client):
+        """
+        Test that validate_requests=False on the instance skips validation entirely.
+        """
+
+        @api_endpoint(spec_name="v1", path="/users", methods="POST")
+        def create_user(body=None):
+            return "Unchecked"
+
+        mock_client.validate_requests = False
+        with patch("domaintools.request_validator.RequestValidator.validate") as mock_validate:
+            assert create_user(mock_client, body={"bad": "data"}) == "Unchecked"
+
+            mock_validate.assert_not_called()
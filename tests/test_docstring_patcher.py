@@ -3,7 +3,9 @@ import types
 
 from unittest.mock import Mock
 
-from domaintools.docstring_patcher import DocstringPatcher
+from domaintools.api import API
+from domaintools.decorators import api_endpoint
+from domaintools.docstring_patcher import DocstringPatcher, LazyDocstring
 
 
 class TestDocstringPatcher:
@@ -349,3 +351,44 @@ class TestDocstringPatcher:
 
         # Test that no *parsing* error was logged
         assert "Error parsing spec" not in caplog.text
+
+    def test_class_methods_are_patched_lazily_once(self, monkeypatch):
+        """
+        Tests that class level patching defers the docstring until first lookup and then
+        leaves the plain function in the class.
+        """
+
+        class Client:
+            specs = {}
+
+            @api_endpoint(spec_name="iris", path="/v1/iris-investigate/", methods="post")
+            def investigate(self, domains=None):
+                """Investigates domains."""
+                return (self, domains)
+
+        built = []
+        build_docstring = DocstringPatcher.build_docstring
+        monkeypatch.setattr(
+            DocstringPatcher,
+            "build_docstring",
+            lambda patcher, *args: built.append(args) or build_docstring(patcher, *args),
+        )
+        self.patcher.patch_class(Client)
+        assert isinstance(vars(Client)["investigate"], LazyDocstring)
+        assert not built
+
+        client = Client()
+        assert "--- Operation: POST /v1/iris-investigate/ ---" in client.investigate.__doc__
+        assert client.investigate(domains="domaintools.com") == (client, "domaintools.com")
+        assert Client().investigate.__func__ is vars(Client)["investigate"]
+        assert len(built) == 1
+
+    def test_api_instances_use_the_class_methods(self):
+        """
+        Tests that API instances are not patched one by one.
+        """
+        api = API("test", "test", rate_limit=False)
+
+        assert "iris_investigate" not in vars(api)
+        assert api.iris_investigate.__func__ is API.iris_investigate
+        assert "--- Operation: POST /v1/iris-investigate/ ---" in API.iris_investigate.__doc__
@@ -0,0 +1,134 @@
+"""Tests the bulk download of feed files"""
+
+import gzip
+import json
+
+import httpx
+import pytest
+
+from domaintools.download import download_files, iter_lines, iter_records, manifest_files
+
+RECORDS = [{"timestamp": "2024-09-23T22:20:04Z", "domain": f"domain{index}.com"} for index in range(200)]
+CONTENT = b"".join(json.dumps(record).encode("utf-8") + b"\n" for record in RECORDS)
+FILES = {
+    "/nod/part-1.jsonl": CONTENT[:4000],
+    "/nod/part-2.jsonl.gz": gzip.compress(CONTENT[4000:]),
+}
+
+
+def s3_handler(requests, ranges=True):
+    def handler(request):
+        if request.url.path.startswith("/v1/download/"):
+            files = [f"https://s3.example.com{path}?signature=abc" for path in FILES]
+            return httpx.Response(200, json={"response": {"download_name": "nod", "files": files}})
+
+        content = FILES[request.url.path]
+        requests.append((request.url.path, request.headers.get("Range")))
+        if not ranges or "Range" not in request.headers:
+            return httpx.Response(200, content=content)
+
+        start, end = (int(value) for value in request.headers["Range"][len("bytes=") :].split("-"))
+        return httpx.Response(
+            206,
+            content=content[start : end + 1],
+            headers={"Content-Range": f"bytes {start}-{end}/{len(content)}"},
+        )
+
+    return handler
+
+
+def test_manifest_files_accepts_urls_and_objects():
+    manifest = {"response": {"files": ["https://a/1.jsonl", {"url": "https://a/2.jsonl"}]}}
+
+    assert manifest_files(manifest) == ["https://a/1.jsonl", "https://a/2.jsonl"]
+
+
+def test_download_fetches_every_file_by_range(tmp_path, mock_api):
+    requests = []
+    results = mock_api(s3_handler(requests)).nod(endpoint="download", after=-60)
+
+    paths = results.download(tmp_path, part_size=1000)
+
+    assert [path.name for path in paths] == ["part-1.jsonl", "part-2.jsonl"]
+    assert b"".join(path.read_bytes() for path in paths) == CONTENT
+    ranges = [header for path, header in requests if path == "/nod/part-1.jsonl"]
+    assert ranges[0] == "bytes=0-0"
+    assert sorted(ranges[1:]) == sorted(f"bytes={start}-{start + 999}" for start in range(0, 4000, 1000))
+
+
+def test_download_falls_back_to_whole_files(tmp_path, mock_api):
+    requests = []
+    api = mock_api(s3_handler(requests, ranges=False))
+
+    paths = download_files(api, [f"https://s3.example.com{path}" for path in FILES], tmp_path, decompress=False)
+
+    assert [path.name for path in paths] == ["part-1.jsonl", "part-2.jsonl.gz"]
+    assert gzip.decompress(paths[1].read_bytes()) == CONTENT[4000:]
+
+
+def test_files_of_the_same_name_are_downloaded_to_distinct_paths(tmp_path, mock_api):
+    contents = {"/nod/a/part.jsonl": b"a" * 3000, "/nod/b/part.jsonl": b"b" * 3000}
+
+    def handler(request):
+        content = contents[request.url.path]
+        start, end = (int(value) for value in request.headers["Range"][len("bytes=") :].split("-"))
+        return httpx.Response(
+            206, content=content[start : end + 1], headers={"Content-Range": f"bytes {start}-{end}/{len(content)}"}
+        )
+
+    urls = [f"https://s3.example.com{path}" for path in contents] + ["https://s3.example.com/nod/a/part.jsonl?v=2"]
+    paths = download_files(mock_api(handler), urls, tmp_path, part_size=1000)
+
+    assert [path.name for path in paths] == ["nod_a_part.jsonl", "nod_b_part.jsonl", "2_nod_a_part.jsonl"]
+    assert [path.read_bytes() for path in paths] == [b"a" * 3000, b"b" * 3000, b"a" * 3000]
+
+
+def test_whole_files_are_retried(tmp_path, mock_api):
+    requests = []
+    handler = s3_handler(requests, ranges=False)
+    failures = []
+
+    def flaky_handler(request):
+        if "Range" not in request.headers and not failures:
+            failures.append(request)
+            return httpx.Response(503)
+        return handler(request)
+
+    api = mock_api(flaky_handler)
+    api.retry_policy.backoff_base = 0
+
+    paths = download_files(api, ["https://s3.example.com/nod/part-1.jsonl"], tmp_path)
+
+    assert len(failures) == 1
+    assert paths[0].read_bytes() == CONTENT[:4000]
+
+
+def test_manifest_is_only_available_for_downloads(mock_api):
+    results = mock_api(s3_handler([])).nod(after=-60)
+
+    with pytest.raises(ValueError):
+        results.manifest()
+
+
+@pytest.mark.parametrize("backend", ["json", None])
+def test_iter_records_reads_memory_mapped_files(tmp_path, backend):
+    path = tmp_path / "feed.jsonl"
+    path.write_bytes(CONTENT + b"\n" + b'{"last": true}')
+
+    assert list(iter_records(path, backend)) == RECORDS + [{"last": True}]
+
+
+def test_iter_lines_hands_out_views_valid_until_the_next_line(tmp_path):
+    path = tmp_path / "feed.jsonl"
+    path.write_bytes(b"a\nb\n")
+
+    lines = iter_lines(path)
+    first = next(lines)
+    assert first.tobytes() == b"a"
+    assert bytes(next(lines)) == b"b"
+    with pytest.raises(ValueError):
+        first.tobytes()
+    lines.close()
+
+    (tmp_path / "empty.jsonl").write_bytes(b"")
+    assert list(iter_lines(tmp_path / "empty.jsonl")) == []
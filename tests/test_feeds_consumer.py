@@ -0,0 +1,80 @@
+"""Tests consuming several feeds at once"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from domaintools.exceptions import NotAuthorizedException
+from domaintools_async.feeds import FEED_COMMANDS, MultiFeedConsumer
+
+
+def ndjson(feed, count, start=0):
+    return b"".join(json.dumps({"feed": feed, "index": index}).encode() + b"\n" for index in range(start, start + count))
+
+
+def test_feed_commands_come_from_the_product_mapping(mock_api):
+    assert FEED_COMMANDS == (
+        "domaindiscovery",
+        "domainhotlist",
+        "domainrdap",
+        "nad",
+        "nod",
+        "noh",
+        "realtime_domain_risk",
+    )
+    with pytest.raises(ValueError):
+        MultiFeedConsumer(mock_api(None), ["nod", "whois"], sessionID="session")
+
+
+@pytest.mark.asyncio
+async def test_merges_tagged_records_of_every_feed(mock_api):
+    tranches = {"nod": [206, 200], "noh": [200]}
+
+    def handler(request):
+        feed = request.url.path.strip("/").split("/")[-1]
+        status = tranches[feed].pop(0)
+        return httpx.Response(status, content=ndjson(feed, 3, start=3 * len(tranches[feed])))
+
+    consumer = MultiFeedConsumer(mock_api(handler), ["nod", "noh"], sessionID="session", compressed=False)
+    records = [(feed, record["index"]) async for feed, record in consumer]
+
+    assert sorted(records) == sorted([("noh", index) for index in range(3)] + [("nod", index) for index in range(6)])
+    assert [index for feed, index in records if feed == "nod"] == [3, 4, 5, 0, 1, 2]
+    assert tranches == {"nod": [], "noh": []}
+
+
+@pytest.mark.asyncio
+async def test_a_busy_consumer_holds_back_each_feed(monkeypatch, mock_api):
+    from domaintools.results import FeedsResults
+
+    read = {}
+
+    async def arecord_batches(self, **options):
+        feed = self.url.strip("/").split("/")[-1]
+        for index in range(50):
+            read[feed] = index + 1
+            yield [{"feed": feed, "index": index}]
+
+    monkeypatch.setattr(FeedsResults, "arecord_batches", arecord_batches)
+    consumer = MultiFeedConsumer(mock_api(None), ["nod", "nad"], after=-60, max_pending=2)
+    stream = consumer.__aiter__()
+    await stream.__anext__()
+    await asyncio.sleep(0.05)
+
+    # max_pending batches handed over (including the one being consumed) plus one read while waiting for a slot
+    assert read == {"nod": 3, "nad": 3}
+    assert len([record async for record in stream]) == 99
+
+
+@pytest.mark.asyncio
+async def test_the_error_of_a_feed_is_raised(mock_api):
+    def handler(request):
+        if "nod" in request.url.path:
+            return httpx.Response(403, json={"error": {"message": "Not authorized"}})
+        return httpx.Response(200, content=ndjson("noh", 2))
+
+    with pytest.raises(NotAuthorizedException):
+        async for _ in MultiFeedConsumer(mock_api(handler), ["nod", "noh"], after=-60):
+            pass
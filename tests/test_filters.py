@@ -1,6 +1,10 @@
 import unittest
 
+import pytest
+
 from domaintools.filters import (
+    F,
+    CompiledFilters,
     DTResultFilter,
     filter_by_riskscore,
     filter_by_expire_date,
@@ -98,3 +102,120 @@ class DTFiltersTest(unittest.TestCase):
 
         assert len(results) == 1
         assert results[0]["domain"] == "int-chase.com"
+
+    def test_compiled_filters_match_the_filters_applied_in_sequence(self):
+        filters = [
+            filter_by_riskscore(threshold=10),
+            filter_by_expire_date("2024-02-24", lookup_type="before"),
+            filter_by_date_updated_after(date="2023-01-01"),
+            filter_by_field(field="ga4", filter_type="exclude"),
+        ]
+        results = self.dt_res_filter._result_set
+
+        sequential = results
+        for dt_filter in filters:
+            sequential = dt_filter(sequential)
+
+        assert CompiledFilters(filters)(results) == sequential
+
+    def test_compiled_filters_skip_filters_without_arguments(self):
+        filters = CompiledFilters(
+            [
+                filter_by_riskscore(threshold=None),
+                filter_by_expire_date(None),
+                filter_by_date_updated_after(date=None),
+                filter_by_field(field="ga4", filter_type="include"),
+                filter_by_field(field=None, filter_type="exclude"),
+            ]
+        )
+        results = self.dt_res_filter._result_set
+
+        assert not filters
+        assert filters(results) is results
+
+    def test_compiled_filters_visit_each_result_once(self):
+        visits = []
+
+        class Visited(dict):
+            def get(self, key, default=None):
+                visits.append(self["domain"])
+                return super().get(key, default)
+
+        results = [Visited(result) for result in self.dt_res_filter._result_set]
+        filters = CompiledFilters([filter_by_riskscore(threshold=0), filter_by_field(field="ga4", filter_type="exclude")])
+
+        filters(results)
+
+        assert sorted(set(visits)) == sorted(result["domain"] for result in results)
+        assert len(visits) <= 2 * len(results)
+
+    def test_compiled_filters_iterate_lazily(self):
+        filters = CompiledFilters([filter_by_riskscore(threshold=69)])
+        results = iter(self.dt_res_filter._result_set * 1000)
+
+        first = next(filters.iter(results))
+
+        assert first["domain"] == "int-chase.com"
+        assert next(results, None) is not None
+
+
+class FilterExpressionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.results = (
+            iris_investigate_data.domaintools()["results"]
+            + iris_investigate_data.int_chase()["results"]
+        )
+
+    def domains(self, expression):
+        return [result["domain"] for result in expression(self.results)]
+
+    def test_expressions_match_the_keyword_filters(self):
+        assert self.domains(F.risk_score > 69) == ["int-chase.com"]
+        assert self.domains(F.expiration_date > "2024-02-24") == ["domaintools.com"]
+        assert self.domains(F.data_updated_timestamp > "2023-07-24") == ["int-chase.com"]
+
+    def test_expressions_combine(self):
+        assert self.domains((F.risk_score > 69) | (F.tld == "com")) == ["domaintools.com", "int-chase.com"]
+        assert self.domains((F.risk_score > 69) & (F.active == False)) == ["int-chase.com"]
+        assert self.domains(~(F.risk_score > 69)) == ["domaintools.com"]
+
+    def test_fields_with_several_values_match_any_of_them(self):
+        assert self.domains(F.ip == "199.30.228.112") == ["domaintools.com"]
+        assert self.domains(F["registrar"].isin(["ENOM, INC.", "unknown"])) == ["domaintools.com"]
+
+    def test_missing_fields_never_match(self):
+        assert self.domains(F.ga4 == "") == []
+        assert self.domains(F.not_a_field != 1) == []
+
+    def test_unparenthesized_comparisons_are_rejected(self):
+        with pytest.raises(TypeError):
+            F.risk_score > 70 & F.tld == "com"
+        with pytest.raises(TypeError):
+            (F.risk_score > 70) and (F.tld == "com")
+
+    def test_pushdown_sends_the_conditions_iris_supports(self):
+        expression = (
+            (F.risk_score > 70)
+            & (F.create_date >= "2024-01-01")
+            & (F.create_date < "2025-01-01")
+            & (F.expiration_date == "2026-01-01")
+            & (F.active == True)
+            & (F.tld == "com")
+        )
+
+        parameters, remainder = expression.pushdown()
+
+        assert parameters == {
+            "create_date": ">=2024-01-01",
+            "expiration_date": "2026-01-01",
+            "active": "true",
+            "tld": "com",
+        }
+        assert repr(remainder) == "(F.risk_score > 70) & (F.create_date < '2025-01-01')"
+
+    def test_pushdown_keeps_reserved_and_unsupported_conditions_local(self):
+        assert (F.tld == "com").pushdown(reserved=["tld"])[0] == {}
+        assert (F.expiration_date < "2026-01-01").pushdown()[0] == {}
+        assert ((F.tld == "com") | (F.tld == "net")).pushdown()[0] == {}
+        assert (F.tld == "com").pushdown() == ({"tld": "com"}, None)
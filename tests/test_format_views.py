@@ -0,0 +1,93 @@
+"""Tests rendering results in other formats from the response already fetched"""
+
+import csv
+import io
+import json
+
+import httpx
+import pytest
+
+from domaintools.cli.api import DTCLICommand
+
+INVESTIGATE = {
+    "response": {
+        "limit_exceeded": False,
+        "results_count": 2,
+        "results": [
+            {"domain": "one.com", "domain_risk": {"risk_score": 10}, "ip": [{"address": {"value": "192.0.2.1"}}]},
+            {"domain": "two.com", "domain_risk": {"risk_score": 90}, "active": True},
+        ],
+    }
+}
+
+
+@pytest.fixture
+def counting_api(mock_api):
+    """Returns a factory of (api, calls) pairs serving payload, calls being the requests the api sent"""
+
+    def create(payload=INVESTIGATE):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if request.url.params.get("format") in ("xml", "html"):
+                return httpx.Response(200, text="<response></response>")
+            return httpx.Response(200, json=payload)
+
+        return mock_api(handler), calls
+
+    return create
+
+
+def test_json_view_reuses_the_results(counting_api):
+    api, calls = counting_api()
+    results = api.risk("one.com")
+    results.data()
+
+    assert results.json is results
+    assert str(results.json)
+    assert len(calls) == 1
+
+
+def test_jsonl_and_csv_are_rendered_from_the_json_response(counting_api):
+    api, calls = counting_api()
+    results = api.iris_investigate(domains=["one.com", "two.com"])
+    results.data()
+
+    lines = str(results.jsonl).splitlines()
+    rows = list(csv.DictReader(io.StringIO(str(results.csv))))
+
+    assert [json.loads(line)["domain"] for line in lines] == ["one.com", "two.com"]
+    assert [row["domain"] for row in rows] == ["one.com", "two.com"]
+    assert json.loads(rows[1]["domain_risk"]) == {"risk_score": 90}
+    assert rows[0]["active"] == "" and rows[1]["active"] == "True"
+    assert len(calls) == 1
+
+
+def test_responses_without_items_are_a_single_record(counting_api):
+    api, calls = counting_api({"response": {"domain": "one.com", "risk_score": 10}})
+
+    assert json.loads(str(api.domain_profile("one.com").jsonl)) == {"domain": "one.com", "risk_score": 10}
+
+
+def test_server_formats_do_not_change_the_results(counting_api):
+    api, calls = counting_api()
+    results = api.risk("one.com", format="json")
+
+    assert str(results.xml) == "<response></response>"
+    assert results.kwargs["format"] == "json"
+    assert [request.url.params.get("format") for request in calls] == ["xml"]
+
+
+def test_cli_writes_local_formats_to_the_file(monkeypatch, counting_api):
+    api, calls = counting_api()
+    monkeypatch.setattr(DTCLICommand, "_get_api", classmethod(lambda cls, *args: api))
+    out = io.StringIO()
+
+    DTCLICommand.run(
+        name="iris_investigate",
+        params={"user": "test", "key": "test", "format": "csv", "out_file": out, "domains": "one.com,two.com"},
+    )
+
+    assert [row["domain"] for row in csv.DictReader(io.StringIO(out.getvalue()))] == ["one.com", "two.com"]
+    assert len(calls) == 1
@@ -0,0 +1,60 @@
+"""Guards the cold start cost of importing the library and the CLI with `python -X importtime`"""
+
+import subprocess
+import sys
+
+from pathlib import Path
+
+# the modules that made up most of the cold start cost (165ms of it) before they were deferred. Their absence is
+# asserted rather than a time budget, which would depend on the speed and load of the machine running the tests.
+HEAVY_MODULES = ("httpx", "yaml", "rich", "typer", "asyncio")
+
+
+def import_profile(statement):
+    """Returns {module: cumulative microseconds} for the modules imported by statement in a fresh interpreter"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        profile[module.strip()] = int(cumulative_us)
+    return profile
+
+
+def heavy_imports(profile):
+    return sorted(module for module in profile if module.split(".")[0] in HEAVY_MODULES)
+
+
+def test_importing_the_package_is_nearly_free():
+    profile = import_profile("import domaintools")
+
+    assert "domaintools.api" not in profile
+    assert heavy_imports(profile) == []
+
+
+def test_importing_the_api_defers_the_http_stack():
+    profile = import_profile("from domaintools import API")
+
+    assert "domaintools.api" in profile
+    assert heavy_imports(profile) == []
+
+
+def test_building_the_cli_defers_the_api():
+    profile = import_profile("from domaintools.cli import dt_cli")
+
+    assert "domaintools.api" not in profile
+    assert "httpx" not in profile and "yaml" not in profile
+
+
+def test_constructing_the_api_does_not_parse_yaml_twice():
+    statement = "from domaintools import API; API('user', 'key', rate_limit=False)"
+    # the first construction may build the spec cache, the next process must not need yaml at all
+    import_profile(statement)
+    assert "yaml" not in import_profile(statement)
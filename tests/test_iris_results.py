@@ -0,0 +1,320 @@
+"""Tests streaming Iris results across pages"""
+
+import threading
+from datetime import datetime, timedelta
+from itertools import count
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from domaintools.filters import F
+
+
+def page_handler(pages, requested_positions, gate=None):
+    """Serves the given pages of results, chained together by their `position`"""
+
+    def handler(request):
+        position = parse_qs(request.content.decode("utf-8")).get("position", [None])[0]
+        requested_positions.append(position)
+        index = 0 if position is None else int(position.split("-")[1])
+        if gate is not None and index > 0:
+            gate.wait(timeout=5)
+        has_more_results = index + 1 < len(pages)
+        results = [{"domain": domain, "domain_risk": {"risk_score": score}} for domain, score in pages[index]]
+        return httpx.Response(
+            200,
+            json={
+                "response": {
+                    "results": results,
+                    "results_count": len(pages[index]),
+                    "has_more_results": has_more_results,
+                    "position": f"page-{index + 1}" if has_more_results else None,
+                    "missing_domains": [],
+                }
+            },
+        )
+
+    return handler
+
+
+PAGES = [[("a.com", 10), ("b.com", 90)], [("c.com", 95)], [("d.com", 5), ("e.com", 99)]]
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_iter_all_follows_position(prefetch, mock_api):
+    positions = []
+    api = mock_api(page_handler(PAGES, positions))
+
+    domains = [result["domain"] for result in api.iris_investigate(search_hash="hash").iter_all(prefetch=prefetch)]
+
+    assert domains == ["a.com", "b.com", "c.com", "d.com", "e.com"]
+    assert positions == [None, "page-1", "page-2"]
+
+
+def test_iter_all_filters_every_page(mock_api):
+    api = mock_api(page_handler(PAGES, []))
+
+    results = api.iris_investigate(search_hash="hash", risk_score=50)
+    assert [result["domain"] for result in results] == ["b.com"]
+    assert [result["domain"] for result in results.iter_all()] == ["b.com", "c.com", "e.com"]
+
+
+def test_where_is_pushed_down_and_the_rest_filters_every_page(mock_api):
+    requests = []
+
+    def handler(request):
+        requests.append(parse_qs(request.content.decode("utf-8")))
+        return page_handler(PAGES, [])(request)
+
+    api = mock_api(handler)
+
+    results = api.iris_investigate(
+        search_hash="hash", where=(F.risk_score > 50) & (F.tld == "com") & (F.create_date < "2024-01-01")
+    )
+
+    assert [result["domain"] for result in results.iter_all()] == ["b.com", "c.com", "e.com"]
+    assert requests[0]["tld"] == ["com"]
+    assert requests[0]["create_date"] == ["<2024-01-01"]
+    assert "risk_score" not in requests[0]
+
+
+@pytest.fixture
+def ticking_clock(monkeypatch):
+    """Moves the clock the requests are signed with a minute forward every time it is read"""
+    minutes = count()
+
+    class TickingDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2026, 1, 1, tzinfo=tz) + timedelta(minutes=next(minutes))
+
+    monkeypatch.setattr("domaintools.api.datetime", TickingDatetime)
+
+
+def test_iter_all_signs_every_page(ticking_clock, mock_api):
+    requests = []
+
+    def handler(request):
+        requests.append(parse_qs(request.content.decode("utf-8")))
+        return page_handler(PAGES, [])(request)
+
+    api = mock_api(handler)
+
+    assert len(list(api.iris_investigate(search_hash="hash").iter_all())) == 5
+    assert len({request["timestamp"][0] for request in requests}) == 3
+    assert len({request["signature"][0] for request in requests}) == 3
+
+
+def test_iter_all_prefetches_the_next_page(mock_api):
+    positions = []
+    gate = threading.Event()
+    api = mock_api(page_handler(PAGES, positions, gate=gate))
+
+    stream = api.iris_investigate(search_hash="hash").iter_all()
+    assert next(stream)["domain"] == "a.com"
+    # the second page is already in flight while the first one is being consumed
+    for _ in range(100):
+        if len(positions) == 2:
+            break
+        threading.Event().wait(0.01)
+    assert positions == [None, "page-1"]
+
+    gate.set()
+    assert [result["domain"] for result in stream] == ["b.com", "c.com", "d.com", "e.com"]
+
+
+@pytest.mark.asyncio
+async def test_aiter_all_follows_position(mock_api):
+    positions = []
+    api = mock_api(page_handler(PAGES, positions))
+
+    domains = [result["domain"] async for result in api.iris_investigate(search_hash="hash").aiter_all()]
+
+    assert domains == ["a.com", "b.com", "c.com", "d.com", "e.com"]
+    assert positions == [None, "page-1", "page-2"]
+    await api.aclose()
+
+
+def detect_handler(total_count, requested_offsets, page_limit=100, delay=None):
+    """Serves a watchlist of total_count domains paginated by offset and limit"""
+
+    def handler(request):
+        offset = int(request.url.params.get("offset", 0))
+        limit = int(request.url.params.get("limit", page_limit))
+        requested_offsets.append(offset)
+        if delay is not None:
+            delay(offset)
+        domains = [{"domain": f"domain-{index}.com"} for index in range(offset, min(offset + limit, total_count))]
+        return httpx.Response(
+            200,
+            json={"watchlist_domains": domains, "total_count": total_count, "offset": offset, "limit": limit},
+        )
+
+    return handler
+
+
+def test_detect_iter_all_fans_out_remaining_offsets(mock_api):
+    offsets = []
+    in_flight, peak = [0], [0]
+    lock = threading.Lock()
+    released = threading.Event()
+
+    def delay(offset):
+        if offset == 0:
+            return
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+            if in_flight[0] == 3:
+                released.set()
+        released.wait(timeout=5)
+        with lock:
+            in_flight[0] -= 1
+
+    api = mock_api(detect_handler(1050, offsets, delay=delay))
+    results = api.iris_detect_watched_domains(monitor_id="monitor")
+
+    domains = [domain["domain"] for domain in results.iter_all(concurrency=3)]
+
+    assert domains == [f"domain-{index}.com" for index in range(1050)]
+    assert sorted(offsets) == list(range(0, 1100, 100))
+    assert peak[0] == 3
+
+
+def test_detect_iter_all_uses_the_limit_of_the_first_page(mock_api):
+    offsets = []
+    api = mock_api(detect_handler(120, offsets, page_limit=50))
+
+    domains = list(api.iris_detect_new_domains(monitor_id="monitor", include_domain_data=True).iter_all())
+
+    assert len(domains) == 120
+    assert sorted(offsets) == [0, 50, 100]
+
+
+def test_detect_iter_all_signs_every_page(ticking_clock, mock_api):
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.params)
+        return detect_handler(250, [])(request)
+
+    api = mock_api(handler)
+
+    assert len(list(api.iris_detect_watched_domains(monitor_id="monitor").iter_all())) == 250
+    assert len({params["timestamp"] for params in requests}) == 3
+    assert len({params["signature"] for params in requests}) == 3
+
+
+@pytest.mark.asyncio
+async def test_detect_aiter_all_yields_in_order(mock_api):
+    offsets = []
+    api = mock_api(detect_handler(450, offsets))
+    results = api.iris_detect_ignored_domains(monitor_id="monitor")
+
+    domains = [domain["domain"] async for domain in results.aiter_all(concurrency=4)]
+
+    assert domains == [f"domain-{index}.com" for index in range(450)]
+    assert sorted(offsets) == [0, 100, 200, 300, 400]
+    await api.aclose()
+
+
+def enrich_handler(requested_chunks, delay=None):
+    """Enriches every requested domain, except the ones starting with `missing`"""
+    lock = threading.Lock()
+    in_flight = [0, 0]  # current, maximum
+
+    def handler(request):
+        domains = parse_qs(request.content.decode("utf-8"))["domain"][0].split(",")
+        with lock:
+            requested_chunks.append(domains)
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        if delay:
+            threading.Event().wait(delay)
+        with lock:
+            in_flight[0] -= 1
+        found = [domain for domain in domains if not domain.startswith("missing")]
+        return httpx.Response(
+            200,
+            json={
+                "response": {
+                    "results": [{"domain": domain, "domain_risk": {"risk_score": len(domain)}} for domain in found],
+                    "results_count": len(found),
+                    "missing_domains": [domain for domain in domains if domain.startswith("missing")],
+                    "limit_exceeded": False,
+                }
+            },
+        )
+
+    handler.in_flight = in_flight
+    return handler
+
+
+def test_enrich_fans_out_large_domain_iterables(mock_api):
+    chunks = []
+    handler = enrich_handler(chunks, delay=0.05)
+    api = mock_api(handler)
+    domains = (f"domain{index}.com" if index % 50 else f"missing{index}.com" for index in range(250))
+
+    results = api.iris_enrich(domains)
+    streamed = [result["domain"] for result in results.iter_all()]
+
+    assert sorted(len(chunk) for chunk in chunks) == [50, 100, 100]
+    assert handler.in_flight[1] > 1
+    assert streamed == [f"domain{index}.com" for index in range(250) if index % 50]
+    assert results.missing_domains == {f"missing{index}.com" for index in range(0, 250, 50)}
+
+
+def test_enrich_merges_chunks_when_read_as_a_response(mock_api):
+    api = mock_api(enrich_handler([]))
+
+    results = api.iris_enrich([f"domain{index}.com" for index in range(150)], risk_score=12)
+
+    assert results.status == 200
+    assert results["results_count"] == 50  # only domain100.com ... domain149.com score over 12
+    assert results["missing_domains"] == []
+    assert len(list(results.iter_all())) == 50
+
+
+def test_chunked_results_stream_to_csv(mock_api):
+    import csv
+    import io
+
+    api = mock_api(enrich_handler([]))
+    out = io.StringIO()
+
+    api.iris_enrich([f"domain{index}.com" for index in range(150)]).write_csv(out)
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+
+    assert [row["domain"] for row in rows] == [f"domain{index}.com" for index in range(150)]
+    with pytest.raises(ValueError):
+        api.iris_enrich([f"domain{index}.com" for index in range(150)]).xml
+
+
+def test_small_domain_lists_keep_a_single_request(mock_api):
+    chunks = []
+    api = mock_api(enrich_handler(chunks))
+
+    assert len(api.iris_enrich("a.com", "b.com")) == 2
+    assert len(api.iris_investigate(domains="c.com,missing.com")) == 1
+    assert chunks == [["a.com", "b.com"], ["c.com", "missing.com"]]
+
+
+@pytest.mark.asyncio
+async def test_investigate_domains_aiter_all_yields_in_order(mock_api):
+    api = mock_api(enrich_handler([]))
+    domains = [f"domain{index}.com" for index in range(230)]
+
+    results = api.iris_investigate(domains=iter(domains))
+
+    assert [result["domain"] async for result in results.aiter_all(concurrency=2)] == domains
+
+
+def test_cli_source_file_is_not_capped(tmp_path):
+    from domaintools.cli.api import DTCLICommand
+
+    source = tmp_path / "domains.txt"
+    source.write_text("\n".join(f"domain{index}.com" for index in range(1000)))
+
+    assert len(DTCLICommand._get_domains_from_source(str(source)).split(",")) == 1000
@@ -0,0 +1,85 @@
+"""Tests decoding feed records from newline delimited JSON streams"""
+
+import gzip
+import json
+
+import httpx
+import pytest
+
+from domaintools.ndjson import get_decoder, iter_records
+
+RECORDS = [{"timestamp": f"2024-01-01T00:00:0{index}Z", "domain": f"domain{index}.com"} for index in range(6)]
+NDJSON = b"".join(json.dumps(record).encode("utf-8") + b"\n" for record in RECORDS)
+
+
+def split_every(data, size):
+    return [data[start : start + size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("backend", ["json", None])
+@pytest.mark.parametrize("size", [1, 7, 64, len(NDJSON)])
+def test_iter_records_joins_lines_split_across_chunks(size, backend):
+    assert list(iter_records(split_every(NDJSON, size), backend)) == RECORDS
+
+
+@pytest.mark.parametrize("backend", ["json", None])
+def test_iter_records_skips_blank_lines_and_decodes_the_last_line(backend):
+    chunks = [b'{"a": 1}\r\n\n  \n{"a"', b': "\xc3', b'\xa9"}']
+
+    assert list(iter_records(chunks, backend)) == [{"a": 1}, {"a": "\u00e9"}]
+
+
+@pytest.mark.parametrize("backend", ["json", None])
+def test_get_decoder_decodes_bytes(backend):
+    assert get_decoder(backend)(b'{"domain": "example.com"}') == {"domain": "example.com"}
+
+
+def test_get_decoder_rejects_unknown_backends():
+    with pytest.raises(ValueError):
+        get_decoder("pickle")
+
+
+def test_records_inflates_gzip_feeds(mock_api):
+    encodings = []
+
+    def handler(request):
+        encodings.append(request.headers["Accept-Encoding"])
+        return httpx.Response(200, content=gzip.compress(NDJSON), headers={"Content-Encoding": "gzip"})
+
+    results = mock_api(handler).nod(after=-60)
+
+    assert list(results.records(backend="json", chunk_size=16)) == RECORDS
+    assert encodings == ["gzip"]
+
+
+def test_records_follows_partial_responses_of_a_session(mock_api):
+    tranches = [(206, RECORDS[:3]), (200, RECORDS[3:])]
+
+    def handler(request):
+        status, records = tranches.pop(0)
+        return httpx.Response(status, content=b"\n".join(json.dumps(record).encode() for record in records))
+
+    results = mock_api(handler).nod(sessionID="session", after=-60)
+
+    assert list(results.records(compressed=False)) == RECORDS
+    assert tranches == []
+
+
+def test_chunks_keep_the_records_of_consecutive_responses_apart(mock_api):
+    tranches = [(206, RECORDS[:3]), (200, RECORDS[3:])]
+
+    def handler(request):
+        status, records = tranches.pop(0)
+        # no trailing newline after the last record of either response
+        return httpx.Response(status, content=b"\n".join(json.dumps(record).encode() for record in records))
+
+    results = mock_api(handler).nod(sessionID="session", after=-60)
+
+    assert b"".join(results.chunks(compressed=False, chunk_size=16)) == NDJSON
+
+
+def test_records_rejects_csv_feeds(mock_api):
+    results = mock_api(lambda request: httpx.Response(200)).nod(after=-60, output_format="csv")
+
+    with pytest.raises(ValueError):
+        next(results.records())
@@ -0,0 +1,281 @@
+"""Tests the rate limiters used to space out requests"""
+
+import asyncio
+import socketserver
+import threading
+
+import httpx
+import pytest
+
+from domaintools import API
+from domaintools.exceptions import NotAuthorizedException
+from domaintools.rate_limiter import FileBackend, MemoryBackend, RateLimitBackend, RateLimiter, RedisBackend
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_from_limits_without_limits_returns_none():
+    assert RateLimiter.from_limits(per_minute_limit=None, per_hour_limit=None) is None
+
+
+def test_from_limits_builds_one_window_per_limit():
+    limiter = RateLimiter.from_limits(per_minute_limit=120, per_hour_limit=3600)
+    assert limiter.windows == [(60.0, 120), (3600.0, 3600)]
+
+
+def test_rate_limiter_requires_a_window():
+    with pytest.raises(ValueError):
+        RateLimiter([])
+
+
+def test_burst_waits_for_the_window_to_slide():
+    clock = FakeClock()
+    limiter = RateLimiter.from_limits(per_minute_limit=3, backend=MemoryBackend(clock=clock))
+
+    assert [limiter.reserve() for _ in range(3)] == [0, 0, 0]
+    assert limiter.reserve() == pytest.approx(60)
+    clock.now += 10
+    assert limiter.reserve() == pytest.approx(50)
+
+    # the two requests sent at 60 seconds still count until 120
+    clock.now += 100
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(10)
+
+
+def test_any_rolling_window_admits_at_most_the_limit():
+    clock = FakeClock()
+    limiter = RateLimiter.from_limits(per_minute_limit=60, per_hour_limit=300, backend=MemoryBackend(clock=clock))
+
+    send_times = []
+    for second in range(3700):
+        clock.now = 1000.0 + second
+        # two requests a second, far more than the limits admit
+        send_times.extend(clock.now + limiter.reserve() for _ in range(2))
+
+    send_times.sort()
+    for index, sent in enumerate(send_times):
+        in_minute = sum(1 for other in send_times[index : index + 61] if other < sent + 60)
+        in_hour = sum(1 for other in send_times[index : index + 301] if other < sent + 3600)
+        assert in_minute <= 60
+        assert in_hour <= 300
+
+
+def test_most_restrictive_window_wins():
+    clock = FakeClock()
+    limiter = RateLimiter.from_limits(per_minute_limit=60, per_hour_limit=2, backend=MemoryBackend(clock=clock))
+
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(3600)
+
+
+def test_incomplete_backend_cannot_be_created():
+    class NoReserve(RateLimitBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        NoReserve()
+
+
+def test_concurrent_threads_reserve_distinct_slots():
+    clock = FakeClock()
+    limiter = RateLimiter([(1.0, 1)], backend=MemoryBackend(clock=clock))
+    reservations = []
+    lock = threading.Lock()
+
+    def reserve():
+        wait_for = limiter.reserve()
+        with lock:
+            reservations.append(wait_for)
+
+    threads = [threading.Thread(target=reserve) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(reservations) == [float(slot) for slot in range(20)]
+
+
+@pytest.mark.asyncio
+async def test_coroutines_wait_concurrently(monkeypatch):
+    limiter = RateLimiter([(60.0, 2)], backend=MemoryBackend(clock=FakeClock()))
+    sleep, sleeping, wake_up = asyncio.sleep, [], asyncio.Event()
+
+    async def fake_sleep(delay):
+        sleeping.append(delay)
+        await wake_up.wait()
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    waits = asyncio.ensure_future(asyncio.gather(*(limiter.wait_async() for _ in range(4))))
+    while len(sleeping) < 2:
+        await sleep(0)
+
+    # both coroutines over the burst sleep side by side rather than one after the other
+    assert sleeping == [60.0, 60.0]
+    wake_up.set()
+    assert sorted(await waits) == [0, 0, 60.0, 60.0]
+
+
+def test_limiters_share_budget_by_key():
+    backend = MemoryBackend(clock=FakeClock())
+    first = RateLimiter([(1.0, 1)], key="user-a:risk", backend=backend)
+    same_key = RateLimiter([(1.0, 1)], key="user-a:risk", backend=backend)
+    other_key = RateLimiter([(1.0, 1)], key="user-b:risk", backend=backend)
+
+    assert first.reserve() == 0
+    assert same_key.reserve() == 1.0
+    assert other_key.reserve() == 0
+
+
+def test_api_limits_are_scoped_per_instance():
+    first_api = API("user-a", "key", rate_limit=False)
+    second_api = API("user-b", "key", rate_limit=False)
+    first_api.limits["risk"] = None
+
+    assert "risk" not in second_api.limits
+    assert "limits" not in vars(API)
+
+
+def test_unknown_credential_fails_on_its_account_lookup(mock_api):
+    requested = []
+
+    def handler(request):
+        requested.append(request.url.path)
+        return httpx.Response(403, json={"error": {"code": 403, "message": "Not authorized"}})
+
+    api = mock_api(handler, username="notauser", key="notakey", rate_limit=True)
+
+    # a credential looks up its own limits before its first request
+    with pytest.raises(NotAuthorizedException):
+        api.domain_search("amazon").data()
+    assert requested == ["/v1/account"]
+
+
+def test_file_backend_shares_budget_between_instances(tmp_path):
+    clock = FakeClock()
+    # two backends over the same directory behave like two processes on one host
+    first = RateLimiter([(10.0, 2)], key="user:risk", backend=FileBackend(str(tmp_path), clock=clock))
+    second = RateLimiter([(10.0, 2)], key="user:risk", backend=FileBackend(str(tmp_path), clock=clock))
+
+    assert first.reserve() == 0
+    assert second.reserve() == 0
+    assert first.reserve() == pytest.approx(10.0)
+    assert second.reserve() == pytest.approx(10.0)
+    clock.now += 10
+    assert first.reserve() == pytest.approx(10.0)
+
+
+class RedisStandIn(socketserver.ThreadingTCPServer):
+    """A tiny in-process server speaking enough of the Redis protocol for the RedisBackend"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), RedisStandInHandler)
+        self.data = {}
+        self.lock = threading.Lock()
+
+
+class RedisStandInHandler(socketserver.StreamRequestHandler):
+    def read_command(self):
+        header = self.rfile.readline()
+        if not header:
+            return None
+        args = []
+        for _ in range(int(header[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2].decode("utf-8"))
+        return args
+
+    def execute(self, name, args):
+        data = self.server.data
+        if name == "GET":
+            value = data.get(args[0])
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value.encode("utf-8"))
+        if name == "SET":
+            if "NX" in args[2:] and args[0] in data:
+                return b"$-1\r\n"
+            data[args[0]] = args[1]
+            return b"+OK\r\n"
+        if name == "DEL":
+            return b":%d\r\n" % (data.pop(args[0], None) is not None)
+        if name in ("SELECT", "AUTH"):
+            return b"+OK\r\n"
+        return b"-ERR unknown command\r\n"
+
+    def handle(self):
+        while True:
+            command = self.read_command()
+            if command is None:
+                return
+            with self.server.lock:
+                reply = self.execute(command[0].upper(), command[1:])
+            self.wfile.write(reply)
+
+
+@pytest.fixture
+def redis_stand_in():
+    server = RedisStandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=["memory", "file", "redis"])
+def make_backend(request, tmp_path):
+    """Returns a factory of backends of each kind sharing one budget, as separate processes would"""
+    if request.param == "memory":
+        shared = {}
+        return lambda clock: shared.setdefault("backend", MemoryBackend(clock=clock))
+    if request.param == "file":
+        return lambda clock: FileBackend(str(tmp_path), clock=clock)
+
+    host, port = request.getfixturevalue("redis_stand_in").server_address
+    return lambda clock: RedisBackend(f"redis://{host}:{port}/1", clock=clock)
+
+
+def test_backends_admit_the_same_budget(make_backend):
+    clock = FakeClock()
+    first = RateLimiter.from_limits(per_minute_limit=3, key="user:risk", backend=make_backend(clock))
+    second = RateLimiter.from_limits(per_minute_limit=3, key="user:risk", backend=make_backend(clock))
+
+    assert [first.reserve(), second.reserve(), first.reserve()] == [0, 0, 0]
+    assert second.reserve() == pytest.approx(60)
+    clock.now += 10
+    assert first.reserve() == pytest.approx(50)
+    clock.now += 100
+    assert [second.reserve(), first.reserve()] == [0, pytest.approx(10)]
+
+
+def test_redis_backend_releases_its_lock(redis_stand_in):
+    host, port = redis_stand_in.server_address
+    limiter = RateLimiter([(20.0, 3)], key="user:risk", backend=RedisBackend(f"redis://{host}:{port}/1"))
+
+    assert limiter.reserve() == 0
+    assert list(redis_stand_in.data) == ["domaintools:rate-limit:user:risk"]
+
+
+@pytest.mark.asyncio
+async def test_blocking_backends_reserve_off_the_event_loop(tmp_path):
+    reserved_on = []
+
+    class RecordingFileBackend(FileBackend):
+        def reserve(self, key, windows):
+            reserved_on.append(threading.current_thread())
+            return super().reserve(key, windows)
+
+    limiter = RateLimiter([(10.0, 2)], backend=RecordingFileBackend(str(tmp_path)))
+
+    assert await limiter.wait_async() == 0
+    assert reserved_on and threading.current_thread() not in reserved_on
@@ -232,3 +232,28 @@ class TestRequestValidator:
         # We call POST, passing NO query params.
         # Since POST logic only checks body, this should NOT complain about missing 'id'.
         RequestValidator.validate(spec={}, path="/", method="POST", parameters={})
+
+    # =========================================================================
+    # 5. COMPILED PLANS
+    # =========================================================================
+
+    @patch("domaintools.docstring_patcher.DocstringPatcher.get_operation_details")
+    def test_plan_is_compiled_once_per_operation(self, mock_get_details):
+        """Test that the spec is only walked on the first call for a (spec, path, method)."""
+        mock_get_details.return_value = {
+            "query_params": [{"name": "page", "required": True, "type": "integer"}],
+            "request_body": None,
+        }
+        spec = {}
+
+        for page in range(3):
+            RequestValidator.validate(spec=spec, path="/test", method="GET", parameters={"page": page})
+        with pytest.raises(ValueError):
+            RequestValidator.validate(spec=spec, path="/test", method="get", parameters={"page": "1"})
+
+        mock_get_details.assert_called_once()
+
+        # another spec (or path) gets its own plan
+        RequestValidator.validate(spec={}, path="/test", method="GET", parameters={"page": 1})
+        RequestValidator.validate(spec=spec, path="/other", method="GET", parameters={"page": 1})
+        assert mock_get_details.call_count == 3
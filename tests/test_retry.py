@@ -0,0 +1,145 @@
+"""Tests the retry policy applied to transient API failures"""
+
+import httpx
+import pytest
+
+from domaintools.exceptions import ServiceUnavailableException
+from domaintools.retry import RetryPolicy
+
+
+def no_backoff(**kwargs):
+    return RetryPolicy(backoff_base=0, jitter=False, **kwargs)
+
+
+def flaky_handler(failures, failure=None, success=None):
+    """Returns a handler answering with `failure` for the first `failures` requests"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) <= failures:
+            if isinstance(failure, Exception):
+                raise failure
+            return failure or httpx.Response(503, json={"error": {"message": "unavailable"}})
+        return success or httpx.Response(200, json={"response": {"risk_score": 10}})
+
+    return handler, calls
+
+
+def test_backoff_grows_exponentially_up_to_the_cap():
+    policy = RetryPolicy(backoff_base=1, backoff_max=5, jitter=False)
+    assert [policy.get_delay(attempt) for attempt in range(1, 5)] == [1, 2, 4, 5]
+
+
+def test_jitter_stays_within_half_and_full_delay():
+    policy = RetryPolicy(backoff_base=4, jitter=True)
+    assert all(4 <= policy.get_delay(2) <= 8 for _ in range(50))
+
+
+def test_retry_after_takes_precedence():
+    policy = RetryPolicy(backoff_base=10, jitter=False)
+    assert policy.get_delay(1, httpx.Response(503, headers={"Retry-After": "2"})) == 2
+    past_date = httpx.Response(503, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+    assert policy.get_delay(1, past_date) == 0
+    assert policy.get_delay(1, httpx.Response(503, headers={"Retry-After": "soon"})) == 10
+
+
+def test_sync_request_is_retried_until_success(mock_api):
+    handler, calls = flaky_handler(failures=2)
+    policy = no_backoff()
+    api = mock_api(handler, retry_policy=policy)
+
+    assert api.risk("google.com")["risk_score"] == 10
+    assert len(calls) == 3
+    assert policy.stats == {"attempts": 3, "retries": 2, "exhausted": 0, "retries_by_reason": {"503": 2}}
+
+
+def test_sync_request_gives_up_after_max_attempts(mock_api):
+    handler, calls = flaky_handler(failures=5)
+    policy = no_backoff(max_attempts=2)
+    api = mock_api(handler, retry_policy=policy)
+
+    with pytest.raises(ServiceUnavailableException):
+        api.risk("google.com").data()
+    assert len(calls) == 2
+    assert policy.stats["exhausted"] == 1
+
+
+def test_elapsed_budget_stops_retries(mock_api):
+    handler, calls = flaky_handler(failures=1, failure=httpx.Response(503, headers={"Retry-After": "30"}))
+    policy = no_backoff(max_elapsed=10)
+    api = mock_api(handler, retry_policy=policy)
+
+    with pytest.raises(ServiceUnavailableException):
+        api.risk("google.com").data()
+    assert len(calls) == 1
+
+
+def test_timeouts_are_retried_and_other_errors_are_not(mock_api):
+    handler, calls = flaky_handler(failures=1, failure=httpx.ReadTimeout("timed out"))
+    policy = no_backoff()
+    api = mock_api(handler, retry_policy=policy)
+    assert api.risk("google.com")["risk_score"] == 10
+    assert policy.stats["retries_by_reason"] == {"ReadTimeout": 1}
+
+    handler, calls = flaky_handler(failures=1, failure=ValueError("bad"))
+    api = mock_api(handler, retry_policy=policy)
+    with pytest.raises(ValueError):
+        api.risk("google.com").data()
+    assert len(calls) == 1
+
+
+def test_timed_out_escalation_is_sent_once(mock_api):
+    handler, calls = flaky_handler(failures=1, failure=httpx.ReadTimeout("timed out"))
+    policy = no_backoff()
+    api = mock_api(handler, retry_policy=policy)
+
+    with pytest.raises(httpx.ReadTimeout):
+        api.iris_detect_escalate_domains(["abc"], "blocked").data()
+    assert len(calls) == 1
+    assert policy.stats["retries"] == 0
+
+
+def test_escalation_is_retried_when_it_could_not_connect(mock_api):
+    handler, calls = flaky_handler(
+        failures=1, failure=httpx.ConnectError("refused"), success=httpx.Response(200, json={"escalations": []})
+    )
+    api = mock_api(handler, retry_policy=no_backoff())
+
+    api.iris_detect_escalate_domains(["abc"], "blocked").data()
+    assert len(calls) == 2
+
+
+def test_client_errors_are_not_retried(mock_api):
+    not_found = httpx.Response(404, json={"error": {"message": "not found"}})
+    handler, calls = flaky_handler(failures=1, failure=not_found)
+    api = mock_api(handler, retry_policy=no_backoff())
+
+    with pytest.raises(Exception):
+        api.risk("google.com").data()
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_request_is_retried_until_success(mock_api):
+    handler, calls = flaky_handler(failures=2)
+    policy = no_backoff()
+    api = mock_api(handler, retry_policy=policy)
+
+    results = await api.risk("google.com")
+    assert results["risk_score"] == 10
+    assert len(calls) == 3
+    assert policy.stats["retries"] == 2
+    await api.aclose()
+
+
+def test_feeds_stream_is_retried_before_yielding(mock_api):
+    handler, calls = flaky_handler(
+        failures=1,
+        failure=httpx.Response(502, text="bad gateway"),
+        success=httpx.Response(200, content=b'{"domain": "a.com"}\n{"domain": "b.com"}\n'),
+    )
+    api = mock_api(handler, retry_policy=no_backoff())
+
+    assert list(api.nod(after="-60").response()) == ['{"domain": "a.com"}', '{"domain": "b.com"}']
+    assert len(calls) == 2
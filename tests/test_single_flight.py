@@ -0,0 +1,145 @@
+"""Tests the coalescing of identical requests in flight"""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from domaintools.concurrency import SingleFlight
+
+
+@pytest.fixture
+def slow_api(mock_api):
+    """Returns a factory of (api, calls) pairs whose requests take a while, calls being the requests sent"""
+
+    def create(coalesce_requests=True):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            time.sleep(0.2)
+            return httpx.Response(200, json={"response": {"risk_score": 10}})
+
+        async def async_handler(request):
+            calls.append(request)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"response": {"risk_score": 10}})
+
+        return mock_api(handler, async_handler, coalesce_requests=coalesce_requests), calls
+
+    return create
+
+
+async def fetched(results):
+    return await results
+
+
+def in_threads(function, count):
+    results = [None] * count
+
+    def run(index):
+        results[index] = function()
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_identical_requests_in_threads_share_one_call(slow_api):
+    api, calls = slow_api()
+
+    scores = in_threads(lambda: api.risk("same.com")["risk_score"], 10)
+
+    assert scores == [10] * 10
+    assert len(calls) == 1
+
+
+def test_identical_requests_in_tasks_share_one_call(slow_api):
+    api, calls = slow_api()
+
+    async def lookups():
+        return await asyncio.gather(*(fetched(api.risk("same.com")) for _ in range(20)))
+
+    results = asyncio.run(lookups())
+
+    assert [result["risk_score"] for result in results] == [10] * 20
+    assert len(calls) == 1
+    assert len({id(result.data()) for result in results}) == 20
+
+
+def test_different_requests_are_not_coalesced(slow_api):
+    api, calls = slow_api()
+
+    async def lookups():
+        return await asyncio.gather(
+            fetched(api.risk("one.com")), fetched(api.risk("two.com")), fetched(api.reputation("one.com"))
+        )
+
+    asyncio.run(lookups())
+    assert len(calls) == 3
+
+
+def test_coalescing_can_be_turned_off(slow_api):
+    api, calls = slow_api(coalesce_requests=False)
+
+    in_threads(lambda: api.risk("same.com").data(), 3)
+    assert len(calls) == 3
+
+
+def test_completed_calls_are_not_reused():
+    flights = SingleFlight()
+    calls = []
+
+    assert flights.do("key", lambda: calls.append(1) or len(calls)) == 1
+    assert flights.do("key", lambda: calls.append(1) or len(calls)) == 2
+
+
+def test_errors_are_shared_by_every_caller():
+    flights = SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError("failed")
+
+    errors = []
+
+    def call():
+        try:
+            flights.do("key", fail)
+        except ValueError as error:
+            errors.append(error)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    in_threads(call, 3)
+    leader.join()
+
+    assert len(errors) == 4
+    assert not flights._calls
+
+
+def test_cancelling_a_caller_does_not_cancel_the_others():
+    flights = SingleFlight()
+
+    async def send():
+        await asyncio.sleep(0.05)
+        return "response"
+
+    async def main():
+        first = asyncio.ensure_future(flights.ado("key", send))
+        second = asyncio.ensure_future(flights.ado("key", send))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "response"
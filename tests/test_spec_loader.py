@@ -0,0 +1,58 @@
+"""Tests the process wide, disk cached loading of the bundled OpenAPI specs"""
+
+import os
+
+import pytest
+
+from domaintools import API
+from domaintools import spec_loader
+
+
+@pytest.fixture
+def spec_file(tmp_path):
+    path = tmp_path / "spec.yaml"
+    path.write_text("openapi: 3.0.0\npaths:\n  /v1/iris-investigate/: {}\n", encoding="utf-8")
+    yield path
+    spec_loader.clear_cache()
+
+
+def test_spec_is_parsed_once_per_process(spec_file, monkeypatch):
+    first = spec_loader.load_spec(spec_file)
+    monkeypatch.setattr(spec_loader, "_parse_yaml", lambda spec_file: pytest.fail("YAML parsed twice"))
+
+    assert spec_loader.load_spec(spec_file) is first
+
+
+def test_pickled_cache_is_used_by_a_new_process(spec_file, monkeypatch):
+    spec = spec_loader.load_spec(spec_file)
+    assert os.path.exists(f"{spec_file}{spec_loader.CACHE_SUFFIX}")
+
+    # forgetting the in-memory copy simulates a fresh process
+    spec_loader.clear_cache()
+    monkeypatch.setattr(spec_loader, "_parse_yaml", lambda spec_file: pytest.fail("cache was not used"))
+    assert spec_loader.load_spec(spec_file) == spec
+
+
+def test_stale_cache_is_rebuilt(spec_file):
+    spec_loader.load_spec(spec_file)
+    spec_file.write_text("openapi: 3.1.0\npaths: {}\n", encoding="utf-8")
+    stat = os.stat(spec_file)
+    os.utime(spec_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    spec_loader.clear_cache()
+    assert spec_loader.load_spec(spec_file)["openapi"] == "3.1.0"
+
+
+def test_unwritable_cache_directory_is_ignored(spec_file, monkeypatch):
+    monkeypatch.setattr(spec_loader.tempfile, "mkstemp", lambda **kwargs: (_ for _ in ()).throw(PermissionError()))
+
+    assert spec_loader.load_spec(spec_file)["openapi"] == "3.0.0"
+    assert not os.path.exists(f"{spec_file}{spec_loader.CACHE_SUFFIX}")
+
+
+def test_api_instances_share_the_parsed_specs():
+    first_api = API("user-a", "key")
+    second_api = API("user-b", "key")
+
+    assert first_api.specs["iris"] is second_api.specs["iris"]
+    assert "/v1/iris-investigate/" in first_api.specs["iris"]["paths"]
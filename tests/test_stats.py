@@ -0,0 +1,70 @@
+"""Tests the statistics of Iris result sets"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from domaintools.stats import age_statistics, describe, resolve_backend, risk_score_statistics
+
+
+def days_ago(days, date_format="%Y-%m-%d"):
+    return (datetime.now() - timedelta(days=days)).strftime(date_format)
+
+
+INVESTIGATE_RESULTS = [
+    {"domain_risk": {"risk_score": 0}, "create_date": {"value": days_ago(10)}},
+    {"domain_risk": {"risk_score": 30}, "create_date": {"value": days_ago(400)}},
+    {"domain_risk": {"risk_score": 70}, "create_date": {"value": ""}},
+    {"domain_risk": {"risk_score": 100}, "create_date": {"value": days_ago(3)}},
+    {},
+]
+
+DETECT_RESULTS = [
+    {"risk_score": 50, "create_date": int(days_ago(2, "%Y%m%d"))},
+    {"risk_score": None, "create_date": None},
+]
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_describe_reads_the_results_once(backend):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+
+    statistics = describe(iter(INVESTIGATE_RESULTS + DETECT_RESULTS), percentiles=(0, 50, 90), backend=backend)
+
+    risk_score = statistics["risk_score"]
+    assert risk_score["count"] == 5
+    assert risk_score["sum"] == 250
+    assert risk_score["mean"] == 50
+    assert (risk_score["min"], risk_score["max"]) == (0, 100)
+    assert risk_score["percentiles"] == {0: 0, 50: 50, 90: 88}
+    assert risk_score["histogram"]["counts"] == [1, 1, 1, 1, 1]
+
+    age = statistics["age"]
+    assert age["count"] == 4
+    assert age["sum"] == 415
+    assert age["percentiles"][50] == 6.5
+    assert age["histogram"]["counts"] == [2, 1, 0, 0, 1, 0, 0, 0]
+
+
+def test_empty_results():
+    statistics = risk_score_statistics([], percentiles=(50,), backend="python")
+
+    assert statistics["count"] == 0
+    assert statistics["mean"] is None
+    assert statistics["percentiles"] == {50: None}
+    assert statistics["histogram"]["counts"] == [0] * 5
+
+
+def test_values_outside_of_the_bins_are_not_counted():
+    statistics = age_statistics(INVESTIGATE_RESULTS, bins=(0, 5, 100), backend="python")
+
+    assert statistics["histogram"]["counts"] == [1, 1]
+    assert statistics["count"] == 3
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        describe([], percentiles=(101,))
+    with pytest.raises(ValueError):
+        resolve_backend("pandas")
@@ -46,6 +46,15 @@ def test_detect_average_risk_score():
     result = utils.get_average_risk_score(domains)
     assert result == 25
 
+    # as before, Detect results with a risk score of 0 are left out of the average while Investigate ones are not
+    domains = [{"risk_score": 25}, {"risk_score": 0}]
+    result = utils.get_average_risk_score(domains)
+    assert result == 25
+
+    domains = [{"domain_risk": {"risk_score": 25}}, {"domain_risk": {"risk_score": 0}}]
+    result = utils.get_average_risk_score(domains)
+    assert result == 12
+
     domains = []
     result = utils.get_average_risk_score(domains)
     assert result == None
@@ -135,3 +144,37 @@ def test_validate_feeds_parameters_should_raise_error_if_asked_csv_format_for_do
         utils.validate_feeds_parameters(test_feeds_params)
 
     assert str(excinfo.value) == "csv format is not available in download API."
+
+
+@pytest.mark.parametrize(
+    "string_date, date_format",
+    [
+        ("2024-02-29", "%Y-%m-%d"),
+        ("2022-06-09T16:05:01.373000", "%Y-%m-%dT%H:%M:%S.%f"),
+        ("2022-06-09T16:05:01.37", "%Y-%m-%dT%H:%M:%S.%f"),
+        ("2024-2-9", "%Y-%m-%d"),
+        ("20240209", "%Y%m%d"),
+    ],
+)
+def test_convert_str_to_dateobj_matches_strptime(string_date, date_format):
+    assert utils.convert_str_to_dateobj(string_date, date_format) == datetime.strptime(string_date, date_format)
+
+
+@pytest.mark.parametrize("string_date", ["2024-W01-1", "2024-02-30", "not a date"])
+def test_convert_str_to_dateobj_rejects_what_strptime_rejects(string_date):
+    with pytest.raises(ValueError):
+        utils.convert_str_to_dateobj(string_date)
+
+
+def test_date_ordinals_compare_like_datetimes():
+    values = [
+        ("2023-07-24", "%Y-%m-%d"),
+        ("2023-07-24T00:00:00.000001", "%Y-%m-%dT%H:%M:%S.%f"),
+        ("2023-07-23T23:59:59.999999", "%Y-%m-%dT%H:%M:%S.%f"),
+        ("2024-01-01", "%Y-%m-%d"),
+    ]
+    by_datetime = sorted(values, key=lambda value: datetime.strptime(*value))
+    by_ordinal = sorted(values, key=lambda value: utils.date_ordinal(*value))
+
+    assert by_ordinal == by_datetime
+    assert utils.date_ordinal("2023-07-24") == utils.datetime_ordinal(datetime(2023, 7, 24).date())